@@ -0,0 +1,204 @@
+import argparse
+import json
+import platform
+import random
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from encode.backends import BACKENDS, get_profile_path, load_profile
+from encode.error_correction import _get_generator
+
+BATCH_SIZES = (1, 4, 16, 64, 256, 1024)
+
+# (error correction bytes, block size) of versions 1-M, 5-Q, 10-M and 40-L.
+BLOCK_SHAPES = ((10, 16), (18, 15), (26, 43), (30, 118))
+
+
+def time_backend(
+    name: str,
+    batch_size: int,
+    repeat: int = 5,
+    seed: Optional[int] = 0
+) -> float:
+    """
+    Times a Reed-Solomon backend on batches of random blocks.
+
+    Each backend is called once before timing, so tables it builds once per
+    generator polynomial are not counted: the profile describes a warm
+    process.
+
+    Parameters
+    ----------
+    name : str
+        Backend name.
+    batch_size : int
+        Number of blocks per call.
+    repeat : int, optional
+        Number of timed calls per block shape; the fastest counts (defaults
+        to 5).
+    seed : int, optional
+        Random seed for the block contents (defaults to 0).
+
+    Returns
+    -------
+    float
+        Seconds per block, summed over BLOCK_SHAPES.
+    """
+    correct = BACKENDS['rs'][name]
+    rng = random.Random(seed)
+    total = 0.0
+
+    for num_ec, size in BLOCK_SHAPES:
+        generator = _get_generator(num_ec)
+        blocks = [
+            [rng.randrange(256) for _ in range(size)]
+            for _ in range(batch_size)
+        ]
+        correct(blocks, generator)
+
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            correct(blocks, generator)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        total += best / batch_size
+
+    return total
+
+
+def get_rules(timings: Dict[int, Dict[str, float]]) -> List[Dict]:
+    """
+    Reduces timings to crossover rules.
+
+    Parameters
+    ----------
+    timings : Dict[int, Dict[str, float]]
+        Seconds per block of each backend, by batch size.
+
+    Returns
+    -------
+    List[Dict]
+        Rules {'backend': name, 'min_batch': size}: the fastest backend from
+        each batch size at which it changes. The first rule applies from a
+        batch size of 1.
+    """
+    rules = []
+
+    for batch_size in sorted(timings):
+        fastest = min(timings[batch_size], key=timings[batch_size].get)
+        if not rules or rules[-1]['backend'] != fastest:
+            rules.append({
+                'backend': fastest,
+                'min_batch': batch_size if rules else 1
+            })
+
+    return rules
+
+
+def autotune(
+    batch_sizes: Sequence[int] = BATCH_SIZES,
+    repeat: int = 5,
+    seed: Optional[int] = 0
+) -> Tuple[Dict, Dict[int, Dict[str, float]]]:
+    """
+    Benchmarks every registered Reed-Solomon backend on this host.
+
+    Parameters
+    ----------
+    batch_sizes : Sequence[int], optional
+        Blocks per call to benchmark (defaults to BATCH_SIZES).
+    repeat : int, optional
+        See time_backend() (defaults to 5).
+    seed : int, optional
+        See time_backend() (defaults to 0).
+
+    Returns
+    -------
+    Dict, Dict[int, Dict[str, float]]
+        Profile (see encode.backends.load_profile()) and the timings it was
+        derived from.
+    """
+    timings = {
+        batch_size: {
+            name: time_backend(name, batch_size, repeat, seed)
+            for name in sorted(BACKENDS['rs'])
+        }
+        for batch_size in batch_sizes
+    }
+
+    profile = {
+        'host': platform.node(),
+        'python': platform.python_version(),
+        'created': time.time(),
+        'stages': {'rs': get_rules(timings)},
+        'timings': {
+            'rs': {str(size): timing for size, timing in timings.items()}
+        }
+    }
+
+    return profile, timings
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """
+    Creates command line parser for autotuning.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        Parser object.
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmark QR encoder backends and write a profile.'
+    )
+
+    parser.add_argument(
+        '-o',
+        '--output',
+        type=str,
+        default=None,
+        help='Profile path (defaults to $QR_AUTOTUNE_PROFILE or '
+             '~/.qr-autotune.json).'
+    )
+    parser.add_argument(
+        '-b',
+        '--batch-sizes',
+        type=int,
+        nargs='+',
+        default=list(BATCH_SIZES),
+        help='Blocks per call to benchmark.'
+    )
+    parser.add_argument(
+        '-r',
+        '--repeat',
+        type=int,
+        default=5,
+        help='Timed calls per block shape.'
+    )
+
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+    path = args.output or get_profile_path()
+
+    profile, timings = autotune(args.batch_sizes, args.repeat)
+
+    with open(path, 'w') as file:
+        json.dump(profile, file, indent=2)
+    load_profile.cache_clear()
+
+    for batch_size, timing in sorted(timings.items()):
+        row = '  '.join(
+            f'{name} {1e6*seconds:8.1f}us' for name, seconds in timing.items()
+        )
+        print(f'{batch_size:>6} blocks  {row}')
+    for rule in profile['stages']['rs']:
+        print(f"rs: {rule['backend']} from {rule['min_batch']} blocks")
+    print(f'Wrote {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+import json
+import os
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_BACKEND = 'table'
+PROFILE_ENV = 'QR_AUTOTUNE_PROFILE'
+PROFILE_PATH = os.path.join(os.path.expanduser('~'), '.qr-autotune.json')
+
+BACKENDS: Dict[str, Dict[str, Callable]] = {'rs': {}}
+
+
+def register_backend(stage: str, name: str, function: Callable) -> None:
+    """
+    Registers an implementation of a pipeline stage.
+
+    Parameters
+    ----------
+    stage : str
+        Pipeline stage, e.g. 'rs' (Reed-Solomon error correction, called
+        with a list of message blocks and the generator polynomial, and
+        returning the error correction bytes of each block).
+    name : str
+        Backend name.
+    function : Callable
+        Implementation of the stage.
+    """
+    BACKENDS.setdefault(stage, {})[name] = function
+
+
+def get_profile_path() -> str:
+    """
+    Fetches the path of the autotuning profile.
+
+    Returns
+    -------
+    str
+        Value of the QR_AUTOTUNE_PROFILE environment variable, or
+        ~/.qr-autotune.json.
+    """
+    return os.environ.get(PROFILE_ENV) or PROFILE_PATH
+
+
+@lru_cache(maxsize=None)
+def load_profile(path: Optional[str] = None) -> Dict[str, List[Dict]]:
+    """
+    Reads an autotuning profile (see encode.autotune), once per path.
+
+    Parameters
+    ----------
+    path : str, optional
+        Profile path (defaults to get_profile_path()).
+
+    Returns
+    -------
+    Dict[str, List[Dict]]
+        For each stage, rules {'backend': name, 'min_batch': size} sorted by
+        batch size. Empty if the profile is missing or unreadable.
+
+    Raises
+    ------
+    ValueError
+        The profile's stages are not lists of rules, or a rule is missing
+        its backend name or integer minimum batch size.
+    """
+    path = path or get_profile_path()
+    try:
+        with open(path) as file:
+            profile = json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+    stages = profile.get('stages', {}) if isinstance(profile, dict) else None
+    if not isinstance(stages, dict):
+        raise ValueError(f'Autotuning profile {path} has no stages.')
+
+    for stage, rules in stages.items():
+        _check_rules(path, stage, rules)
+
+    return {
+        stage: sorted(rules, key=lambda rule: rule['min_batch'])
+        for stage, rules in stages.items()
+    }
+
+
+def _check_rules(path: str, stage: str, rules) -> None:
+    """
+    Helper function: checks that rules is a list of autotuning rules.
+
+    Raises
+    ------
+    ValueError
+        The rules are not a list, or a rule is invalid.
+    """
+    if not isinstance(rules, list):
+        raise ValueError(
+            f'Autotuning profile {path} has no rule list for {stage}.'
+        )
+
+    for rule in rules:
+        if not isinstance(rule, dict) or \
+                not isinstance(rule.get('backend'), str) or \
+                not isinstance(rule.get('min_batch'), int) or \
+                isinstance(rule['min_batch'], bool):
+            raise ValueError(
+                f'Invalid {stage} rule in autotuning profile {path}: {rule}.'
+            )
+
+
+def select_backend(stage: str, batch_size: int = 1) -> str:
+    """
+    Picks the backend for a stage from the autotuning profile.
+
+    The rule with the largest minimum batch size not above batch_size wins.
+    Rules for backends which are not registered (for example a NumPy
+    backend profiled on a host with NumPy) are ignored.
+
+    Parameters
+    ----------
+    stage : str
+        Pipeline stage.
+    batch_size : int, optional
+        Number of items (e.g. Reed-Solomon blocks) processed in one call
+        (defaults to 1).
+
+    Returns
+    -------
+    str
+        Backend name, DEFAULT_BACKEND if no rule applies.
+    """
+    name = DEFAULT_BACKEND
+
+    for rule in load_profile().get(stage, ()):
+        if rule['min_batch'] > batch_size:
+            break
+        if rule['backend'] in BACKENDS.get(stage, ()):
+            name = rule['backend']
+
+    return name
+
+
+def get_backend(
+    stage: str,
+    name: Optional[str] = None,
+    batch_size: int = 1
+) -> Callable:
+    """
+    Fetches the implementation of a stage.
+
+    Parameters
+    ----------
+    stage : str
+        Pipeline stage.
+    name : str, optional
+        Backend name, overriding the profile (defaults to
+        select_backend(stage, batch_size)).
+    batch_size : int, optional
+        Number of items processed in one call (defaults to 1).
+
+    Returns
+    -------
+    Callable
+        Implementation of the stage.
+
+    Raises
+    ------
+    ValueError
+        Unrecognized stage or backend.
+    """
+    if name is None:
+        name = select_backend(stage, batch_size)
+
+    try:
+        return BACKENDS[stage][name]
+    except KeyError:
+        raise ValueError(f'Unrecognized {stage} backend: {name}.') from None
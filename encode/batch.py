@@ -0,0 +1,219 @@
+import os
+from collections import Counter, defaultdict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from encode.common import BLOCK_INFORMATION
+from encode.error_correction import ErrorCorrector
+from encode.data_encoder import correct_many, QREncoder
+from encode.matrix import build_matrix
+from encode.preliminary import select_encoder
+from encode.symbol import QRSymbol
+from encode.verify import Verifier
+
+
+class BatchStats:
+    """
+    Statistics for a batch of messages.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor for the BatchStats class.
+        """
+        self.total = 0
+        self.unique = 0
+        self.buckets: Counter = Counter()
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Fraction of messages which were duplicates."""
+        return 1 - self.unique / self.total if self.total else 0.0
+
+    def as_dict(self) -> Dict:
+        """
+        Summarises the statistics.
+
+        Returns
+        -------
+        Dict
+            Message counts, dedup ratio, and the number of unique messages
+            in each 'mode/version/level' bucket.
+        """
+        return {
+            'total': self.total,
+            'unique': self.unique,
+            'dedup_ratio': self.dedup_ratio,
+            'buckets': {
+                f'{mode}/{version}/{level}': count
+                for (mode, version, level), count in sorted(
+                    self.buckets.items()
+                )
+            }
+        }
+
+
+def _encode_chunk(
+    encoders: List[QREncoder],
+    mask: Optional[int],
+    corrector: ErrorCorrector,
+    backend: Optional[str] = None
+) -> List[QRSymbol]:
+    """
+    Helper function: builds the QR codes for encoders sharing a corrector,
+    generating their error correction bytes in one batch.
+    """
+    symbols = []
+
+    for encoder, codewords in zip(
+        encoders, correct_many(encoders, corrector, backend)
+    ):
+        version, level = encoder.version, encoder.correction_level
+        matrix, used = build_matrix(version, level, codewords, mask)
+        symbols.append(QRSymbol(
+            matrix, version, level, used, encoder.mode, bytes(codewords)
+        ))
+
+    return symbols
+
+
+def encode_many(
+    messages: Sequence[str],
+    correction_level: Union[str, Sequence[str]] = 'L',
+    mask: Optional[int] = None,
+    executor: Union[None, str, Executor] = None,
+    max_workers: Optional[int] = None,
+    verifier: Optional[Verifier] = None,
+    backend: Optional[str] = None
+) -> Tuple[List[QRSymbol], BatchStats]:
+    """
+    Encodes a batch of messages.
+
+    Identical (message, correction level) pairs are encoded once. The
+    unique messages are grouped by (mode, version, correction level) and
+    each group is encoded together, sharing one ErrorCorrector (and its
+    generator polynomial) and the version's cached matrix templates. The
+    shared tables are read-only, so the QR codes can be built on a thread
+    pool.
+
+    Parameters
+    ----------
+    messages : Sequence[str]
+        Messages to encode.
+    correction_level : str or Sequence[str], optional
+        Error correction level for every message, or one per message
+        (defaults to 'L').
+    mask : int, optional
+        Mask pattern reference. Defaults to the lowest penalty pattern for
+        each message.
+    executor : str or Executor, optional
+        'thread' to build the QR codes on a new thread pool, or an existing
+        thread pool to use. Defaults to building them in the current thread.
+    max_workers : int, optional
+        Number of threads for executor='thread' (defaults to the CPU
+        count).
+    verifier : Verifier, optional
+        Verifier reading a sample of the QR codes back to their messages
+        (defaults to None, no verification).
+    backend : str, optional
+        Reed-Solomon backend for every group. Defaults to the autotuning
+        profile's choice for the number of blocks in each group (or chunk,
+        on a thread pool).
+
+    Returns
+    -------
+    List[QRSymbol], BatchStats
+        QR codes in the order of messages (duplicates share one QRSymbol),
+        and statistics for the batch.
+
+    Raises
+    ------
+    VerificationError
+        A sampled QR code does not decode to its message.
+    """
+    if isinstance(correction_level, str):
+        levels = [correction_level]*len(messages)
+    else:
+        levels = list(correction_level)
+        if len(levels) != len(messages):
+            raise ValueError('Need one correction level per message.')
+    if isinstance(executor, str) and executor != 'thread':
+        raise ValueError(f'Unrecognized executor: {executor}.')
+
+    keys: Dict[Tuple[str, str], int] = {}
+    order = [
+        keys.setdefault((message, level.upper()), len(keys))
+        for message, level in zip(messages, levels)
+    ]
+
+    encoders = [select_encoder(message, level) for message, level in keys]
+    groups = defaultdict(list)
+    for idx, encoder in enumerate(encoders):
+        groups[
+            (encoder.mode, encoder.version, encoder.correction_level)
+        ].append(idx)
+
+    stats = BatchStats()
+    stats.total, stats.unique = len(messages), len(encoders)
+
+    symbols: List[Optional[QRSymbol]] = [None]*len(encoders)
+    tasks = []
+    for group in sorted(groups):
+        _, version, level = group
+        corrector = ErrorCorrector(BLOCK_INFORMATION[version][level])
+        stats.buckets[group] = len(groups[group])
+        tasks.append((groups[group], corrector))
+
+    if executor is None:
+        for indices, corrector in tasks:
+            chunk = _encode_chunk(
+                [encoders[idx] for idx in indices], mask, corrector, backend
+            )
+            for idx, symbol in zip(indices, chunk):
+                symbols[idx] = symbol
+    else:
+        _encode_threaded(
+            encoders, symbols, tasks, mask, executor, max_workers, backend
+        )
+
+    if verifier is not None:
+        for (message, _), symbol in zip(keys, symbols):
+            if verifier.sample():
+                verifier.verify_symbol(symbol, message)
+
+    return [symbols[idx] for idx in order], stats
+
+
+def _encode_threaded(
+    encoders: List[QREncoder],
+    symbols: List[Optional[QRSymbol]],
+    tasks: List[Tuple[List[int], ErrorCorrector]],
+    mask: Optional[int],
+    executor: Union[str, Executor],
+    max_workers: Optional[int],
+    backend: Optional[str] = None
+) -> None:
+    """
+    Helper function: builds the QR codes of each group in chunks on a
+    thread pool, filling in symbols.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    chunk = max(1, -(-len(encoders) // (4*workers)))
+    pool = ThreadPoolExecutor(workers) if executor == 'thread' else executor
+
+    try:
+        futures = [
+            (indices[start:start + chunk], pool.submit(
+                _encode_chunk,
+                [encoders[idx] for idx in indices[start:start + chunk]],
+                mask, corrector, backend
+            ))
+            for indices, corrector in tasks
+            for start in range(0, len(indices), chunk)
+        ]
+        for indices, future in futures:
+            for idx, symbol in zip(indices, future.result()):
+                symbols[idx] = symbol
+    finally:
+        if pool is not executor:
+            pool.shutdown()
@@ -0,0 +1,517 @@
+import argparse
+import io
+import json
+import random
+import string
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from encode.backends import get_backend
+from encode.batch import encode_many
+from encode.data_encoder import correct_many
+from encode.error_correction import ErrorCorrector
+from encode.load_test import _percentile
+from encode.matrix import build_matrix
+from encode.preliminary import select_encoder
+from encode.render import write_png
+from encode.symbol import QRSymbol
+from encode.warmup import warmup
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+STAGES = ('select', 'plan', 'correction', 'matrix', 'render')
+
+ALPHABETS = {
+    'numeric': string.digits,
+    'alphanumeric': string.ascii_uppercase + string.digits + ' $%*+-./:',
+    'byte': string.ascii_lowercase + string.digits + '-_./?=&',
+    'kanji': '漢字日本語点茗品質管理東京大阪'
+}
+
+
+class PayloadDistribution:
+    """
+    Draws random benchmark payloads from weighted length, mode and level
+    mixes.
+    """
+
+    def __init__(
+        self,
+        lengths: Dict[int, float],
+        modes: Dict[str, float],
+        levels: Dict[str, float],
+        seed: Optional[int] = None
+    ) -> None:
+        """
+        Constructor for the PayloadDistribution class.
+
+        Parameters
+        ----------
+        lengths : Dict[int, float]
+            Histogram of payload lengths, in characters, to weights.
+        modes : Dict[str, float]
+            Encoding modes ('numeric', 'alphanumeric', 'byte' or 'kanji') to
+            weights.
+        levels : Dict[str, float]
+            Error correction levels to weights.
+        seed : int, optional
+            Random seed (defaults to None).
+
+        Raises
+        ------
+        ValueError
+            Unrecognized mode.
+        """
+        for mode in modes:
+            if mode not in ALPHABETS:
+                raise ValueError(f'Unrecognized mode: {mode}.')
+
+        self.lengths = lengths
+        self.modes = modes
+        self.levels = levels
+        self.random = random.Random(seed)
+
+    def sample(self) -> Tuple[str, str]:
+        """
+        Draws a payload.
+
+        Returns
+        -------
+        str, str
+            Message and error correction level.
+        """
+        choose = self.random.choices
+        length = choose(list(self.lengths), list(self.lengths.values()))[0]
+        mode = choose(list(self.modes), list(self.modes.values()))[0]
+        level = choose(list(self.levels), list(self.levels.values()))[0]
+
+        message = ''.join(choose(ALPHABETS[mode], k=length))
+        if mode == 'byte':
+            # Keep byte payloads from being all digits.
+            message = 'b' + message[1:]
+
+        return message, level
+
+
+def run_pipeline(
+    message: str,
+    correction_level: str,
+    backend: Optional[str] = None,
+    micro: bool = False
+) -> Tuple[str, Dict[str, float]]:
+    """
+    Encodes and renders a message, timing each stage.
+
+    The stages are those of QREncoder.get_symbol(): select_encoder(), the
+    encoder's plan and corrector, correct_many() (message and error
+    correction codewords), build_matrix() (placement and mask selection)
+    and PNG rendering.
+
+    Parameters
+    ----------
+    message : str
+        Message to encode.
+    correction_level : str
+        Error correction level.
+    backend : str, optional
+        Reed-Solomon backend (defaults to the autotuning profile's choice).
+    micro : bool, optional
+        Pick the smallest symbol including Micro QR codes (defaults to
+        False).
+
+    Returns
+    -------
+    str, Dict[str, float]
+        Encoding mode, and seconds spent in each of STAGES.
+
+    Raises
+    ------
+    ValueError
+        Message does not fit in a QR code, or unrecognized backend.
+    """
+    clock = time.perf_counter
+    start = clock()
+
+    encoder = select_encoder(message, correction_level, micro)
+    version, level = encoder.version, encoder.correction_level
+    selected = clock()
+
+    corrector = ErrorCorrector(encoder.plan.block_info)
+    planned = clock()
+
+    codewords = correct_many([encoder], corrector, backend)[0]
+    corrected = clock()
+
+    matrix, mask = build_matrix(version, level, codewords)
+    built = clock()
+
+    write_png(
+        QRSymbol(matrix, version, level, mask, encoder.mode, bytes(codewords)),
+        io.BytesIO()
+    )
+    rendered = clock()
+
+    return encoder.mode, {
+        'select': selected - start,
+        'plan': planned - selected,
+        'correction': corrected - planned,
+        'matrix': built - corrected,
+        'render': rendered - built
+    }
+
+
+def _run_worker(
+    distribution: PayloadDistribution,
+    seed: int,
+    duration: float,
+    backend: Optional[str] = None,
+    micro: bool = False
+) -> Dict:
+    """
+    Helper function: runs the pipeline on sampled payloads for duration
+    seconds.
+
+    Returns
+    -------
+    Dict
+        Latencies in seconds, summed stage times, mode counts and error
+        count.
+    """
+    sampler = PayloadDistribution(
+        distribution.lengths, distribution.modes, distribution.levels, seed
+    )
+    latencies: List[float] = []
+    stages = dict.fromkeys(STAGES, 0.0)
+    modes, errors = Counter(), 0
+
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        message, level = sampler.sample()
+        try:
+            mode, timings = run_pipeline(message, level, backend, micro)
+        except ValueError:
+            errors += 1
+            continue
+
+        latencies.append(sum(timings.values()))
+        for stage, seconds in timings.items():
+            stages[stage] += seconds
+        modes[mode] += 1
+
+    return {
+        'latencies': latencies,
+        'stages': stages,
+        'modes': modes,
+        'errors': errors
+    }
+
+
+def _get_peak_rss() -> Optional[int]:
+    """
+    Helper function: fetches the peak resident set size, in kilobytes, of
+    this process and of its largest finished child.
+    """
+    if resource is None:
+        return None
+
+    return max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    )
+
+
+def run(
+    distribution: PayloadDistribution,
+    concurrency: int = 1,
+    duration: float = 10.0,
+    use_processes: bool = False,
+    seed: int = 0,
+    backend: Optional[str] = None,
+    micro: bool = False
+) -> Dict:
+    """
+    Runs the end-to-end benchmark, from select_encoder() to PNG rendering.
+
+    Parameters
+    ----------
+    distribution : PayloadDistribution
+        Payload distribution.
+    concurrency : int, optional
+        Number of workers (defaults to 1).
+    duration : float, optional
+        Length of the benchmark in seconds (defaults to 10).
+    use_processes : bool, optional
+        Run the workers in processes rather than threads (defaults to
+        False).
+    seed : int, optional
+        Base random seed. Worker i samples with seed + i (defaults to 0).
+    backend : str, optional
+        Reed-Solomon backend (defaults to the autotuning profile's choice).
+    micro : bool, optional
+        Include Micro QR codes (defaults to False).
+
+    Returns
+    -------
+    Dict
+        Payload and error counts, throughput, p50/p90/p99/max latencies and
+        mean stage times in milliseconds, each stage's share of the total
+        time, encoded mode counts and peak RSS in kilobytes.
+
+    Raises
+    ------
+    ValueError
+        Unrecognized backend.
+    """
+    if backend is not None:
+        get_backend('rs', backend)
+    pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+
+    start = time.perf_counter()
+    with pool(max_workers=concurrency) as executor:
+        results = list(executor.map(
+            _run_worker, [distribution]*concurrency,
+            range(seed, seed + concurrency), [duration]*concurrency,
+            [backend]*concurrency, [micro]*concurrency
+        ))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(sum((r['latencies'] for r in results), []))
+    stages = {
+        stage: sum(r['stages'][stage] for r in results) for stage in STAGES
+    }
+    total = sum(stages.values()) or 1.0
+    count = len(latencies) or 1
+
+    return {
+        'config': {
+            'lengths': distribution.lengths,
+            'modes': distribution.modes,
+            'levels': distribution.levels,
+            'concurrency': concurrency,
+            'duration': duration,
+            'processes': use_processes,
+            'backend': backend,
+            'micro': micro
+        },
+        'payloads': len(latencies),
+        'errors': sum(r['errors'] for r in results),
+        'elapsed_s': elapsed,
+        'payloads_per_second': len(latencies) / elapsed,
+        'latency_ms': {
+            'p50': 1000*_percentile(latencies, 0.5),
+            'p90': 1000*_percentile(latencies, 0.9),
+            'p99': 1000*_percentile(latencies, 0.99),
+            'max': 1000*latencies[-1] if latencies else float('nan')
+        },
+        'stages_ms': {
+            stage: 1000*seconds / count for stage, seconds in stages.items()
+        },
+        'stage_share': {
+            stage: seconds / total for stage, seconds in stages.items()
+        },
+        'modes': dict(sum((r['modes'] for r in results), Counter())),
+        'peak_rss_kb': _get_peak_rss()
+    }
+
+
+def run_scaling(
+    distribution: PayloadDistribution,
+    max_threads: int,
+    batch_size: int = 2000
+) -> Dict:
+    """
+    Measures how batch encoding scales from 1 to max_threads threads.
+
+    The same batch is encoded with encode_many(executor='thread') at each
+    thread count, after building the lookup tables. Speedups above 1 need a
+    free-threaded (no-GIL) build of Python, which the report records.
+
+    Parameters
+    ----------
+    distribution : PayloadDistribution
+        Payload distribution.
+    max_threads : int
+        Largest number of threads.
+    batch_size : int, optional
+        Number of payloads drawn, including those which do not fit and are
+        dropped (defaults to 2000).
+
+    Returns
+    -------
+    Dict
+        Whether the GIL is enabled, the payload count, and the throughput
+        and speedup over one thread at each thread count.
+    """
+    messages, levels = [], []
+    for _ in range(batch_size):
+        message, level = distribution.sample()
+        try:
+            select_encoder(message, level)
+        except ValueError:
+            continue
+        messages.append(message)
+        levels.append(level)
+
+    warmup()
+    threads = {}
+    for count in range(1, max_threads + 1):
+        start = time.perf_counter()
+        encode_many(messages, levels, executor='thread', max_workers=count)
+        rate = len(messages) / (time.perf_counter() - start)
+        threads[count] = {
+            'payloads_per_second': rate,
+            'speedup': rate / threads[1]['payloads_per_second']
+            if count > 1 else 1.0
+        }
+
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)
+
+    return {
+        'gil_enabled': is_gil_enabled(),
+        'payloads': len(messages),
+        'threads': threads
+    }
+
+
+def _parse_weights(text: str, cast: Callable = str) -> Dict:
+    """
+    Helper function: parses 'key:weight,key:weight' pairs (a missing weight
+    is 1).
+    """
+    weights = {}
+
+    for item in text.split(','):
+        key, _, weight = item.partition(':')
+        weights[cast(key.strip())] = float(weight or 1)
+
+    return weights
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """
+    Creates command line parser for the benchmark.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        Parser object.
+    """
+    parser = argparse.ArgumentParser(
+        description='End-to-end benchmark for QR Encoder'
+    )
+
+    parser.add_argument(
+        '-l',
+        '--lengths',
+        type=str,
+        default='16:4,64:3,256:2,1024:1',
+        help='Payload length histogram, as length:weight pairs.'
+    )
+    parser.add_argument(
+        '-m',
+        '--modes',
+        type=str,
+        default='numeric:1,alphanumeric:1,byte:2',
+        help='Encoding mode mix, as mode:weight pairs.'
+    )
+    parser.add_argument(
+        '-c',
+        '--levels',
+        type=str,
+        default='L:1,M:2,Q:1,H:1',
+        help='Error correction level mix, as level:weight pairs.'
+    )
+    parser.add_argument(
+        '-n',
+        '--concurrency',
+        type=int,
+        default=1,
+        help='Number of workers.'
+    )
+    parser.add_argument(
+        '--processes',
+        action='store_true',
+        help='Run workers in processes instead of threads.'
+    )
+    parser.add_argument(
+        '-d',
+        '--duration',
+        type=float,
+        default=10.0,
+        help='Length of the benchmark in seconds.'
+    )
+    parser.add_argument(
+        '--backend',
+        type=str,
+        default=None,
+        help='Reed-Solomon backend (defaults to the autotuning profile).'
+    )
+    parser.add_argument(
+        '--micro',
+        action='store_true',
+        help='Include Micro QR codes.'
+    )
+    parser.add_argument(
+        '--scaling',
+        type=int,
+        default=None,
+        help='Measure batch scaling from 1 to this many threads instead.'
+    )
+    parser.add_argument(
+        '-b',
+        '--batch-size',
+        type=int,
+        default=2000,
+        help='Payloads per batch for --scaling.'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='Random seed.'
+    )
+    parser.add_argument(
+        '-o',
+        '--output',
+        type=str,
+        default=None,
+        help='JSON report path (defaults to stdout).'
+    )
+
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+
+    distribution = PayloadDistribution(
+        _parse_weights(args.lengths, int),
+        _parse_weights(args.modes),
+        _parse_weights(args.levels, str.upper),
+        args.seed
+    )
+
+    if args.scaling is not None:
+        report = run_scaling(distribution, args.scaling, args.batch_size)
+    else:
+        report = run(
+            distribution, args.concurrency, args.duration, args.processes,
+            args.seed, args.backend, args.micro
+        )
+
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
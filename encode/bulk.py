@@ -0,0 +1,844 @@
+import csv
+import hashlib
+import io
+import json
+import mmap
+import os
+import queue
+import shutil
+import sys
+import tarfile
+import threading
+import time
+import zipfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from encode.preliminary import select_encoder
+from encode.symbol import pack_codewords, unpack_codewords
+from encode.verify import VerificationError, Verifier
+from encode.warmup import warmup
+
+CHECKPOINT_INTERVAL = 10000
+WRITER_THREADS = 4
+WRITE_QUEUE_SIZE = 1024
+SLAB_ROW_BYTES = 256
+
+
+def encode_row(row: Tuple[str, str, str]) -> Tuple[str, bytes, str]:
+    """
+    Encodes a manifest row.
+
+    Parameters
+    ----------
+    row : Tuple[str, str, str]
+        Row id, payload and correction level.
+
+    Returns
+    -------
+    Tuple[str, bytes, str]
+        Row id, compact wire form of the final codewords (empty on failure,
+        see pack_codewords()) and error message (empty on success). Rows
+        without a payload (see read_manifest()) fail.
+    """
+    row_id, payload, correction_level = row
+    if payload is None:
+        return row_id, b'', 'Row does not match the manifest header.'
+
+    try:
+        encoder = select_encoder(payload, correction_level)
+        codewords = bytes(encoder.correct_error())
+    except (TypeError, ValueError) as error:
+        return row_id, b'', str(error)
+
+    return row_id, pack_codewords(
+        encoder.version, encoder.correction_level, encoder.mode, codewords
+    ), ''
+
+
+def format_row(content: bytes) -> bytes:
+    """
+    Formats an encoded row for output.
+
+    Parameters
+    ----------
+    content : bytes
+        Wire form returned by encode_row().
+
+    Returns
+    -------
+    bytes
+        JSON object as returned by encode_payload(): version, correction
+        level, mode and final codewords as a hex string.
+    """
+    version, level, mode, codewords = unpack_codewords(content)
+
+    return json.dumps({
+        'version': version,
+        'correction_level': level,
+        'mode': mode,
+        'codewords': codewords.hex()
+    }).encode()
+
+
+def encode_rows_shared(
+    rows: List[Tuple[str, str, str]],
+    slab_name: str
+) -> List[Tuple[str, int, int, bytes, str]]:
+    """
+    Encodes manifest rows, writing their outputs to a shared memory slab
+    rather than returning them.
+
+    Parameters
+    ----------
+    rows : List[Tuple[str, str, str]]
+        Row ids, payloads and correction levels.
+    slab_name : str
+        Name of a SharedMemory block created by the caller.
+
+    Returns
+    -------
+    List[Tuple[str, int, int, bytes, str]]
+        Row id, offset and length of the output in the slab, and error
+        message (empty on success) of each row. Outputs which do not fit in
+        the slab's remaining space are returned in place of an empty bytes
+        object, with an offset of -1.
+    """
+    slab = SharedMemory(slab_name)
+    results, offset = [], 0
+
+    try:
+        for row in rows:
+            row_id, content, error = encode_row(row)
+            if offset + len(content) <= slab.size:
+                slab.buf[offset:offset + len(content)] = content
+                results.append((row_id, offset, len(content), b'', error))
+                offset += len(content)
+            else:
+                results.append((row_id, -1, 0, content, error))
+    finally:
+        slab.close()
+
+    return results
+
+
+def _encode_shared(
+    executor: Executor,
+    batch: List[Tuple[str, str, str]],
+    chunksize: int
+) -> Iterator[Tuple[str, bytes, str]]:
+    """
+    Helper function: encodes rows on a process pool in chunks, each
+    returning its outputs through its own shared memory slab, and yields
+    the results of encode_row() in order.
+    """
+    chunks = []
+
+    try:
+        for start in range(0, len(batch), chunksize):
+            rows = batch[start:start + chunksize]
+            slab = SharedMemory(create=True, size=len(rows)*SLAB_ROW_BYTES)
+            chunks.append(
+                (slab, executor.submit(encode_rows_shared, rows, slab.name))
+            )
+
+        for slab, future in chunks:
+            for row_id, offset, length, content, error in future.result():
+                if offset >= 0:
+                    content = bytes(slab.buf[offset:offset + length])
+                yield row_id, content, error
+    finally:
+        for slab, future in chunks:
+            future.cancel()
+            slab.close()
+            slab.unlink()
+
+
+def read_manifest(
+    mapped: mmap.mmap,
+    offset: int,
+    correction_level: str
+) -> Iterator[Tuple[Tuple[str, str, str], int]]:
+    """
+    Reads rows from a memory-mapped CSV or TSV manifest.
+
+    The first line of the manifest is a header naming the id, payload and
+    (optionally) level columns. The delimiter is inferred from the header.
+
+    Parameters
+    ----------
+    mapped : mmap.mmap
+        Memory-mapped manifest.
+    offset : int
+        Byte offset to resume reading from (0 starts after the header).
+    correction_level : str
+        Correction level for rows without a level column.
+
+    Yields
+    ------
+    Tuple[str, str, str], int
+        Row id, payload and correction level, and the byte offset of the
+        next row. Rows with more or fewer fields than the header have no
+        payload (None), and their first field as id if the id is missing.
+
+    Raises
+    ------
+    ValueError
+        Header is missing the id or payload column.
+    """
+    mapped.seek(0)
+    header = mapped.readline().decode('utf-8-sig')
+    delimiter = '\t' if '\t' in header else ','
+    columns = next(csv.reader([header], delimiter=delimiter))
+
+    try:
+        id_idx, payload_idx = columns.index('id'), columns.index('payload')
+    except ValueError:
+        raise ValueError('Manifest header needs id and payload columns.')
+    level_idx = columns.index('level') if 'level' in columns else None
+
+    if offset:
+        mapped.seek(offset)
+
+    lines = (line.decode('utf-8') for line in iter(mapped.readline, b''))
+    for fields in csv.reader(lines, delimiter=delimiter):
+        if not fields:
+            continue
+        if len(fields) != len(columns):
+            row_id = fields[id_idx] if id_idx < len(fields) else fields[0]
+            yield (row_id, None, correction_level), mapped.tell()
+            continue
+
+        level = correction_level
+        if level_idx is not None and fields[level_idx]:
+            level = fields[level_idx]
+
+        yield (fields[id_idx], fields[payload_idx], level), mapped.tell()
+
+
+class OutputWriter:
+    """
+    Writes encoded rows to a sharded directory, or to a tar or zip archive.
+
+    Zip archives are written to path + '.partial' and renamed to path when
+    closed, so path never holds a half-written archive.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        resume: bool = False,
+        offset: Optional[int] = None
+    ) -> None:
+        """
+        Constructor for the OutputWriter class.
+
+        Parameters
+        ----------
+        path : str
+            Output directory, or archive path ending in .tar or .zip.
+        resume : bool, optional
+            Append to an existing archive (defaults to False).
+        offset : int, optional
+            Tar archive size recorded at the last checkpoint. Anything
+            written after it is discarded when resuming.
+
+        Raises
+        ------
+        ValueError
+            A zip archive was not finished and cannot be resumed.
+        """
+        self.path = path
+        self.archive = None
+        self.partial = None
+        self.shards = set()
+
+        if path.endswith('.tar'):
+            resume = resume and bool(offset) and os.path.exists(path)
+            if resume:
+                # Drop partial members and mark the end of the archive.
+                with open(path, 'r+b') as file:
+                    file.truncate(offset)
+                    file.seek(offset)
+                    file.write(bytes(2*tarfile.BLOCKSIZE))
+            self.archive = tarfile.open(path, 'a' if resume else 'w')
+        elif path.endswith('.zip'):
+            self.partial = path + '.partial'
+            if resume and os.path.exists(self.partial):
+                # Rows after the checkpoint can't be dropped from a zip.
+                raise ValueError(
+                    f'Cannot resume {path}: archive was not finished. '
+                    f'Delete the checkpoint to start the job again.'
+                )
+
+            resume = resume and os.path.exists(path)
+            if resume:
+                shutil.copyfile(path, self.partial)
+            try:
+                self.archive = zipfile.ZipFile(
+                    self.partial, 'a' if resume else 'w'
+                )
+            except zipfile.BadZipFile:
+                raise ValueError(
+                    f'Cannot resume {path}: archive was not closed cleanly.'
+                )
+        else:
+            os.makedirs(path, exist_ok=True)
+
+    def make_shards(self) -> None:
+        """
+        Creates every shard subdirectory of a directory output in one pass,
+        so that writes never have to create one.
+        """
+        if self.archive is not None:
+            return
+
+        for shard in range(256):
+            os.makedirs(os.path.join(self.path, f'{shard:02x}'), exist_ok=True)
+        self.shards.update(f'{shard:02x}' for shard in range(256))
+
+    def write(
+        self,
+        name: str,
+        content: bytes,
+        preallocate: bool = False
+    ) -> Optional[str]:
+        """
+        Writes an output file.
+
+        Directory outputs are sharded into 256 subdirectories by a hash of
+        the file name.
+
+        Parameters
+        ----------
+        name : str
+            File name.
+        content : bytes
+            File content.
+        preallocate : bool, optional
+            Reserve the file's blocks with os.posix_fallocate() before
+            writing it, where supported (defaults to False). Only applies to
+            directory outputs.
+
+        Returns
+        -------
+        str or None
+            Path of the file written to a directory output, otherwise None.
+        """
+        if isinstance(self.archive, tarfile.TarFile):
+            info = tarfile.TarInfo(name)
+            info.size, info.mtime = len(content), time.time()
+            self.archive.addfile(info, io.BytesIO(content))
+        elif isinstance(self.archive, zipfile.ZipFile):
+            self.archive.writestr(name, content)
+        else:
+            shard = hashlib.md5(name.encode()).hexdigest()[:2]
+            directory = os.path.join(self.path, shard)
+            if shard not in self.shards:
+                os.makedirs(directory, exist_ok=True)
+                self.shards.add(shard)
+
+            path = os.path.join(directory, name)
+            with open(path, 'wb') as file:
+                if preallocate and content:
+                    _preallocate(file.fileno(), len(content))
+                file.write(content)
+
+            return path
+
+        return None
+
+    def flush(self) -> Optional[int]:
+        """
+        Flushes written files.
+
+        Returns
+        -------
+        int or None
+            Current size of a tar archive, otherwise None.
+        """
+        if isinstance(self.archive, tarfile.TarFile):
+            self.archive.fileobj.flush()
+            return self.archive.offset
+
+        return None
+
+    def sync(self, paths: Iterable[str] = ()) -> None:
+        """
+        Forces flushed output to disk.
+
+        Parameters
+        ----------
+        paths : Iterable[str], optional
+            Files written to a directory output since the last sync. Each
+            file, then each of their directories once, is synced.
+        """
+        if isinstance(self.archive, tarfile.TarFile):
+            os.fsync(self.archive.fileobj.fileno())
+        elif isinstance(self.archive, zipfile.ZipFile):
+            self.archive.fp.flush()
+            os.fsync(self.archive.fp.fileno())
+        else:
+            directories = set()
+            for path in paths:
+                _fsync_path(path)
+                directories.add(os.path.dirname(path))
+            for directory in sorted(directories):
+                _fsync_path(directory)
+
+    def close(self, finish: bool = True) -> None:
+        """
+        Closes the output.
+
+        Parameters
+        ----------
+        finish : bool, optional
+            Rename a zip archive to its path (defaults to True). An
+            unfinished zip archive is left at path + '.partial'.
+        """
+        if self.archive is not None:
+            self.archive.close()
+        if self.partial is not None and finish:
+            os.replace(self.partial, self.path)
+
+
+class AsyncWriter:
+    """
+    Output stage writing encoded rows on a pool of writer threads, so that
+    slow storage (such as a network share) does not stall encoding.
+
+    Rows are passed to the threads through a bounded queue: when writing
+    falls behind, write() blocks until there is room, and the time spent
+    blocked is recorded. Directory outputs create every shard directory up
+    front and are written by all threads; archives are written by one
+    thread, in order.
+    """
+
+    def __init__(
+        self,
+        writer: OutputWriter,
+        threads: int = WRITER_THREADS,
+        queue_size: int = WRITE_QUEUE_SIZE,
+        preallocate: bool = False,
+        sync: bool = False,
+        formatter: Optional[Callable[[bytes], bytes]] = None
+    ) -> None:
+        """
+        Constructor for the AsyncWriter class.
+
+        Parameters
+        ----------
+        writer : OutputWriter
+            Output to write to.
+        threads : int, optional
+            Number of writer threads for a directory output (defaults to 4).
+        queue_size : int, optional
+            Maximum number of rows waiting to be written (defaults to 1024).
+        preallocate : bool, optional
+            See OutputWriter.write() (defaults to False).
+        sync : bool, optional
+            Force the rows written since the last checkpoint to disk at each
+            flush(), all at once rather than file by file (defaults to
+            False).
+        formatter : Callable[[bytes], bytes], optional
+            Function converting queued content to file content on the
+            writer threads, such as format_row() (defaults to None, writing
+            content as queued).
+        """
+        self.writer = writer
+        self.formatter = formatter
+        self.preallocate = preallocate
+        self.sync = sync
+
+        if writer.archive is not None:
+            threads = 1
+        else:
+            writer.make_shards()
+
+        self.queue: queue.Queue = queue.Queue(max(1, queue_size))
+        self.lock = threading.Lock()
+        self.unsynced: List[str] = []
+        self.error: Optional[BaseException] = None
+
+        self.written = 0
+        self.bytes = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.peak_queue = 0
+        self.start = time.perf_counter()
+
+        self.threads = [
+            threading.Thread(target=self._run, daemon=True)
+            for _ in range(max(1, threads))
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def _run(self) -> None:
+        """
+        Writes queued rows until a None sentinel is received.
+        """
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                if self.error is not None:
+                    continue
+
+                name, content = item
+                start = time.perf_counter()
+                if self.formatter is not None:
+                    content = self.formatter(content)
+                path = self.writer.write(name, content, self.preallocate)
+                elapsed = time.perf_counter() - start
+
+                with self.lock:
+                    self.written += 1
+                    self.bytes += len(content)
+                    self.busy_seconds += elapsed
+                    if self.sync and path is not None:
+                        self.unsynced.append(path)
+            except Exception as error:
+                self.error = self.error or error
+            finally:
+                self.queue.task_done()
+
+    def _raise_error(self) -> None:
+        """
+        Re-raises the first error of a writer thread.
+        """
+        if self.error is not None:
+            raise self.error
+
+    def write(self, name: str, content: bytes) -> None:
+        """
+        Queues an output file to be written.
+
+        Parameters
+        ----------
+        name : str
+            File name.
+        content : bytes
+            File content.
+
+        Raises
+        ------
+        Exception
+            A writer thread failed to write an earlier file.
+        """
+        self._raise_error()
+
+        start = time.perf_counter()
+        self.queue.put((name, content))
+        self.blocked_seconds += time.perf_counter() - start
+        self.peak_queue = max(self.peak_queue, self.queue.qsize())
+
+    def flush(self) -> Optional[int]:
+        """
+        Waits for every queued file to be written, then flushes (and syncs)
+        the output.
+
+        Returns
+        -------
+        int or None
+            See OutputWriter.flush().
+
+        Raises
+        ------
+        Exception
+            A writer thread failed to write a file.
+        """
+        self.queue.join()
+        self._raise_error()
+
+        offset = self.writer.flush()
+        if self.sync:
+            with self.lock:
+                paths, self.unsynced = self.unsynced, []
+            self.writer.sync(paths)
+
+        return offset
+
+    def close(self, finish: bool = True) -> None:
+        """
+        Writes the remaining files, stops the threads and closes the output.
+
+        Parameters
+        ----------
+        finish : bool, optional
+            See OutputWriter.close() (defaults to True). Zip archives are
+            not finished after a writer thread fails.
+        """
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+
+        self.writer.close(finish and self.error is None)
+        self._raise_error()
+
+    def get_stats(self) -> Dict:
+        """
+        Summarises the stage's utilization.
+
+        A writer utilization near 1 with encoding blocked for long means
+        the job is bound by I/O; a low utilization means it is bound by
+        encoding.
+
+        Returns
+        -------
+        Dict
+            Files and bytes written, writer threads, the fraction of the
+            threads' time spent writing, seconds encoding was blocked on a
+            full queue, and the most rows queued at once.
+        """
+        elapsed = time.perf_counter() - self.start
+
+        return {
+            'written': self.written,
+            'bytes': self.bytes,
+            'threads': len(self.threads),
+            'utilization': (
+                self.busy_seconds / (len(self.threads)*elapsed)
+                if elapsed else 0.0
+            ),
+            'blocked_seconds': self.blocked_seconds,
+            'peak_queue': self.peak_queue
+        }
+
+
+def _preallocate(fd: int, length: int) -> None:
+    """
+    Helper function: reserves a file's blocks, if the platform and file
+    system support it.
+    """
+    if not hasattr(os, 'posix_fallocate'):
+        return
+
+    try:
+        os.posix_fallocate(fd, 0, length)
+    except OSError:
+        pass
+
+
+def _fsync_path(path: str) -> None:
+    """
+    Helper function: syncs a file or directory by path.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _get_output_name(row_id: str) -> str:
+    """
+    Helper function: output file name of a row. Characters other than
+    letters, digits and '_.-~' are percent-encoded, so ids can't name
+    another directory.
+    """
+    return quote(row_id, safe='') + '.json'
+
+
+def _load_checkpoint(path: str) -> Dict:
+    """
+    Helper function: loads a checkpoint, or a fresh one if none exists.
+    """
+    if not os.path.exists(path):
+        return {
+            'rows': 0, 'offset': 0, 'errors': 0, 'verified': 0,
+            'archive_offset': None
+        }
+
+    with open(path) as file:
+        checkpoint = json.load(file)
+
+    checkpoint.setdefault('verified', 0)
+
+    return checkpoint
+
+
+def _save_checkpoint(path: str, checkpoint: Dict) -> None:
+    """
+    Helper function: atomically replaces the checkpoint file.
+    """
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as file:
+        json.dump(checkpoint, file)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temp_path, path)
+
+
+def _verify_row(verifier: Verifier, content: bytes, payload: str) -> str:
+    """
+    Helper function: verifies an encoded row, returning the error message
+    (empty on success).
+    """
+    version, level, _, codewords = unpack_codewords(content)
+
+    try:
+        verifier.verify_codewords(codewords, version, level, payload)
+    except VerificationError as error:
+        return f'verification failed: {error}'
+
+    return ''
+
+
+def run_job(
+    manifest_path: str,
+    output_path: str,
+    correction_level: str = 'L',
+    checkpoint_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    interval: int = CHECKPOINT_INTERVAL,
+    log=sys.stderr,
+    verify_rate: float = 0.0,
+    writer_threads: int = WRITER_THREADS,
+    queue_size: int = WRITE_QUEUE_SIZE,
+    preallocate: bool = False,
+    sync: bool = False,
+    shared_memory: bool = False,
+    freeze: bool = False
+) -> Dict:
+    """
+    Encodes every row of a manifest, resuming from a checkpoint if one
+    exists.
+
+    Rows are read in batches of interval rows and encoded on a process pool.
+    Workers return each row's codewords in the compact wire form, which a
+    separate AsyncWriter stage formats as JSON and writes. After each batch
+    the outputs are flushed and the checkpoint (rows done, manifest offset
+    and archive size) is saved, so a restarted job skips the completed
+    rows. Lookup tables are built before the workers are forked,
+    so that they are shared rather than rebuilt in each worker.
+
+    Each row is written to its id with '.json' appended, percent-encoding
+    characters other than letters, digits and '_.-~'. A zip archive is only
+    finished when the job completes, so a job writing one that fails can't
+    be resumed and has to start again.
+
+    Parameters
+    ----------
+    manifest_path : str
+        CSV or TSV manifest with id, payload and optional level columns.
+    output_path : str
+        Output directory, or archive path ending in .tar or .zip.
+    correction_level : str, optional
+        Correction level for rows without a level (defaults to 'L').
+    checkpoint_path : str, optional
+        Checkpoint file (defaults to output_path + '.checkpoint').
+    workers : int, optional
+        Number of encoding processes (defaults to the CPU count).
+    interval : int, optional
+        Rows per batch and checkpoint (defaults to 10000).
+    log : file, optional
+        Stream for progress reports (defaults to stderr, None disables
+        them).
+    verify_rate : float, optional
+        Fraction of rows whose codewords are checked and decoded back to
+        the payload before being written, within 2% of the job's runtime.
+        Rows failing verification are counted as errors (defaults to 0).
+    writer_threads : int, optional
+        Number of threads writing to a directory output (defaults to 4).
+    queue_size : int, optional
+        Maximum number of encoded rows waiting to be written (defaults to
+        1024).
+    preallocate : bool, optional
+        Preallocate output files with os.posix_fallocate() (defaults to
+        False).
+    sync : bool, optional
+        Force outputs to disk before each checkpoint is saved (defaults to
+        False).
+    shared_memory : bool, optional
+        Return encoded rows from the workers through shared memory slabs
+        instead of the result pipe (defaults to False).
+    freeze : bool, optional
+        Freeze the lookup tables built by warmup() before forking the
+        workers (see warmup(), defaults to False).
+
+    Returns
+    -------
+    Dict
+        Final checkpoint: rows done, manifest offset, failed rows, verified
+        rows and archive size.
+    """
+    checkpoint_path = checkpoint_path or output_path.rstrip('/') + \
+        '.checkpoint'
+    checkpoint = _load_checkpoint(checkpoint_path)
+    resumed, verified = checkpoint['rows'], checkpoint['verified']
+
+    warmup(freeze=freeze)
+    verifier = Verifier(verify_rate)
+    writer = AsyncWriter(
+        OutputWriter(
+            output_path, bool(resumed), checkpoint['archive_offset']
+        ),
+        writer_threads, queue_size, preallocate, sync, format_row
+    )
+    start = time.perf_counter()
+
+    with open(manifest_path, 'rb') as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        rows = read_manifest(mapped, checkpoint['offset'], correction_level)
+        finished = False
+
+        try:
+            while True:
+                batch: List[Tuple[str, str, str]] = []
+                offset = checkpoint['offset']
+                for row, offset in rows:
+                    batch.append(row)
+                    if len(batch) == interval:
+                        break
+                if not batch:
+                    break
+
+                chunksize = max(1, len(batch) // (4*(workers or 4)))
+                if shared_memory:
+                    results = _encode_shared(executor, batch, chunksize)
+                else:
+                    results = executor.map(
+                        encode_row, batch, chunksize=chunksize
+                    )
+                for (_, payload, _), (row_id, content, error) in zip(
+                    batch, results
+                ):
+                    if not error and verifier.sample():
+                        error = _verify_row(verifier, content, payload)
+
+                    if error:
+                        checkpoint['errors'] += 1
+                        if log is not None:
+                            print(f'{row_id}: {error}', file=log)
+                    else:
+                        writer.write(_get_output_name(row_id), content)
+
+                checkpoint['rows'] += len(batch)
+                checkpoint['verified'] = verified + verifier.checked
+                checkpoint['offset'] = offset
+                checkpoint['archive_offset'] = writer.flush()
+                _save_checkpoint(checkpoint_path, checkpoint)
+
+                if log is not None:
+                    done = checkpoint['rows'] - resumed
+                    rate = done / (time.perf_counter() - start)
+                    stats = writer.get_stats()
+                    print(
+                        f"{checkpoint['rows']} rows done, {rate:.0f} rows/s, "
+                        f"writers {stats['utilization']:.0%} busy, encoding "
+                        f"blocked {stats['blocked_seconds']:.1f}s",
+                        file=log
+                    )
+
+            finished = True
+        finally:
+            writer.close(finished)
+
+    return checkpoint
@@ -0,0 +1,498 @@
+import asyncio
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import Executor, Future
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from encode.batch import _encode_chunk
+from encode.error_correction import ErrorCorrector
+from encode.preliminary import select_encoder
+from encode.symbol import QRSymbol
+
+MAX_BATCH = 64
+MAX_DELAY_US = 500
+
+_Result = Tuple[Optional[QRSymbol], Optional[BaseException]]
+
+
+class CoalescerStats:
+    """
+    Statistics for the batches formed by a coalescer.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor for the CoalescerStats class.
+        """
+        self.requests = 0
+        self.batches = 0
+        self.groups = 0
+        self.batch_sizes: Counter = Counter()
+        self.queue_seconds = 0.0
+        self.max_queue_seconds = 0.0
+
+    def record(self, delays: Sequence[float], groups: int) -> None:
+        """
+        Records a batch.
+
+        Parameters
+        ----------
+        delays : Sequence[float]
+            Seconds each request of the batch waited before the batch
+            started.
+        groups : int
+            Number of (mode, version, level) groups in the batch.
+        """
+        self.requests += len(delays)
+        self.batches += 1
+        self.groups += groups
+        self.batch_sizes[len(delays)] += 1
+        self.queue_seconds += sum(delays)
+        self.max_queue_seconds = max(self.max_queue_seconds, max(delays))
+
+    @property
+    def mean_batch_size(self) -> float:
+        """Mean number of requests per batch."""
+        return self.requests / self.batches if self.batches else 0.0
+
+    @property
+    def mean_queue_seconds(self) -> float:
+        """Mean queueing delay added to each request."""
+        return self.queue_seconds / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> Dict:
+        """
+        Summarises the statistics.
+
+        Returns
+        -------
+        Dict
+            Request, batch and group counts, mean batch size, the number of
+            batches of each size, and the mean and maximum queueing delay in
+            seconds.
+        """
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'groups': self.groups,
+            'mean_batch_size': self.mean_batch_size,
+            'batch_sizes': dict(sorted(self.batch_sizes.items())),
+            'mean_queue_seconds': self.mean_queue_seconds,
+            'max_queue_seconds': self.max_queue_seconds
+        }
+
+
+def encode_batch(
+    requests: Sequence[Tuple[str, str]],
+    mask: Optional[int] = None,
+    backend: Optional[str] = None
+) -> Tuple[List[_Result], int]:
+    """
+    Encodes a batch of independent requests.
+
+    Identical requests are encoded once, and the unique requests are
+    grouped by (mode, version, correction level) and each group is encoded
+    together (see encode.batch.encode_many()). Unlike encode_many(), a
+    failing request only fails itself.
+
+    Parameters
+    ----------
+    requests : Sequence[Tuple[str, str]]
+        Message and correction level of each request.
+    mask : int, optional
+        Mask pattern reference. Defaults to the lowest penalty pattern for
+        each message.
+    backend : str, optional
+        Reed-Solomon backend (see ErrorCorrector.correct_blocks()).
+
+    Returns
+    -------
+    List[Tuple[QRSymbol, Exception]], int
+        The QR code or the error of each request (the other is None;
+        identical requests share one QRSymbol), and the number of groups.
+    """
+    keys: Dict[Tuple[str, str], int] = {}
+    order = [keys.setdefault(request, len(keys)) for request in requests]
+
+    results: List[_Result] = [(None, None)]*len(keys)
+    encoders = {}
+    groups = defaultdict(list)
+
+    for idx, (message, level) in enumerate(keys):
+        try:
+            encoder = select_encoder(message, level)
+        except (TypeError, ValueError) as error:
+            results[idx] = None, error
+            continue
+
+        encoders[idx] = encoder
+        groups[
+            (encoder.mode, encoder.version, encoder.correction_level)
+        ].append(idx)
+
+    for indices in groups.values():
+        group = [encoders[idx] for idx in indices]
+        corrector = ErrorCorrector(group[0].plan.block_info)
+
+        try:
+            symbols = _encode_chunk(group, mask, corrector, backend)
+        except Exception:
+            # Isolate the failing request(s) by encoding one at a time.
+            for idx in indices:
+                try:
+                    results[idx] = encoders[idx].get_symbol(
+                        mask, corrector, backend
+                    ), None
+                except Exception as error:
+                    results[idx] = None, error
+        else:
+            for idx, symbol in zip(indices, symbols):
+                results[idx] = symbol, None
+
+    return [results[idx] for idx in order], len(groups)
+
+
+def _check_request(message: str, correction_level: str) -> None:
+    """
+    Helper function: rejects requests which cannot be queued, as they would
+    fail their whole batch.
+    """
+    if not isinstance(message, str):
+        raise TypeError(f'Message is not a string: {message}.')
+    if not isinstance(correction_level, str):
+        raise TypeError(
+            f'Correction level is not a string: {correction_level}.'
+        )
+
+
+class Coalescer:
+    """
+    Coalesces single encoding requests from many threads into batches.
+
+    Requests are queued and encoded by a background thread in batches of
+    up to max_batch requests, started at most max_delay_us microseconds
+    after their first request arrived. Larger batches share more work
+    (see encode_batch()) at the cost of queueing delay.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = MAX_BATCH,
+        max_delay_us: int = MAX_DELAY_US,
+        mask: Optional[int] = None,
+        backend: Optional[str] = None
+    ) -> None:
+        """
+        Constructor for the Coalescer class.
+
+        Parameters
+        ----------
+        max_batch : int, optional
+            Maximum number of requests per batch (defaults to 64).
+        max_delay_us : int, optional
+            Maximum microseconds a request waits for others to join its
+            batch (defaults to 500).
+        mask : int, optional
+            See encode_batch().
+        backend : str, optional
+            See encode_batch().
+        """
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max_delay_us / 1e6
+        self.mask = mask
+        self.backend = backend
+        self.stats = CoalescerStats()
+
+        self.pending: List[Tuple[str, str, Future, float]] = []
+        self.condition = threading.Condition()
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def __enter__(self) -> 'Coalescer':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def submit(self, message: str, correction_level: str = 'L') -> Future:
+        """
+        Queues a message to be encoded.
+
+        Parameters
+        ----------
+        message : str
+            The message to be encoded.
+        correction_level : str, optional
+            Error correction level (defaults to 'L').
+
+        Returns
+        -------
+        Future
+            Future resolving to the QRSymbol, or to the error raised by
+            select_encoder().
+
+        Raises
+        ------
+        TypeError
+            Message or correction level is not a string.
+        RuntimeError
+            The coalescer is closed.
+        """
+        _check_request(message, correction_level)
+        future: Future = Future()
+
+        with self.condition:
+            if self.closed:
+                raise RuntimeError('Coalescer is closed.')
+            self.pending.append(
+                (message, correction_level, future, time.perf_counter())
+            )
+            self.condition.notify()
+
+        return future
+
+    def encode(self, message: str, correction_level: str = 'L') -> QRSymbol:
+        """
+        Encodes a message, waiting for its batch.
+
+        Parameters
+        ----------
+        message : str
+            The message to be encoded.
+        correction_level : str, optional
+            Error correction level (defaults to 'L').
+
+        Returns
+        -------
+        QRSymbol
+            The encoded QR code.
+        """
+        return self.submit(message, correction_level).result()
+
+    def close(self) -> None:
+        """
+        Encodes the queued requests and stops the background thread.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+        self.thread.join()
+
+    def _run(self) -> None:
+        """
+        Forms and encodes batches until closed and drained.
+        """
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+
+                deadline = self.pending[0][3] + self.max_delay
+                while len(self.pending) < self.max_batch and \
+                        not self.closed:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+
+                batch = self.pending[:self.max_batch]
+                del self.pending[:self.max_batch]
+
+            self._encode(batch)
+
+    def _encode(self, batch: List[Tuple[str, str, Future, float]]) -> None:
+        """
+        Encodes a batch and resolves its futures.
+        """
+        start = time.perf_counter()
+        batch = [
+            item for item in batch if item[2].set_running_or_notify_cancel()
+        ]
+        if not batch:
+            return
+
+        try:
+            results, groups = encode_batch(
+                [(message, level) for message, level, _, _ in batch],
+                self.mask, self.backend
+            )
+        except Exception as error:
+            for _, _, future, _ in batch:
+                future.set_exception(error)
+            return
+        self.stats.record([start - item[3] for item in batch], groups)
+
+        for (_, _, future, _), (symbol, error) in zip(batch, results):
+            if error is None:
+                future.set_result(symbol)
+            else:
+                future.set_exception(error)
+
+
+class AsyncCoalescer:
+    """
+    Coalesces encoding requests from coroutines into batches.
+
+    The asyncio counterpart of Coalescer: a batch is started when max_batch
+    requests are queued, or max_delay_us microseconds after its first
+    request arrived, and encoded in an executor so that the event loop is
+    not blocked.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = MAX_BATCH,
+        max_delay_us: int = MAX_DELAY_US,
+        mask: Optional[int] = None,
+        backend: Optional[str] = None,
+        executor: Optional[Executor] = None
+    ) -> None:
+        """
+        Constructor for the AsyncCoalescer class.
+
+        Parameters
+        ----------
+        max_batch : int, optional
+            Maximum number of requests per batch (defaults to 64).
+        max_delay_us : int, optional
+            Maximum microseconds a request waits for others to join its
+            batch (defaults to 500).
+        mask : int, optional
+            See encode_batch().
+        backend : str, optional
+            See encode_batch().
+        executor : Executor, optional
+            Executor to encode batches in (defaults to the event loop's
+            default executor).
+        """
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max_delay_us / 1e6
+        self.mask = mask
+        self.backend = backend
+        self.executor = executor
+        self.stats = CoalescerStats()
+
+        self.pending: List[Tuple[str, str, asyncio.Future, float]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.running: set = set()
+
+    async def encode(
+        self,
+        message: str,
+        correction_level: str = 'L'
+    ) -> QRSymbol:
+        """
+        Encodes a message, waiting for its batch.
+
+        Parameters
+        ----------
+        message : str
+            The message to be encoded.
+        correction_level : str, optional
+            Error correction level (defaults to 'L').
+
+        Returns
+        -------
+        QRSymbol
+            The encoded QR code.
+
+        Raises
+        ------
+        TypeError
+            Message or correction level is not a string.
+        """
+        _check_request(message, correction_level)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append(
+            (message, correction_level, future, time.perf_counter())
+        )
+
+        if len(self.pending) >= self.max_batch:
+            self._flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.max_delay, self._flush)
+
+        return await future
+
+    async def aclose(self) -> None:
+        """
+        Encodes the queued requests and waits for every batch to finish.
+        """
+        while self.pending:
+            self._flush()
+        if self.running:
+            await asyncio.gather(*self.running, return_exceptions=True)
+
+    def _flush(self) -> None:
+        """
+        Starts encoding the oldest max_batch queued requests.
+        """
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        batch = [
+            item for item in self.pending[:self.max_batch]
+            if not item[2].cancelled()
+        ]
+        del self.pending[:self.max_batch]
+
+        if self.pending:
+            self.timer = loop.call_later(
+                max(0.0, self.pending[0][3] + self.max_delay - start),
+                self._flush
+            )
+        if not batch:
+            return
+
+        task = loop.run_in_executor(
+            self.executor, encode_batch,
+            [(message, level) for message, level, _, _ in batch],
+            self.mask, self.backend
+        )
+        delays = [start - item[3] for item in batch]
+        self.running.add(task)
+        task.add_done_callback(
+            lambda done: self._resolve(done, batch, delays)
+        )
+
+    def _resolve(
+        self,
+        task: asyncio.Future,
+        batch: List[Tuple[str, str, asyncio.Future, float]],
+        delays: List[float]
+    ) -> None:
+        """
+        Resolves the futures of an encoded batch.
+        """
+        self.running.discard(task)
+
+        if task.cancelled():
+            error: Optional[BaseException] = asyncio.CancelledError()
+        else:
+            error = task.exception()
+
+        if error is not None:
+            for _, _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        results, groups = task.result()
+        self.stats.record(delays, groups)
+
+        for (_, _, future, _), (symbol, error) in zip(batch, results):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(symbol)
+            else:
+                future.set_exception(error)
@@ -0,0 +1,300 @@
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional, Sequence, Tuple, Union
+
+from encode.common import (
+    _get_char_cap, _get_data_length, _get_indicator_length,
+    _get_mode_indicator, ALPHANUMERIC_CHARS, CHAR_CAP, CORRECTION_LEVELS,
+    INDICATORS, MICRO_VERSIONS
+)
+from encode.preliminary import _classify
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Mode codes in the output arrays index MODES.
+MODES = tuple(INDICATORS)
+# Version of rows which fit no QR code.
+NO_VERSION = 127
+
+# Character class of each byte. The class of a row is the largest class of
+# its bytes: 0 (digits) is numeric, 1 (other alphanumeric characters) is
+# alphanumeric, 2 (other ASCII) is bytes and 3 (UTF-8 sequences) needs the
+# decoded text.
+_DIGIT, _ALPHANUMERIC, _ASCII, _MULTIBYTE = range(4)
+_CLASS_TABLE = bytes(
+    _DIGIT if chr(value).isdecimal() else
+    _ALPHANUMERIC if chr(value).isupper() or chr(value) in ALPHANUMERIC_CHARS
+    else _ASCII
+    for value in range(128)
+) + bytes([_MULTIBYTE])*128
+_MODE_CODES = {'numeric': 0, 'alphanumeric': 1, 'byte': 2, 'kanji': 3}
+
+Column = Union[Tuple[Sequence[int], bytes], Any]
+
+
+class ColumnPlan(NamedTuple):
+    """
+    Encoding mode, version and data length of each row of a column.
+
+    The fields are NumPy arrays for NumPy input, and array.array otherwise.
+    """
+    modes: Any
+    versions: Any
+    bit_lengths: Any
+    char_counts: Any
+    rejected: Any
+
+
+@lru_cache(maxsize=None)
+def _get_version_table(
+    mode: str,
+    correction_level: str,
+    micro: bool
+) -> Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]:
+    """
+    Helper function: character capacities of the versions holding a mode,
+    in the order _select_version() tries them, with their versions and
+    mode and character count indicator lengths. The final version is
+    NO_VERSION, for rows longer than every capacity.
+    """
+    versions = list(MICRO_VERSIONS.values()) if micro else []
+    versions += range(1, len(CHAR_CAP[mode][correction_level]) + 1)
+    versions = [
+        version for version in versions
+        if _get_char_cap(mode, correction_level, version)
+    ]
+
+    caps = tuple(
+        _get_char_cap(mode, correction_level, version)
+        for version in versions
+    )
+    # Binary search finds the smallest version only if caps never decrease.
+    assert all(low <= high for low, high in zip(caps, caps[1:])), \
+        f'Character capacities of {mode}/{correction_level} decrease.'
+
+    return (
+        caps,
+        tuple(versions) + (NO_VERSION,),
+        tuple(
+            len(_get_mode_indicator(mode, version)) +
+            _get_indicator_length(mode, version)
+            for version in versions
+        ) + (0,)
+    )
+
+
+def select_encodings(column: Column) -> Tuple[Any, Any, Any]:
+    """
+    Determines the encoding mode of each row of a column of UTF-8 text, as
+    select_encoding() would for the decoded row (at any length).
+
+    Rows are classified with a lookup table from bytes to character
+    classes. Only rows with non-ASCII characters are decoded.
+
+    Parameters
+    ----------
+    column : (Sequence[int], bytes) or numpy.ndarray
+        Either (offsets, data), Arrow's string layout, where row k is
+        data[offsets[k]:offsets[k + 1]], or a NumPy fixed-width bytes
+        array.
+
+    Returns
+    -------
+    modes, char_counts, invalid
+        Mode code of each row (an index into MODES), its number of
+        characters, and the indices of rows which are not valid UTF-8 (with
+        mode bytes and no characters).
+
+    Raises
+    ------
+    TypeError
+        Column is not in either layout.
+    """
+    if numpy is not None and isinstance(column, numpy.ndarray):
+        return _select_numpy(column)
+
+    try:
+        offsets, data = column
+        data = memoryview(data).cast('B')
+    except (TypeError, ValueError):
+        raise TypeError(
+            'Column must be (offsets, data) or a NumPy bytes array.'
+        ) from None
+
+    classes = bytes(data).translate(_CLASS_TABLE)
+    num_rows = len(offsets) - 1
+    modes = array('B', bytes(num_rows))
+    char_counts = array('l', bytes(num_rows*array('l').itemsize))
+    invalid = array('l')
+
+    for row in range(num_rows):
+        start, stop = offsets[row], offsets[row + 1]
+        if start == stop:
+            modes[row] = _ALPHANUMERIC
+            continue
+
+        row_class = max(classes[start:stop])
+        if row_class == _MULTIBYTE:
+            selected = _select_text(data[start:stop])
+            if selected is None:
+                modes[row] = _ASCII
+                invalid.append(row)
+            else:
+                modes[row], char_counts[row] = selected
+        else:
+            modes[row], char_counts[row] = row_class, stop - start
+
+    return modes, char_counts, invalid
+
+
+def _select_text(data: memoryview) -> Optional[Tuple[int, int]]:
+    """
+    Helper function: mode code and number of characters of a row with
+    non-ASCII characters, or None if it is not valid UTF-8.
+    """
+    try:
+        text = str(data, 'utf-8')
+    except UnicodeDecodeError:
+        return None
+
+    return _MODE_CODES[_classify(text)], len(text)
+
+
+def _select_numpy(column) -> Tuple[Any, Any, Any]:
+    """
+    Helper function: select_encodings() for a NumPy fixed-width bytes
+    array, classifying every row at once.
+    """
+    if column.dtype.kind != 'S' or column.ndim != 1:
+        raise TypeError('NumPy column must be a 1-D fixed-width bytes array.')
+
+    width = column.dtype.itemsize
+    data = numpy.ascontiguousarray(column).view(numpy.uint8).reshape(
+        len(column), width
+    )
+
+    # NumPy drops trailing null bytes, so a row ends after its last nonzero.
+    nonzero = data != 0
+    char_counts = numpy.where(
+        nonzero.any(axis=1), width - numpy.argmax(nonzero[:, ::-1], axis=1), 0
+    ).astype(numpy.int64)
+
+    classes = numpy.frombuffer(_CLASS_TABLE, numpy.uint8)[data]
+    classes[numpy.arange(width) >= char_counts[:, None]] = _DIGIT
+    modes = classes.max(axis=1, initial=_DIGIT)
+    modes[char_counts == 0] = _ALPHANUMERIC
+
+    invalid = []
+    for row in numpy.flatnonzero(modes == _MULTIBYTE):
+        selected = _select_text(memoryview(data[row, :char_counts[row]]))
+        if selected is None:
+            modes[row], char_counts[row] = _ASCII, 0
+            invalid.append(row)
+        else:
+            modes[row], char_counts[row] = selected
+
+    return modes, char_counts, numpy.array(invalid, numpy.intp)
+
+
+def plan_column(
+    column: Column,
+    correction_level: str,
+    micro: bool = False
+) -> ColumnPlan:
+    """
+    Plans the QR codes for a column of UTF-8 text, finding the mode and
+    smallest version of each row as select_encoder() would.
+
+    Rows which fit no QR code at the correction level, or are not valid
+    UTF-8, are reported together in the plan's rejected indices rather
+    than raising.
+
+    Parameters
+    ----------
+    column : (Sequence[int], bytes) or numpy.ndarray
+        Column of text (see select_encodings()).
+    correction_level : str
+        Error correction level for every row.
+    micro : bool, optional
+        Consider Micro QR versions M1 to M4 (defaults to False).
+
+    Returns
+    -------
+    ColumnPlan
+        Mode code (an index into MODES), version, number of data bits
+        (mode indicator, character count and encoded message, without the
+        terminator) and number of characters of each row, and the indices
+        of rejected rows. Rejected rows have version NO_VERSION and no
+        data bits.
+
+    Raises
+    ------
+    TypeError
+        Column is not in either layout.
+    ValueError
+        Correction level not in ('L', 'M', 'Q', 'H').
+    """
+    if correction_level.upper() not in CORRECTION_LEVELS:
+        raise ValueError(f'Unrecognized correction level: {correction_level}.')
+    level = correction_level.upper()
+
+    modes, char_counts, invalid = select_encodings(column)
+    tables = [_get_version_table(mode, level, micro) for mode in MODES]
+
+    if numpy is not None and isinstance(column, numpy.ndarray):
+        return _plan_numpy(modes, char_counts, invalid, tables)
+
+    num_rows = len(modes)
+    versions = array('b', bytes(num_rows))
+    bit_lengths = array('l', bytes(num_rows*array('l').itemsize))
+    rejected = array('l')
+    is_invalid = set(invalid)
+
+    for row, (code, count) in enumerate(zip(modes, char_counts)):
+        caps, table_versions, header_lengths = tables[code]
+        idx = len(caps) if row in is_invalid else bisect_left(caps, count)
+
+        versions[row] = table_versions[idx]
+        if idx == len(caps):
+            rejected.append(row)
+        else:
+            bit_lengths[row] = header_lengths[idx] + \
+                _get_data_length(MODES[code], count)
+
+    return ColumnPlan(modes, versions, bit_lengths, char_counts, rejected)
+
+
+def _plan_numpy(modes, char_counts, invalid, tables) -> ColumnPlan:
+    """
+    Helper function: plan_column() for NumPy input, looking up the versions
+    of each mode's rows at once.
+    """
+    versions = numpy.full(len(modes), NO_VERSION, numpy.int8)
+    bit_lengths = numpy.zeros(len(modes), numpy.int64)
+
+    for code, (caps, table_versions, header_lengths) in enumerate(tables):
+        rows = numpy.flatnonzero(modes == code)
+        counts = char_counts[rows]
+        idx = numpy.searchsorted(caps, counts)
+        idx[numpy.isin(rows, invalid)] = len(caps)
+
+        versions[rows] = numpy.array(table_versions, numpy.int8)[idx]
+        if MODES[code] == 'numeric':
+            data_lengths = 10*(counts // 3) + \
+                numpy.array([0, 4, 7])[counts % 3]
+        elif MODES[code] == 'alphanumeric':
+            data_lengths = 11*(counts // 2) + 6*(counts % 2)
+        else:
+            data_lengths = (8 if MODES[code] == 'bytes' else 13)*counts
+        bit_lengths[rows] = numpy.where(
+            idx < len(caps),
+            numpy.array(header_lengths)[idx] + data_lengths, 0
+        )
+
+    rejected = numpy.flatnonzero(versions == NO_VERSION)
+
+    return ColumnPlan(modes, versions, bit_lengths, char_counts, rejected)
@@ -1,3 +1,6 @@
+from typing import Optional, Tuple
+
+
 def _pad_bits(
     bit_str: str,
     target_len: int,
@@ -26,6 +29,225 @@ def _pad_bits(
     return (bit_str[::skip_val] + '0' * target_len)[:target_len][::skip_val]
 
 
+def _get_data_length(mode: str, char_count: int) -> int:
+    """
+    Helper function: computes the length of an encoded message segment.
+
+    Parameters
+    ----------
+    mode : str
+        Encoding mode of the segment.
+    char_count : int
+        Number of characters in the segment.
+
+    Returns
+    -------
+    int
+        Number of data bits (excluding mode and character count prefixes).
+    """
+    if mode == 'numeric':
+        return 10*(char_count // 3) + (0, 4, 7)[char_count % 3]
+    if mode == 'alphanumeric':
+        return 11*(char_count // 2) + 6*(char_count % 2)
+    if mode == 'kanji':
+        return 13*char_count
+    return 8*char_count
+
+
+def _get_indicator_length(mode: str, version: int) -> int:
+    """
+    Helper function: fetches the length of the character count indicator.
+
+    Parameters
+    ----------
+    mode : str
+        Encoding mode.
+    version : int
+        QR code version (Micro QR versions are below 1).
+
+    Returns
+    -------
+    int
+        Number of bits in the character count indicator.
+    """
+    if version < 1:
+        return MICRO_INDICATORS[mode][1][version + 3]
+
+    indicator_lengths = INDICATORS[mode][1]
+
+    if version < 10:
+        return indicator_lengths[0]
+    if version < 27:
+        return indicator_lengths[1]
+    return indicator_lengths[2]
+
+
+def _get_capacity(version: int, correction_level: str) -> int:
+    """
+    Helper function: computes the number of data bits held by a QR code.
+
+    The final data codeword of M1 and M3 Micro QR codes is only 4 bits.
+
+    Parameters
+    ----------
+    version : int
+        QR code version.
+    correction_level : str
+        Error correction level.
+
+    Returns
+    -------
+    int
+        Number of data bits.
+    """
+    block_info = _get_block_info(version, correction_level)
+
+    codeword_count = block_info[1]*block_info[2]
+    if block_info[3]:
+        codeword_count += block_info[3]*block_info[4]
+
+    if version in (MICRO_VERSIONS['M1'], MICRO_VERSIONS['M3']):
+        return 8*codeword_count - 4
+    return 8*codeword_count
+
+
+def _get_block_info(
+    version: int,
+    correction_level: str
+) -> Tuple[int, int, int, Optional[int], Optional[int]]:
+    """
+    Helper function: fetches the error correction block information of a
+    QR or Micro QR code.
+
+    Parameters
+    ----------
+    version : int
+        QR code version.
+    correction_level : str
+        Error correction level.
+
+    Returns
+    -------
+    Tuple[int, int, int, Optional[int], Optional[int]]
+        Error correction bytes per block, then the number and size of the
+        blocks in each group (see BLOCK_INFORMATION).
+    """
+    if version < 1:
+        return MICRO_BLOCK_INFORMATION[version][correction_level]
+    return BLOCK_INFORMATION[version][correction_level]
+
+
+def _get_char_cap(mode: str, correction_level: str, version: int) -> int:
+    """
+    Helper function: fetches the number of characters a QR or Micro QR
+    code holds in a single mode.
+
+    Parameters
+    ----------
+    mode : str
+        Encoding mode.
+    correction_level : str
+        Error correction level.
+    version : int
+        QR code version.
+
+    Returns
+    -------
+    int
+        Character capacity, 0 if the version does not support the mode and
+        correction level.
+    """
+    if version < 1:
+        caps = MICRO_CHAR_CAP[mode].get(correction_level)
+        return caps[version + 3] if caps else 0
+    return CHAR_CAP[mode][correction_level][version - 1]
+
+
+def _get_mode_indicator(mode: str, version: int) -> str:
+    """
+    Helper function: fetches the mode indicator of a QR or Micro QR code.
+
+    Parameters
+    ----------
+    mode : str
+        Encoding mode.
+    version : int
+        QR code version.
+
+    Returns
+    -------
+    str
+        Mode indicator bits (empty for M1 Micro QR codes, which only hold
+        numeric data).
+    """
+    if version < 1:
+        return MICRO_INDICATORS[mode][0][version + 3]
+    return INDICATORS[mode][0]
+
+
+def _get_terminator_length(version: int) -> int:
+    """
+    Helper function: fetches the length of the terminator which ends the
+    data of a QR code (4 bits, or 3, 5, 7 and 9 bits for M1 to M4).
+
+    Parameters
+    ----------
+    version : int
+        QR code version.
+
+    Returns
+    -------
+    int
+        Maximum number of terminator bits.
+    """
+    if version < 1:
+        return 2*version + 9
+    return 4
+
+
+ALIGNMENT_POSITIONS = {
+    1: [],
+    2: [6, 18],
+    3: [6, 22],
+    4: [6, 26],
+    5: [6, 30],
+    6: [6, 34],
+    7: [6, 22, 38],
+    8: [6, 24, 42],
+    9: [6, 26, 46],
+    10: [6, 28, 50],
+    11: [6, 30, 54],
+    12: [6, 32, 58],
+    13: [6, 34, 62],
+    14: [6, 26, 46, 66],
+    15: [6, 26, 48, 70],
+    16: [6, 26, 50, 74],
+    17: [6, 30, 54, 78],
+    18: [6, 30, 56, 82],
+    19: [6, 30, 58, 86],
+    20: [6, 34, 62, 90],
+    21: [6, 28, 50, 72, 94],
+    22: [6, 26, 50, 74, 98],
+    23: [6, 30, 54, 78, 102],
+    24: [6, 28, 54, 80, 106],
+    25: [6, 32, 58, 84, 110],
+    26: [6, 30, 58, 86, 114],
+    27: [6, 34, 62, 90, 118],
+    28: [6, 26, 50, 74, 98, 122],
+    29: [6, 30, 54, 78, 102, 126],
+    30: [6, 26, 52, 78, 104, 130],
+    31: [6, 30, 56, 82, 108, 134],
+    32: [6, 34, 60, 86, 112, 138],
+    33: [6, 30, 58, 86, 114, 142],
+    34: [6, 34, 62, 90, 118, 146],
+    35: [6, 30, 54, 78, 102, 126, 150],
+    36: [6, 24, 50, 76, 102, 128, 154],
+    37: [6, 28, 54, 80, 106, 132, 158],
+    38: [6, 32, 58, 84, 110, 136, 162],
+    39: [6, 26, 54, 82, 110, 138, 166],
+    40: [6, 30, 58, 86, 114, 142, 170]
+}
+
 ALPHANUMERIC_CHARS = {
     ' ': 36, '$': 37, '%': 38, '*': 39, '+': 40, '-': 41, '.': 42, '/': 43,
     ':': 44
@@ -277,7 +499,7 @@ BLOCK_INFORMATION = {
 CHAR_CAP = {
     'numeric': {
         'L': [41, 77, 127, 187, 255, 322, 370, 461, 552, 652,
-              772, 883, 1022, 1101, 1250, 1408, 1548, 1725, 1903, 2601,
+              772, 883, 1022, 1101, 1250, 1408, 1548, 1725, 1903, 2061,
               2232, 2409, 2620, 2812, 3057, 3283, 3517, 3669, 3909, 4158,
               4417, 4686, 4965, 5253, 5529, 5836, 6153, 6479, 6743, 7089],
         'M': [34, 63, 101, 149, 202, 255, 293, 365, 432, 513,
@@ -300,7 +522,7 @@ CHAR_CAP = {
               2677, 2840, 3009, 3183, 3351, 3537, 3729, 3927, 4087, 4296],
         'M': [20, 38, 61, 90, 122, 154, 178, 221, 262, 311,
               366, 419, 483, 528, 600, 656, 734, 816, 909, 970,
-              1035, 1134, 1248, 1326, 1853, 1542, 1637, 1732, 1839, 1994,
+              1035, 1134, 1248, 1326, 1451, 1542, 1637, 1732, 1839, 1994,
               2113, 2238, 2369, 2506, 2632, 2780, 2894, 3054, 3220, 3391],
         'Q': [16, 29, 47, 67, 87, 108, 125, 157, 189, 221,
               259, 296, 352, 376, 426, 470, 531, 574, 644, 702,
@@ -328,13 +550,186 @@ CHAR_CAP = {
               137, 155, 177, 194, 220, 250, 280, 310, 338, 382,
               403, 439, 461, 511, 535, 593, 625, 658, 698, 742,
               790, 842, 898, 958, 983, 1051, 1093, 1139, 1219, 1273]
+    },
+    'kanji': {
+        'L': [10, 20, 32, 48, 65, 82, 95, 118, 141, 167,
+              198, 226, 262, 282, 320, 361, 397, 442, 488, 528,
+              572, 618, 672, 721, 784, 842, 902, 940, 1002, 1066,
+              1132, 1201, 1273, 1347, 1417, 1496, 1577, 1661, 1729, 1817],
+        'M': [8, 16, 26, 38, 52, 65, 75, 93, 111, 131,
+              155, 177, 204, 223, 254, 277, 310, 345, 384, 410,
+              438, 480, 528, 561, 614, 652, 692, 732, 778, 843,
+              894, 947, 1002, 1060, 1113, 1176, 1224, 1292, 1362, 1435],
+        'Q': [7, 12, 20, 28, 37, 45, 53, 66, 80, 93,
+              109, 125, 149, 159, 180, 198, 224, 243, 272, 297,
+              314, 348, 376, 407, 440, 462, 496, 534, 559, 604,
+              634, 684, 719, 756, 790, 832, 876, 923, 972, 1024],
+        'H': [4, 8, 15, 21, 27, 36, 39, 52, 60, 74,
+              85, 96, 109, 120, 136, 154, 173, 191, 208, 235,
+              248, 270, 284, 315, 330, 365, 385, 405, 430, 457,
+              486, 518, 553, 590, 605, 647, 673, 701, 750, 784]
     }
 }
 
 CORRECTION_LEVELS = {'L', 'M', 'Q', 'H'}
 
+FORMAT_INFORMATION = {
+    'L': [
+        0b111011111000100, 0b111001011110011, 0b111110110101010,
+        0b111100010011101, 0b110011000101111, 0b110001100011000,
+        0b110110001000001, 0b110100101110110
+    ],
+    'M': [
+        0b101010000010010, 0b101000100100101, 0b101111001111100,
+        0b101101101001011, 0b100010111111001, 0b100000011001110,
+        0b100111110010111, 0b100101010100000
+    ],
+    'Q': [
+        0b011010101011111, 0b011000001101000, 0b011111100110001,
+        0b011101000000110, 0b010010010110100, 0b010000110000011,
+        0b010111011011010, 0b010101111101101
+    ],
+    'H': [
+        0b001011010001001, 0b001001110111110, 0b001110011100111,
+        0b001100111010000, 0b000011101100010, 0b000001001010101,
+        0b000110100001100, 0b000100000111011
+    ]
+}
+
 INDICATORS = {
     'numeric': ('0001', [10, 12, 14]),
     'alphanumeric': ('0010', [9, 11, 13]),
-    'bytes': ('0100', [8, 16, 16])
+    'bytes': ('0100', [8, 16, 16]),
+    'kanji': ('1000', [8, 10, 12])
+}
+
+MICRO_BLOCK_INFORMATION = {
+    -3: {
+        'L': (2, 1, 3, None, None)
+    },
+    -2: {
+        'L': (5, 1, 5, None, None),
+        'M': (6, 1, 4, None, None)
+    },
+    -1: {
+        'L': (6, 1, 11, None, None),
+        'M': (8, 1, 9, None, None)
+    },
+    0: {
+        'L': (8, 1, 16, None, None),
+        'M': (10, 1, 14, None, None),
+        'Q': (14, 1, 10, None, None)
+    }
+}
+
+MICRO_CHAR_CAP = {
+    'numeric': {
+        'L': [5, 10, 23, 35],
+        'M': [0, 8, 18, 30],
+        'Q': [0, 0, 0, 21]
+    },
+    'alphanumeric': {
+        'L': [0, 6, 14, 21],
+        'M': [0, 5, 11, 18],
+        'Q': [0, 0, 0, 13]
+    },
+    'bytes': {
+        'L': [0, 0, 9, 15],
+        'M': [0, 0, 7, 13],
+        'Q': [0, 0, 0, 9]
+    },
+    'kanji': {
+        'L': [0, 0, 6, 9],
+        'M': [0, 0, 4, 8],
+        'Q': [0, 0, 0, 5]
+    }
+}
+
+MICRO_FORMAT_INFORMATION = {
+    -3: {
+        'L': [
+            0b100010001000101, 0b100000101110010, 0b100111000101011,
+            0b100101100011100
+        ]
+    },
+    -2: {
+        'L': [
+            0b101010110101110, 0b101000010011001, 0b101111111000000,
+            0b101101011110111
+        ],
+        'M': [
+            0b110011110010011, 0b110001010100100, 0b110110111111101,
+            0b110100011001010
+        ]
+    },
+    -1: {
+        'L': [
+            0b111011001111000, 0b111001101001111, 0b111110000010110,
+            0b111100100100001
+        ],
+        'M': [
+            0b000011011011110, 0b000001111101001, 0b000110010110000,
+            0b000100110000111
+        ]
+    },
+    0: {
+        'L': [
+            0b001011100110101, 0b001001000000010, 0b001110101011011,
+            0b001100001101100
+        ],
+        'M': [
+            0b010010100001000, 0b010000000111111, 0b010111101100110,
+            0b010101001010001
+        ],
+        'Q': [
+            0b011010011100011, 0b011000111010100, 0b011111010001101,
+            0b011101110111010
+        ]
+    }
+}
+
+MICRO_INDICATORS = {
+    'numeric': (('', '0', '00', '000'), (3, 4, 5, 6)),
+    'alphanumeric': ((None, '1', '01', '001'), (None, 3, 4, 5)),
+    'bytes': ((None, None, '10', '010'), (None, None, 4, 5)),
+    'kanji': ((None, None, '11', '011'), (None, None, 3, 4))
+}
+
+MICRO_VERSIONS = {'M1': -3, 'M2': -2, 'M3': -1, 'M4': 0}
+
+VERSION_INFORMATION = {
+    7: 0b000111110010010100,
+    8: 0b001000010110111100,
+    9: 0b001001101010011001,
+    10: 0b001010010011010011,
+    11: 0b001011101111110110,
+    12: 0b001100011101100010,
+    13: 0b001101100001000111,
+    14: 0b001110011000001101,
+    15: 0b001111100100101000,
+    16: 0b010000101101111000,
+    17: 0b010001010001011101,
+    18: 0b010010101000010111,
+    19: 0b010011010100110010,
+    20: 0b010100100110100110,
+    21: 0b010101011010000011,
+    22: 0b010110100011001001,
+    23: 0b010111011111101100,
+    24: 0b011000111011000100,
+    25: 0b011001000111100001,
+    26: 0b011010111110101011,
+    27: 0b011011000010001110,
+    28: 0b011100110000011010,
+    29: 0b011101001100111111,
+    30: 0b011110110101110101,
+    31: 0b011111001001010000,
+    32: 0b100000100111010101,
+    33: 0b100001011011110000,
+    34: 0b100010100010111010,
+    35: 0b100011011110011111,
+    36: 0b100100101100001011,
+    37: 0b100101010000101110,
+    38: 0b100110101001100100,
+    39: 0b100111010101000001,
+    40: 0b101000110001101001
 }
@@ -1,11 +1,76 @@
 from abc import abstractmethod
+from operator import itemgetter
+from types import SimpleNamespace
+from typing import List, Optional, Sequence, Tuple
+
 from encode.common import (
     ALPHANUMERIC_CHARS,
-    BLOCK_INFORMATION,
     CHAR_CAP,
-    INDICATORS,
+    MICRO_BLOCK_INFORMATION,
+    MICRO_VERSIONS,
+    _get_capacity,
+    _get_char_cap,
+    _get_data_length,
+    _get_indicator_length,
+    _get_mode_indicator,
     _pad_bits
 )
+from encode.error_correction import ErrorCorrector
+from encode.matrix import build_matrix
+from encode.plan import EncodingPlan, get_plan
+from encode.symbol import QRSymbol
+
+
+_PAD_PATTERN = bytes((0b11101100, 0b00010001))*1479
+_ALPHANUMERIC_VALUES = {
+    char: value for value, char in enumerate(
+        '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ' + ''.join(
+            sorted(ALPHANUMERIC_CHARS, key=ALPHANUMERIC_CHARS.get)
+        )
+    )
+}
+
+
+def _get_alphanumeric_value(char: str) -> int:
+    """
+    Helper function: maps a character to its alphanumeric mode value.
+    """
+    if char in _ALPHANUMERIC_VALUES:
+        return _ALPHANUMERIC_VALUES[char]
+    if char.isdecimal():
+        return int(char)
+
+    return ord(char) - 55
+
+
+def _select_version(
+    mode: str,
+    correction_level: str,
+    msg_length: int,
+    micro: bool = False
+) -> Tuple[int, int]:
+    """
+    Helper function: finds the smallest version holding msg_length
+    characters in a mode, and its character capacity.
+
+    Raises
+    ------
+    ValueError
+        Message is too long for the correction level.
+    """
+    if micro:
+        for version in MICRO_VERSIONS.values():
+            cap = _get_char_cap(mode, correction_level, version)
+            if cap and msg_length <= cap:
+                return version, cap
+
+    for idx, cap in enumerate(CHAR_CAP[mode][correction_level]):
+        if msg_length <= cap:
+            return idx + 1, cap
+
+    raise ValueError(
+        f'Message too long for correction level {correction_level}.'
+    )
 
 
 class QREncoder:
@@ -13,7 +78,13 @@ class QREncoder:
     Encodes a message as a QR code.
     """
 
-    def __init__(self, message: str, correction_level: str) -> None:
+    def __init__(
+        self,
+        message: str,
+        correction_level: str,
+        plan: Optional[EncodingPlan] = None,
+        micro: bool = False
+    ) -> None:
         """
         Constructor for the QREncoder class.
 
@@ -23,26 +94,46 @@ class QREncoder:
             The message to be encoded.
         correction_level : str
             Error correction level for the QR code.
+        plan : EncodingPlan, optional
+            Plan fixing the version, for example one shared by a batch of
+            messages. Defaults to the smallest version holding the message.
+        micro : bool, optional
+            Consider Micro QR versions (M1 to M4, numbered -3 to 0) before
+            version 1 (defaults to False). M1 only holds numeric data and
+            only detects errors, whatever the correction level.
 
         Raises
         ------
         ValueError
-            Message is too long.
+            Message is too long, or the plan is for another mode or level.
         """
         self.message = message
         self.correction_level = correction_level
 
         mode, msg_length = self.mode, len(message)
 
-        for idx, cap in enumerate(CHAR_CAP[mode][correction_level]):
-            if msg_length <= cap:
-                self.version = idx + 1
-                self.bit_cap = cap
-                break
-        else:
-            raise ValueError(
-                f'Message too long for correction level {correction_level}.'
-            )
+        if plan is not None:
+            if (plan.mode, plan.correction_level) != (mode, correction_level):
+                raise ValueError(
+                    f'Plan is for {plan.mode}/{plan.correction_level}, not '
+                    f'{mode}/{correction_level}.'
+                )
+            self.version = plan.version
+            self.bit_cap = _get_char_cap(mode, correction_level, plan.version)
+            if msg_length > self.bit_cap:
+                raise ValueError(
+                    f'Message too long for version {plan.version}.'
+                )
+            return
+
+        self.version, self.bit_cap = _select_version(
+            mode, correction_level, msg_length, micro
+        )
+
+    @property
+    def char_count(self) -> int:
+        """Number of characters in the message."""
+        return len(self.message)
 
     def get_prefix(self) -> str:
         """
@@ -53,20 +144,11 @@ class QREncoder:
         str
             Concatenated prefixes.
         """
-        mode = self.mode
-        mode_prefix, indicator_lengths = INDICATORS[mode]
-
-        if self.version < 10:
-            char_prefix_length = indicator_lengths[0]
-        elif self.version < 27:
-            char_prefix_length = indicator_lengths[1]
-        else:
-            char_prefix_length = indicator_lengths[2]
-
-        char_count = bin(len(self.message))[2:]
-        char_count_prefix = _pad_bits(char_count, char_prefix_length)
+        plan = self.plan
+        char_count = bin(self.char_count)[2:]
+        char_count_prefix = _pad_bits(char_count, plan.indicator_length)
 
-        return mode_prefix + char_count_prefix
+        return plan.mode_indicator + char_count_prefix
 
     def get_suffix(self, encoded_length: int) -> str:
         """
@@ -75,8 +157,10 @@ class QREncoder:
 
         The encoded message's required length depends on the encoder version
         and error correction level. To achieve the required length, a
-        suffix of 0s is added if the length is not a multiple of 8, followed
-        by repeating pad bytes (11101100, 00010001).
+        terminator of up to 4 0s (3 to 9 for Micro QR codes) is added, then
+        0s up to a multiple of 8, followed by repeating pad bytes (11101100,
+        00010001). The 4-bit final codeword of M1 and M3 Micro QR codes is
+        padded with 0s.
 
         Parameters
         ----------
@@ -88,50 +172,181 @@ class QREncoder:
         str
             The encoded message's suffix.
         """
-        required_bits, suffix = self.get_num_bits(), ''
-        pad_bytes = ('11101100', '00010001')
+        required_bits = self.get_num_bits()
+        if encoded_length >= required_bits:
+            return ''
 
-        if encoded_length < required_bits:
-            suffix += min(4, required_bits-encoded_length)*'0'
+        terminated = encoded_length + self.plan.terminator_length
+        padded_length = min(required_bits, (terminated + 7) // 8 * 8)
+        num_pad = (required_bits - padded_length) // 8
 
-            if (encoded_length + len(suffix)) % 8:
-                suffix += (8 - ((encoded_length + len(suffix)) % 8))*'0'
-
-            idx = False
-            while (encoded_length + len(suffix)) < required_bits:
-                suffix += pad_bytes[idx]
-                idx = not idx
+        suffix = (padded_length - encoded_length)*'0' + ''.join(
+            f'{pad:08b}' for pad in _PAD_PATTERN[:num_pad]
+        )
 
-        return suffix
+        return suffix + (required_bits - padded_length - 8*num_pad)*'0'
 
     def get_num_bits(self):
         """
         Returns the required length of the encoded message based on encoder
         characteristics.
 
-        Data codewords are 8 bits each.
+        Data codewords are 8 bits each, except the final codeword of M1 and
+        M3 Micro QR codes (4 bits).
 
         Returns
         -------
         int
             The required number of bits.
         """
-        block_info = BLOCK_INFORMATION[self.version][self.correction_level]
-
-        codeword_count = block_info[1]*block_info[2]
-        if block_info[3]:
-            codeword_count += block_info[3]*block_info[4]
+        return self.plan.num_bits
 
-        return 8*codeword_count
+    @property
+    def plan(self) -> EncodingPlan:
+        """Encoding plan for the encoder's mode, version and level."""
+        return get_plan(self.mode, self.version, self.correction_level)
 
     @abstractmethod
-    def encode(self) -> str:
-        """Encodes self.message."""
+    def encode_value(self) -> Tuple[int, int]:
+        """Encodes self.message as an integer and its length in bits."""
         pass
 
-    # TODO: More description here? Return type?
-    def correct_error(self):
-        pass
+    def encode(self) -> str:
+        """
+        Encodes the message as a bit string.
+
+        Returns
+        -------
+        str
+            Encoded message.
+        """
+        value, length = self.encode_value()
+
+        return format(value, f'0{length}b') if length else ''
+
+    def encode_data(self) -> Tuple[int, int]:
+        """
+        Encodes the mode indicator, character count and message as a single
+        integer.
+
+        Returns
+        -------
+        int, int
+            Encoded data and its length in bits.
+        """
+        plan = self.plan
+        value, length = self.encode_value()
+
+        header = int(plan.mode_indicator or '0', 2) << \
+            plan.indicator_length | self.char_count
+        used = len(plan.mode_indicator) + plan.indicator_length + length
+
+        return header << length | value, used
+
+    def write_codewords(self, buffer: bytearray) -> int:
+        """
+        Writes the message codewords to the start of a buffer.
+
+        The data (see encode_data()) is written in one step together with
+        the terminator and the 0s up to the next byte boundary. The remaining
+        codewords are filled in one slice from the precomputed pad pattern.
+        The 4-bit final codeword of M1 and M3 Micro QR codes is written as a
+        byte with 4 low 0 bits.
+
+        Parameters
+        ----------
+        buffer : bytearray
+            Buffer holding at least (get_num_bits() + 7) // 8 bytes.
+
+        Returns
+        -------
+        int
+            Number of message codewords written.
+        """
+        plan = self.plan
+        value, used = self.encode_data()
+        num_bytes = (plan.num_bits + 7) // 8
+        filled = min(num_bytes, (used + plan.terminator_length + 7) // 8)
+
+        value <<= 8*filled - used
+        buffer[:filled] = value.to_bytes(filled, 'big')
+        buffer[filled:num_bytes] = _PAD_PATTERN[:num_bytes - filled]
+        if plan.num_bits % 8 and filled < num_bytes:
+            buffer[num_bytes - 1] = 0
+
+        return num_bytes
+
+    def get_codewords(self) -> List[int]:
+        """
+        Assembles the message codewords (see write_codewords()).
+
+        Returns
+        -------
+        List[int]
+            Message codewords.
+        """
+        buffer = bytearray((self.get_num_bits() + 7) // 8)
+        self.write_codewords(buffer)
+
+        return list(buffer)
+
+    def correct_error(
+        self,
+        corrector: Optional[ErrorCorrector] = None,
+        backend: Optional[str] = None
+    ) -> List[int]:
+        """
+        Generates the final codeword sequence for the QR code (see
+        correct_many()).
+
+        Parameters
+        ----------
+        corrector : ErrorCorrector, optional
+            Corrector for the encoder's version and correction level, shared
+            between messages. Defaults to a new corrector.
+        backend : str, optional
+            Reed-Solomon backend (see ErrorCorrector.correct_blocks()).
+
+        Returns
+        -------
+        List[int]
+            Interleaved message and error correction codewords.
+        """
+        return correct_many([self], corrector, backend)[0]
+
+    def get_symbol(
+        self,
+        mask: Optional[int] = None,
+        corrector: Optional[ErrorCorrector] = None,
+        backend: Optional[str] = None
+    ) -> QRSymbol:
+        """
+        Builds the QR code for the message.
+
+        Parameters
+        ----------
+        mask : int, optional
+            Mask pattern reference. Defaults to the pattern with the lowest
+            penalty score.
+        corrector : ErrorCorrector, optional
+            See correct_error.
+        backend : str, optional
+            See correct_error.
+
+        Returns
+        -------
+        QRSymbol
+            The encoded QR code.
+        """
+        codewords = self.correct_error(corrector, backend)
+        matrix, mask = build_matrix(
+            self.version, self.correction_level, codewords, mask
+        )
+
+        return QRSymbol(
+            matrix, self.version, self.correction_level, mask, self.mode,
+            bytes(codewords)
+        )
 
     @property
     def mode(self) -> str:
@@ -143,36 +358,30 @@ class NumericEncoder(QREncoder):
     QR Encoder using numeric encoding mode.
     """
 
-    def encode(self) -> str:
+    def encode_value(self) -> Tuple[int, int]:
         """
         Encodes the message in numeric mode.
 
         The message is split into 3-digit groups (the final group may have 1
-        or 2 digits). Each group is converted to its binary representation and
-        is left padded if necessary. The binary groups are then concatenated
-        into the encoded string.
+        or 2 digits). Each group is read as an integer of 10, 7 or 4 bits
+        according to its number of digits, and the groups are shifted into
+        the encoded value in order.
 
         Returns
         -------
-        str
-            Encoded message.
+        int, int
+            Encoded message and its length in bits.
         """
-        encoded_message = ''
-
-        for i in range(0, len(self.message), 3):
-            group = int(self.message[i:i+3])
+        message, value, length = self.message, 0, 0
 
-            if group > 99:
-                full_length = 10
-            elif group > 9:
-                full_length = 7
-            else:
-                full_length = 4
+        for i in range(0, len(message), 3):
+            digits = message[i:i+3]
+            width = (0, 4, 7, 10)[len(digits)]
 
-            bin_group = _pad_bits(bin(group)[2:], full_length)
-            encoded_message += bin_group
+            value = value << width | int(digits)
+            length += width
 
-        return encoded_message
+        return value, length
 
     @property
     def mode(self) -> str:
@@ -184,45 +393,31 @@ class AlphanumericEncoder(QREncoder):
     QR Encoder using alphanumeric encoding mode.
     """
 
-    def encode(self):
+    def encode_value(self) -> Tuple[int, int]:
         """
         Encodes the message in alphanumeric mode.
 
         The message is split into 2-character groups. The first character of
         the group is mapped to an integer in [0, 44], multiplied by 45, then
         added to the integer representation of the second character. The sum
-        is then converted to 11-bit binary (6 if the final group is only one
-        character). The binary groups are then concatenated into the encoded
-        string.
+        is an 11-bit group (6 if the final group is only one character), and
+        the groups are shifted into the encoded value in order.
 
         Returns
         -------
-        str
-            Encoded message.
+        int, int
+            Encoded message and its length in bits.
         """
-        encoded_message = ''
-
-        for i in range(0, len(self.message), 2):
-            group = self.message[i: i + 2]
+        chars = [_get_alphanumeric_value(char) for char in self.message]
+        value = 0
 
-            chars = []
-            for char in group:
-                if char.isdecimal():
-                    chars.append(int(char))
-                elif char in ALPHANUMERIC_CHARS:
-                    chars.append(ALPHANUMERIC_CHARS[char])
-                else:
-                    chars.append(ord(char)-55)
+        for i in range(0, len(chars) - 1, 2):
+            value = value << 11 | 45*chars[i] + chars[i + 1]
 
-            if len(group) == 2:
-                bin_group = _pad_bits(
-                    bin(45 * chars[0] + chars[1])[2:], 11)
-            else:
-                bin_group = _pad_bits(bin(chars[0])[2:], 6)
-
-            encoded_message += bin_group
+        if len(chars) % 2:
+            value = value << 6 | chars[-1]
 
-        return encoded_message
+        return value, 11*(len(chars) // 2) + 6*(len(chars) % 2)
 
     @property
     def mode(self) -> str:
@@ -234,24 +429,351 @@ class BytesEncoder(QREncoder):
     QR Encoder using bytes encoding mode.
     """
 
-    def encode(self):
+    def __init__(
+        self,
+        message: str,
+        correction_level: str,
+        plan: Optional[EncodingPlan] = None,
+        micro: bool = False
+    ) -> None:
+        """
+        Constructor for the BytesEncoder class (see QREncoder).
+
+        Raises
+        ------
+        ValueError
+            Message is too long, the plan is for another mode or level, or
+            a character is not in Latin-1.
+        """
+        if not message.isascii() and max(map(ord, message)) > 0xFF:
+            raise ValueError('Byte mode characters must be in Latin-1.')
+
+        super().__init__(message, correction_level, plan, micro)
+
+    def encode_value(self) -> Tuple[int, int]:
         """
         Encodes the message in bytes mode.
 
-        Each character of the message is converted to a hexadecimal byte,
-        which is then converted to an 8-bit binary string (left padded if
-        necessary). The binary strings are then concatenated into the
-        encoded message.
+        Each character of the message is an 8-bit byte. ASCII messages are
+        read as a single integer in one step, others character by character.
 
         Returns
         -------
-        str
-            Encoded message.
+        int, int
+            Encoded message and its length in bits.
         """
-        return ''.join(
+        if self.message.isascii():
+            data = self.message.encode('ascii')
+            return int.from_bytes(data, 'big'), 8*len(data)
+
+        encoded = ''.join(
             _pad_bits(bin(ord(char))[2:], 8) for char in self.message
         )
 
+        return int(encoded, 2), len(encoded)
+
     @property
     def mode(self) -> str:
         return 'bytes'
+
+
+class KanjiEncoder(QREncoder):
+    """
+    QR Encoder using kanji encoding mode.
+    """
+
+    def encode_value(self) -> Tuple[int, int]:
+        """
+        Encodes the message in kanji mode.
+
+        Each character is converted to its 2-byte Shift JIS value. 0x8140 is
+        subtracted from values in [0x8140, 0x9FFC], and 0xC140 from values in
+        [0xE040, 0xEBBF]. The most significant byte of the result is
+        multiplied by 0xC0 and added to the least significant byte, and the
+        13-bit sums are shifted into the encoded value in order.
+
+        Returns
+        -------
+        int, int
+            Encoded message and its length in bits.
+        """
+        encoded = 0
+
+        for char in self.message:
+            value = int.from_bytes(char.encode('shift_jis'), 'big')
+
+            if value <= 0x9FFC:
+                value -= 0x8140
+            else:
+                value -= 0xC140
+
+            encoded = encoded << 13 | (value >> 8)*0xC0 + (value & 0xFF)
+
+        return encoded, 13*len(self.message)
+
+    @property
+    def mode(self) -> str:
+        return 'kanji'
+
+
+_SEGMENT_ENCODERS = {
+    'numeric': NumericEncoder,
+    'alphanumeric': AlphanumericEncoder,
+    'bytes': BytesEncoder,
+    'kanji': KanjiEncoder
+}
+
+
+def _get_segment_bits(
+    counts: Sequence[Tuple[str, int]],
+    version: int
+) -> Optional[int]:
+    """
+    Helper function: number of data bits of segments with the given modes
+    and character counts in a version, or None if the version does not
+    support one of their modes or a segment is too long for its character
+    count indicator.
+    """
+    num_bits = 0
+
+    for mode, count in counts:
+        indicator = _get_mode_indicator(mode, version)
+        if indicator is None:
+            return None
+
+        indicator_length = _get_indicator_length(mode, version)
+        if count >= 1 << indicator_length:
+            return None
+
+        num_bits += len(indicator) + indicator_length + \
+            _get_data_length(mode, count)
+
+    return num_bits
+
+
+def _select_segment_version(
+    counts: Sequence[Tuple[str, int]],
+    correction_level: str,
+    micro: bool = False
+) -> int:
+    """
+    Helper function: finds the smallest version holding segments with the
+    given modes and character counts.
+
+    Raises
+    ------
+    ValueError
+        Segments are too long for the correction level.
+    """
+    versions = [
+        version for version in MICRO_VERSIONS.values()
+        if correction_level in MICRO_BLOCK_INFORMATION[version]
+    ] if micro else []
+
+    for version in versions + list(range(1, 41)):
+        num_bits = _get_segment_bits(counts, version)
+        if num_bits is not None and \
+                num_bits <= _get_capacity(version, correction_level):
+            return version
+
+    raise ValueError(
+        f'Message too long for correction level {correction_level}.'
+    )
+
+
+def _join_segments(
+    segments: Sequence[Tuple[str, int, int, int]],
+    version: int
+) -> Tuple[int, int]:
+    """
+    Helper function: shifts encoded segments, given as (mode, character
+    count, value, length), into a single integer, each after its mode
+    indicator and character count in a version.
+    """
+    encoded, num_bits = 0, 0
+
+    for mode, count, value, length in segments:
+        indicator = _get_mode_indicator(mode, version)
+        indicator_length = _get_indicator_length(mode, version)
+
+        encoded = ((
+            encoded << len(indicator) | int(indicator or '0', 2)
+        ) << indicator_length | count) << length | value
+        num_bits += len(indicator) + indicator_length + length
+
+    return encoded, num_bits
+
+
+class MixedEncoder(QREncoder):
+    """
+    QR Encoder for messages mixing kanji with other characters, encoded as
+    a sequence of segments, each in its own mode.
+
+    The encoder's mode and plan are kanji mode's, as every segment shares
+    the version's blocks and capacity.
+    """
+
+    def __init__(
+        self,
+        segments: Sequence[Tuple[str, str]],
+        correction_level: str,
+        plan: Optional[EncodingPlan] = None,
+        micro: bool = False
+    ) -> None:
+        """
+        Constructor for the MixedEncoder class.
+
+        Parameters
+        ----------
+        segments : Sequence[Tuple[str, str]]
+            Mode ('numeric', 'alphanumeric', 'bytes' or 'kanji') and text of
+            each segment, in order.
+        correction_level : str
+            Error correction level for the QR code.
+        plan : EncodingPlan, optional
+            Kanji mode plan fixing the version. Defaults to the smallest
+            version holding the segments.
+        micro : bool, optional
+            Consider Micro QR versions M3 and M4 before version 1 (defaults
+            to False).
+
+        Raises
+        ------
+        ValueError
+            Segments are too long, the plan is for another mode or level, or
+            a byte mode character is not in Latin-1.
+        """
+        for mode, text in segments:
+            if mode == 'bytes' and not text.isascii() and \
+                    max(map(ord, text)) > 0xFF:
+                raise ValueError('Byte mode characters must be in Latin-1.')
+
+        self.segments = tuple(segments)
+        self.message = ''.join(text for _, text in self.segments)
+        self.correction_level = correction_level
+
+        counts = [(mode, len(text)) for mode, text in self.segments]
+
+        if plan is not None:
+            if (plan.mode, plan.correction_level) != \
+                    (self.mode, correction_level):
+                raise ValueError(
+                    f'Plan is for {plan.mode}/{plan.correction_level}, not '
+                    f'{self.mode}/{correction_level}.'
+                )
+            num_bits = _get_segment_bits(counts, plan.version)
+            if num_bits is None or num_bits > plan.num_bits:
+                raise ValueError(
+                    f'Message too long for version {plan.version}.'
+                )
+            self.version = plan.version
+            return
+
+        self.version = _select_segment_version(
+            counts, correction_level, micro
+        )
+
+    def get_prefix(self) -> str:
+        """
+        Fetches the prefixes for the message: none, as each segment's mode
+        and character count prefixes are part of encode().
+
+        Returns
+        -------
+        str
+            Empty string.
+        """
+        return ''
+
+    def encode_value(self) -> Tuple[int, int]:
+        """
+        Encodes each segment with its mode indicator and character count.
+
+        Returns
+        -------
+        int, int
+            Encoded segments and their length in bits.
+        """
+        return _join_segments([
+            (mode, len(text)) + _SEGMENT_ENCODERS[mode].encode_value(
+                SimpleNamespace(message=text)
+            )
+            for mode, text in self.segments
+        ], self.version)
+
+    def encode_data(self) -> Tuple[int, int]:
+        """
+        Encodes the segments (see encode_value()).
+
+        Returns
+        -------
+        int, int
+            Encoded data and its length in bits.
+        """
+        return self.encode_value()
+
+    @property
+    def mode(self) -> str:
+        return 'kanji'
+
+
+def correct_many(
+    encoders: Sequence[QREncoder],
+    corrector: Optional[ErrorCorrector] = None,
+    backend: Optional[str] = None
+) -> List[List[int]]:
+    """
+    Generates the final codeword sequences of encoders sharing a plan.
+
+    A buffer holding every message and error correction codeword is
+    allocated once per encoder, and the message codewords are written to its
+    start. The error correction bytes of every block of every encoder are
+    generated in one call, so that the backend can be chosen for (and
+    vectorise over) the whole batch. They are written after the message
+    codewords, and each buffer is read out in the plan's precomputed
+    interleaving order.
+
+    Parameters
+    ----------
+    encoders : Sequence[QREncoder]
+        Encoders with the same mode, version and correction level.
+    corrector : ErrorCorrector, optional
+        Corrector for the encoders' version and correction level. Defaults
+        to a new corrector.
+    backend : str, optional
+        Reed-Solomon backend (see ErrorCorrector.correct_blocks()).
+
+    Returns
+    -------
+    List[List[int]]
+        Interleaved message and error correction codewords of each encoder.
+
+    Raises
+    ------
+    ValueError
+        The encoders do not share a plan.
+    """
+    plan = encoders[0].plan
+    if any(encoder.plan is not plan for encoder in encoders):
+        raise ValueError('Encoders must share a mode, version and level.')
+    if corrector is None:
+        corrector = ErrorCorrector(plan.block_info)
+
+    buffers, blocks = [], []
+    for encoder in encoders:
+        buffer = bytearray(len(plan.interleave_order))
+        encoder.write_codewords(buffer)
+        buffers.append(buffer)
+        blocks.extend(corrector.split_blocks(buffer))
+
+    correction = iter(corrector.correct_blocks(blocks, backend))
+    num_message, num_ec = (plan.num_bits + 7) // 8, plan.num_ec
+    read_out = itemgetter(*plan.interleave_order)
+
+    codewords = []
+    for buffer in buffers:
+        for start in range(num_message, len(buffer), num_ec):
+            buffer[start:start + num_ec] = bytes(next(correction))
+        codewords.append(list(read_out(buffer)))
+
+    return codewords
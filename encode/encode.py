@@ -1,6 +1,15 @@
 import argparse
+import os
 
+from encode.bulk import (
+    CHECKPOINT_INTERVAL, run_job, WRITE_QUEUE_SIZE, WRITER_THREADS
+)
+from encode.incremental import IncrementalEncoder
 from encode.preliminary import select_encoder
+from encode.render import RENDERERS, save
+
+
+CHUNK_SIZE = 1 << 16
 
 
 def get_parser() -> argparse.ArgumentParser:
@@ -35,6 +44,94 @@ def get_parser() -> argparse.ArgumentParser:
         default=None,
         help='Text string to be encoded.'
     )
+    parser.add_argument(
+        '-m',
+        '--manifest',
+        type=str,
+        default=None,
+        help='CSV/TSV manifest (id, payload, level) for a bulk job.'
+    )
+    parser.add_argument(
+        '-o',
+        '--output',
+        type=str,
+        default='output',
+        help=(
+            'Image path (.png/.pbm), or bulk job output directory or '
+            '.tar/.zip archive.'
+        )
+    )
+    parser.add_argument(
+        '-s',
+        '--scale',
+        type=int,
+        default=1,
+        help='Image pixels per module.'
+    )
+    parser.add_argument(
+        '-b',
+        '--border',
+        type=int,
+        default=4,
+        help='Image quiet zone width in modules.'
+    )
+    parser.add_argument(
+        '--micro',
+        action='store_true',
+        help='Use a Micro QR code (M1 to M4) if the text fits one.'
+    )
+    parser.add_argument(
+        '--checkpoint',
+        type=str,
+        default=None,
+        help='Bulk job checkpoint file (defaults to OUTPUT.checkpoint).'
+    )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of bulk job encoding processes.'
+    )
+    parser.add_argument(
+        '--checkpoint-interval',
+        type=int,
+        default=CHECKPOINT_INTERVAL,
+        help='Rows between bulk job checkpoints.'
+    )
+    parser.add_argument(
+        '--verify-rate',
+        type=float,
+        default=0.0,
+        help='Fraction of bulk job rows to decode back and verify.'
+    )
+    parser.add_argument(
+        '--writer-threads',
+        type=int,
+        default=WRITER_THREADS,
+        help='Number of bulk job threads writing output files.'
+    )
+    parser.add_argument(
+        '--write-queue',
+        type=int,
+        default=WRITE_QUEUE_SIZE,
+        help='Maximum number of bulk job rows waiting to be written.'
+    )
+    parser.add_argument(
+        '--preallocate',
+        action='store_true',
+        help='Preallocate bulk job output files (posix_fallocate).'
+    )
+    parser.add_argument(
+        '--fsync',
+        action='store_true',
+        help='Force bulk job outputs to disk at each checkpoint.'
+    )
+    parser.add_argument(
+        '--shared-memory',
+        action='store_true',
+        help='Return bulk job results from workers via shared memory.'
+    )
 
     return parser
 
@@ -42,10 +139,37 @@ def get_parser() -> argparse.ArgumentParser:
 def main():
     args = get_parser().parse_args()
 
+    if args.manifest is not None:
+        run_job(
+            args.manifest,
+            args.output,
+            args.correction_level,
+            args.checkpoint,
+            args.workers,
+            args.checkpoint_interval,
+            verify_rate=args.verify_rate,
+            writer_threads=args.writer_threads,
+            queue_size=args.write_queue,
+            preallocate=args.preallocate,
+            sync=args.fsync,
+            shared_memory=args.shared_memory,
+            freeze=True
+        )
+        return
+
     if args.file_path is not None:
+        encoder = IncrementalEncoder(args.correction_level, args.micro)
         with open(args.file_path) as file:
-            message = file.read()
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), ''):
+                encoder.update(chunk)
+        symbol = encoder.finalize()
     else:
-        message = args.text
+        encoder = select_encoder(args.text, args.correction_level, args.micro)
+        symbol = encoder.get_symbol()
+
+    if os.path.splitext(args.output)[1].lower() in RENDERERS:
+        save(symbol, args.output, args.scale, args.border)
+
 
-    encoder = select_encoder(message, args.correction_level)
+if __name__ == '__main__':
+    main()
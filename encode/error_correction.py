@@ -1,4 +1,13 @@
-from typing import List, Tuple, Dict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Sequence, Tuple
+
+from encode.backends import get_backend, register_backend
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class ErrorCorrector:
@@ -9,8 +18,17 @@ class ErrorCorrector:
     def __init__(self, block_info: Tuple[int]) -> None:
         """
         Constructor for the ErrorCorrector class.
+
+        Parameters
+        ----------
+        block_info : Tuple[int]
+            Block information for the QR code: number of error correction
+            bytes per block, number of group 1 blocks, group 1 block size,
+            number of group 2 blocks and group 2 block size.
         """
         self.exp_store, self.log_store = _create_stores()
+        self.block_info = block_info
+        self.generator = None
 
         self.num_correction_bytes = block_info[0]*block_info[1]
         self.num_message_bytes = block_info[2]*block_info[1]
@@ -19,13 +37,147 @@ class ErrorCorrector:
             self.num_correction_bytes += block_info[0]*block_info[3]
             self.num_message_bytes += block_info[4]*block_info[3]
 
-    def generate_correction_bytes(self):
-        pass
+    def split_blocks(self, codewords: List[int]) -> List[List[int]]:
+        """
+        Splits the message codewords into their error correction blocks.
+
+        Parameters
+        ----------
+        codewords : List[int]
+            Message codewords.
+
+        Returns
+        -------
+        List[List[int]]
+            Message blocks, group 1 followed by group 2.
+        """
+        _, g1_count, g1_size, g2_count, g2_size = self.block_info
+        sizes = [g1_size]*g1_count + [g2_size]*(g2_count or 0)
+
+        blocks, start = [], 0
+        for size in sizes:
+            blocks.append(codewords[start:start + size])
+            start += size
+
+        return blocks
+
+    def get_correction_block(
+        self,
+        block: List[int],
+        generator: List[int]
+    ) -> List[int]:
+        """
+        Computes the error correction bytes for a single message block.
+
+        The error correction bytes are the coefficients of the remainder of
+        m(x)x^n divided by the generator polynomial g(x), where m(x) is the
+        message polynomial and n is the degree of g(x).
+
+        Parameters
+        ----------
+        block : List[int]
+            Message codewords of the block.
+        generator : List[int]
+            Coefficients of the generator polynomial.
+
+        Returns
+        -------
+        List[int]
+            Error correction bytes for the block.
+        """
+        return _correct_python([block], generator)[0]
+
+    def generate_correction_bytes(
+        self,
+        codewords: List[int],
+        backend: Optional[str] = None
+    ) -> List[List[int]]:
+        """
+        Generates the error correction bytes for each message block.
+
+        Parameters
+        ----------
+        codewords : List[int]
+            Message codewords.
+        backend : str, optional
+            See correct_blocks().
+
+        Returns
+        -------
+        List[List[int]]
+            Error correction bytes for each block.
+        """
+        return self.correct_blocks(self.split_blocks(codewords), backend)
+
+    def correct_blocks(
+        self,
+        blocks: Sequence[Sequence[int]],
+        backend: Optional[str] = None
+    ) -> List[List[int]]:
+        """
+        Generates the error correction bytes for message blocks, which may
+        come from several messages with the same block information.
+
+        The generator polynomial is fetched on first use and kept, so a
+        corrector can be shared between messages (and threads) with the same
+        block information.
+
+        Parameters
+        ----------
+        blocks : Sequence[Sequence[int]]
+            Message blocks.
+        backend : str, optional
+            Reed-Solomon backend ('python', 'table' or, if NumPy is
+            installed, 'numpy'). Defaults to the autotuning profile's choice
+            for the number of blocks (see encode.backends).
+
+        Returns
+        -------
+        List[List[int]]
+            Error correction bytes for each block.
+        """
+        if self.generator is None:
+            self.generator = _get_generator(self.block_info[0])
+
+        correct = get_backend('rs', backend, len(blocks))
+
+        return correct(blocks, self.generator)
+
+    def interleave(
+        self,
+        message_blocks: List[List[int]],
+        correction_blocks: List[List[int]]
+    ) -> List[int]:
+        """
+        Interleaves the message and error correction blocks.
+
+        The i-th codeword of each message block is taken in turn (blocks
+        which have run out are skipped), followed by the i-th error
+        correction byte of each block in the same way.
+
+        Parameters
+        ----------
+        message_blocks : List[List[int]]
+            Message blocks.
+        correction_blocks : List[List[int]]
+            Error correction bytes for each block.
+
+        Returns
+        -------
+        List[int]
+            Final codeword sequence.
+        """
+        interleaved = []
+
+        for blocks in (message_blocks, correction_blocks):
+            for i in range(max(len(block) for block in blocks)):
+                interleaved.extend(
+                    block[i] for block in blocks if i < len(block)
+                )
 
-    def interleave(self):
-        pass
+        return interleaved
 
-    def get_generator(n: int, log_cache: Dict[int, int]) -> List[int]:
+    def get_generator(self, n: int) -> List[int]:
         """
         Computes the coefficients of the ErrorCorrector's generator polynomial.
 
@@ -43,21 +195,73 @@ class ErrorCorrector:
         Returns
         -------
         List[int]
-            The ordered coefficients of the generator polynomial.
+            The ordered coefficients of the generator polynomial, starting
+            with the leading coefficient.
         """
-        pass
+        return list(_get_generator(n))
+
+
+@lru_cache(maxsize=None)
+def get_interleave_order(block_info: Tuple[int]) -> Tuple[int, ...]:
+    """
+    Computes the interleaving permutation for a block structure.
+
+    Parameters
+    ----------
+    block_info : Tuple[int]
+        Block information, as for ErrorCorrector.
+
+    Returns
+    -------
+    Tuple[int, ...]
+        For each final codeword, its index in the message codewords followed
+        by the error correction bytes of each block in turn.
+    """
+    corrector = ErrorCorrector(block_info)
+    num_message = corrector.num_message_bytes
+    num_ec = block_info[0]
+
+    message_blocks = corrector.split_blocks(list(range(num_message)))
+    correction_blocks = [
+        list(range(start, start + num_ec))
+        for start in range(
+            num_message, num_message + corrector.num_correction_bytes, num_ec
+        )
+    ]
+
+    return tuple(corrector.interleave(message_blocks, correction_blocks))
+
 
+@lru_cache(maxsize=None)
+def _get_generator(n: int) -> Tuple[int, ...]:
+    """
+    Helper function: computes the generator polynomial of degree n, once per
+    degree.
+    """
+    exp_store, log_store = _create_stores()
+    generator = [1]
+
+    for k in range(n):
+        product = generator + [0]
+        for i, coef in enumerate(generator, 1):
+            product[i] ^= exp_store[(log_store[coef] + k) % 255]
+        generator = product
+
+    return tuple(generator)
 
-def _create_stores() -> Dict[int, int]:
+
+@lru_cache(maxsize=None)
+def _create_stores() -> Tuple[Mapping[int, int], Mapping[int, int]]:
     """
     Helper function: creates shortcut stores for GF(2^8) arithmetic.
 
     Creates maps from powers of 2 to the values of their exponents in GF(2^8)
-    and vice versa.
+    and vice versa. The stores are built once and shared between threads as
+    read-only views.
 
     Returns
     -------
-    Dict[int, int], Dict[int, int]
+    Mapping[int, int], Mapping[int, int]
         Stores for computed values.
     """
     curr, exp, log = 1, {}, {}
@@ -70,4 +274,146 @@ def _create_stores() -> Dict[int, int]:
 
     exp[255] = 1
 
-    return exp, log
+    return MappingProxyType(exp), MappingProxyType(log)
+
+
+def _correct_python(
+    blocks: Sequence[Sequence[int]],
+    generator: Sequence[int]
+) -> List[List[int]]:
+    """
+    Helper function: 'python' Reed-Solomon backend. Each block is divided by
+    the generator polynomial with the exponent and logarithm stores.
+    """
+    exp_store, log_store = _create_stores()
+    log_generator = [log_store[coef] for coef in generator[1:]]
+    degree = len(log_generator)
+    correction = []
+
+    for block in blocks:
+        remainder = list(block) + [0]*degree
+        for i in range(len(block)):
+            coef = remainder[i]
+            if coef:
+                log_coef = log_store[coef]
+                for j, log_gen in enumerate(log_generator, i + 1):
+                    remainder[j] ^= exp_store[(log_coef + log_gen) % 255]
+        correction.append(remainder[len(block):])
+
+    return correction
+
+
+@lru_cache(maxsize=None)
+def _get_product_table(generator: Tuple[int, ...]) -> Tuple[int, ...]:
+    """
+    Helper function: multiplies the non-leading generator coefficients by
+    every byte value, packing each product polynomial into a big-endian
+    integer (one byte per coefficient).
+    """
+    exp_store, log_store = _create_stores()
+    log_generator = [log_store[coef] for coef in generator[1:]]
+    table = [0]
+
+    for coef in range(1, 256):
+        log_coef = log_store[coef]
+        product = bytes(
+            exp_store[(log_coef + log_gen) % 255] for log_gen in log_generator
+        )
+        table.append(int.from_bytes(product, 'big'))
+
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def _get_delta_table(
+    generator: Tuple[int, ...],
+    distance: int
+) -> Tuple[int, ...]:
+    """
+    Helper function: error correction bytes of a block whose only non-zero
+    codeword is distance codewords before its end, for every value of that
+    codeword (packed as in _get_product_table()). The code is linear, so
+    XORing a message codeword with a value XORs the block's error correction
+    bytes with the entry for that value.
+    """
+    product = _get_product_table(generator)
+    if not distance:
+        return product
+
+    degree = len(generator) - 1
+    shift, mask = 8*(degree - 1), (1 << 8*degree) - 1
+
+    return tuple(
+        (remainder << 8 & mask) ^ product[remainder >> shift]
+        for remainder in _get_delta_table(generator, distance - 1)
+    )
+
+
+def _correct_table(
+    blocks: Sequence[Sequence[int]],
+    generator: Sequence[int]
+) -> List[List[int]]:
+    """
+    Helper function: 'table' Reed-Solomon backend. The remainder is kept as
+    one integer and shifted a codeword at a time, XORing in the product of
+    the feedback coefficient and the generator from a table built once per
+    generator.
+    """
+    table = _get_product_table(tuple(generator))
+    degree = len(generator) - 1
+    shift, mask = 8*(degree - 1), (1 << 8*degree) - 1
+    correction = []
+
+    for block in blocks:
+        remainder = 0
+        for codeword in block:
+            remainder = (remainder << 8 & mask) ^ \
+                table[remainder >> shift ^ codeword]
+        correction.append(list(remainder.to_bytes(degree, 'big')))
+
+    return correction
+
+
+@lru_cache(maxsize=None)
+def _get_numpy_table(generator: Tuple[int, ...]):
+    """
+    Helper function: _get_product_table() as a (256, degree) uint8 array.
+    """
+    degree = len(generator) - 1
+    products = b''.join(
+        product.to_bytes(degree, 'big')
+        for product in _get_product_table(generator)
+    )
+
+    return numpy.frombuffer(products, numpy.uint8).reshape(256, degree)
+
+
+def _correct_numpy(
+    blocks: Sequence[Sequence[int]],
+    generator: Sequence[int]
+) -> List[List[int]]:
+    """
+    Helper function: 'numpy' Reed-Solomon backend. The blocks are divided
+    together, one codeword column at a time. Shorter blocks are padded with
+    leading 0s, which leave their remainders unchanged.
+    """
+    table = _get_numpy_table(tuple(generator))
+    width = max(len(block) for block in blocks)
+    data = numpy.zeros((len(blocks), width), numpy.uint8)
+    for row, block in zip(data, blocks):
+        row[width - len(block):] = numpy.frombuffer(bytes(block), numpy.uint8)
+
+    remainder = numpy.zeros((len(blocks), table.shape[1]), numpy.uint8)
+    for column in data.T:
+        feedback = remainder[:, 0] ^ column
+        remainder = numpy.roll(remainder, -1, axis=1)
+        remainder[:, -1] = 0
+        remainder ^= table[feedback]
+
+    return remainder.tolist()
+
+
+register_backend('rs', 'python', _correct_python)
+register_backend('rs', 'table', _correct_table)
+if numpy is not None:
+    register_backend('rs', 'numpy', _correct_numpy)
@@ -0,0 +1,382 @@
+import copy
+from itertools import groupby
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
+
+from encode.common import _get_capacity, CHAR_CAP, CORRECTION_LEVELS
+from encode.data_encoder import (
+    _ALPHANUMERIC_VALUES,
+    _get_segment_bits,
+    _join_segments,
+    _select_segment_version,
+    _select_version,
+    AlphanumericEncoder,
+    BytesEncoder,
+    KanjiEncoder,
+    NumericEncoder,
+    QREncoder
+)
+from encode.preliminary import _is_alphanumeric, _is_kanji
+from encode.symbol import QRSymbol
+
+_MODE_ENCODERS = {
+    'numeric': NumericEncoder,
+    'alphanumeric': AlphanumericEncoder,
+    'bytes': BytesEncoder,
+    'kanji': KanjiEncoder
+}
+# Characters per group: a partial group is held back until the next chunk.
+_GROUP_SIZES = {'numeric': 3, 'alphanumeric': 2, 'bytes': 1, 'kanji': 1}
+_ALPHANUMERIC_TEXT = ''.join(
+    sorted(_ALPHANUMERIC_VALUES, key=_ALPHANUMERIC_VALUES.get)
+)
+
+
+def _encode_text(mode: str, text: str) -> Tuple[int, int]:
+    """
+    Helper function: encodes text in a mode (see QREncoder.encode_value()),
+    without choosing a version for it.
+    """
+    return _MODE_ENCODERS[mode].encode_value(SimpleNamespace(message=text))
+
+
+def _decode_text(mode: str, value: int, length: int) -> str:
+    """
+    Helper function: decodes whole groups encoded by _encode_text() in any
+    mode but numeric.
+    """
+    width = {'alphanumeric': 11, 'bytes': 8, 'kanji': 13}
+    groups = [
+        value >> shift & (1 << width[mode]) - 1
+        for shift in range(length - width[mode], -1, -width[mode])
+    ]
+
+    if mode == 'alphanumeric':
+        return ''.join(
+            _ALPHANUMERIC_TEXT[group // 45] + _ALPHANUMERIC_TEXT[group % 45]
+            for group in groups
+        )
+    if mode == 'bytes':
+        return bytes(groups).decode('latin-1')
+
+    chars = []
+    for group in groups:
+        high, low = divmod(group, 0xC0)
+        code = high << 8 | low
+        code += 0x8140 if code <= 0x9FFC - 0x8140 else 0xC140
+        chars.append(code.to_bytes(2, 'big').decode('shift_jis'))
+
+    return ''.join(chars)
+
+
+def _close_run(run: 'IncrementalEncoder') -> Tuple[str, int, int, int]:
+    """
+    Helper function: encodes the final partial group of a run of characters
+    other than kanji, as a (mode, count, value, length) segment.
+    """
+    value, length = _encode_text(run.current_mode, run.pending)
+
+    return (
+        run.current_mode, run.count, run.value << length | value,
+        run.length + length
+    )
+
+
+class IncrementalEncoder(QREncoder):
+    """
+    Encodes a message fed in chunks, for example from a socket or file.
+
+    Each chunk is encoded into a packed data bitstream as it arrives, so
+    memory is proportional to the bitstream rather than the text. The
+    encoding mode is the one select_encoding() would pick for the text so
+    far: when a chunk rules the current mode out (numeric, then kanji or
+    alphanumeric, then bytes), the message so far is re-encoded in the new
+    mode. Decimal digits may be full width or from other scripts, so the
+    text of a numeric message is kept; other modes are decoded from the
+    bitstream. The version, and so the width of the character count
+    indicator, is only fixed by finalize().
+
+    Once the message mixes kanji with characters outside Latin-1, it is
+    split into segments as select_encoder() would (see MixedEncoder): runs
+    of kanji are encoded as they arrive, and the run of other characters
+    since the last kanji is encoded by a nested IncrementalEncoder.
+    """
+
+    def __init__(self, correction_level: str, micro: bool = False) -> None:
+        """
+        Constructor for the IncrementalEncoder class.
+
+        Parameters
+        ----------
+        correction_level : str
+            Error correction level for the QR code.
+        micro : bool, optional
+            Consider Micro QR versions at finalize() (defaults to False).
+
+        Raises
+        ------
+        ValueError
+            Correction level not in ('L', 'M', 'Q', 'H').
+        """
+        if correction_level.upper() not in CORRECTION_LEVELS:
+            raise ValueError(
+                f'Unrecognized correction level: {correction_level}.'
+            )
+
+        self.message = None
+        self.correction_level = correction_level.upper()
+        self.micro = micro
+        self.version: Optional[int] = None
+        self.bit_cap: Optional[int] = None
+
+        self.count = 0
+        self.value = 0
+        self.length = 0
+        self.pending = ''
+        self.digits = ''
+        self.current_mode = 'numeric'
+        self.is_decimal = self.is_kanji = self.is_alphanumeric = True
+        # Encoded (mode, count, value, length) segments and the open run of
+        # other characters, once the message is split into segments.
+        self.segments: Optional[List[Tuple[str, int, int, int]]] = None
+        self.run: Optional[IncrementalEncoder] = None
+
+    @property
+    def mode(self) -> str:
+        return 'kanji' if self.segments is not None else self.current_mode
+
+    @property
+    def char_count(self) -> int:
+        return self.count
+
+    def encode_value(self) -> Tuple[int, int]:
+        """
+        Fetches the encoded message.
+
+        Returns
+        -------
+        int, int
+            Encoded message and its length in bits. Until finalize(), the
+            final partial group of digits or characters is not included.
+            Messages split into segments are encoded by encode_data()
+            instead.
+        """
+        return self.value, self.length
+
+    def get_prefix(self) -> str:
+        """
+        Fetches mode and character count prefixes for the message (none
+        once it is split into segments, see MixedEncoder.get_prefix()).
+
+        Returns
+        -------
+        str
+            Concatenated prefixes.
+        """
+        return '' if self.segments is not None else super().get_prefix()
+
+    def encode_data(self) -> Tuple[int, int]:
+        """
+        Encodes the mode indicator, character count and message, or every
+        segment with its own, as a single integer.
+
+        Returns
+        -------
+        int, int
+            Encoded data and its length in bits.
+        """
+        if self.segments is None:
+            return super().encode_data()
+
+        return _join_segments(self.segments, self.version)
+
+    def update(self, chunk: str) -> None:
+        """
+        Encodes the next chunk of the message.
+
+        Parameters
+        ----------
+        chunk : str
+            Text following the previous chunks.
+
+        Raises
+        ------
+        TypeError
+            Chunk is not a string.
+        ValueError
+            The message is already finalized, is too long for the
+            correction level, or a byte mode character is not in Latin-1.
+            The encoder is unchanged.
+        """
+        if not isinstance(chunk, str):
+            raise TypeError(f'Chunk is not a string: {chunk}.')
+        if self.version is not None:
+            raise ValueError('Message is already finalized.')
+        if not chunk:
+            return
+        if self.segments is not None:
+            self._update_segments(self.segments, self.run, chunk)
+            return
+
+        is_decimal = self.is_decimal and chunk.isdecimal()
+        is_kanji = self.is_kanji and not chunk.isascii() and _is_kanji(chunk)
+        is_alphanumeric = self.is_alphanumeric and _is_alphanumeric(chunk)
+
+        if is_decimal:
+            mode = 'numeric'
+        elif is_kanji:
+            mode = 'kanji'
+        elif is_alphanumeric:
+            mode = 'alphanumeric'
+        else:
+            mode = 'bytes'
+
+        count = self.count + len(chunk)
+        text = self.pending + chunk
+        if mode != self.current_mode and self.current_mode == 'numeric':
+            text = self.digits + chunk
+        elif mode != self.current_mode:
+            text = _decode_text(
+                self.current_mode, self.value, self.length
+            ) + text
+        if mode == 'bytes' and max(map(ord, text)) > 0xFF:
+            if not any(map(_is_kanji, text)):
+                raise ValueError('Byte mode characters must be in Latin-1.')
+            if mode == self.current_mode:
+                text = _decode_text(mode, self.value, self.length) + text
+            self._update_segments([], None, text)
+            return
+
+        if count > CHAR_CAP[mode][self.correction_level][-1]:
+            raise ValueError(
+                f'Message too long for correction level '
+                f'{self.correction_level}.'
+            )
+
+        if mode != self.current_mode:
+            self.value = self.length = 0
+        cut = len(text) - len(text) % _GROUP_SIZES[mode]
+        value, length = _encode_text(mode, text[:cut])
+
+        self.value = self.value << length | value
+        self.length += length
+        self.pending = text[cut:]
+        self.digits = self.digits + chunk if mode == 'numeric' else ''
+        self.count = count
+        self.current_mode = mode
+        self.is_decimal = is_decimal
+        self.is_kanji = is_kanji
+        self.is_alphanumeric = is_alphanumeric
+
+    def _update_segments(
+        self,
+        segments: List[Tuple[str, int, int, int]],
+        run: Optional['IncrementalEncoder'],
+        text: str
+    ) -> None:
+        """
+        Encodes text following the given segments and open run, and moves
+        the encoder to the result.
+
+        Parameters
+        ----------
+        segments : List[Tuple[str, int, int, int]]
+            Encoded (mode, count, value, length) segments so far.
+        run : IncrementalEncoder or None
+            Open run of characters other than kanji after the segments.
+        text : str
+            Text following the segments and run.
+
+        Raises
+        ------
+        ValueError
+            The message is too long for the correction level, or a byte
+            mode character is not in Latin-1. The encoder is unchanged.
+        """
+        segments = list(segments)
+
+        for is_kanji, chars in groupby(text, _is_kanji):
+            piece = ''.join(chars)
+            if not is_kanji:
+                run = copy.copy(run) if run is not None else \
+                    IncrementalEncoder(self.correction_level)
+                run.update(piece)
+                continue
+
+            if run is not None:
+                segments.append(_close_run(run))
+                run = None
+            value, length = _encode_text('kanji', piece)
+            if segments and segments[-1][0] == 'kanji':
+                _, last_count, last_value, last_length = segments.pop()
+                segments.append((
+                    'kanji', last_count + len(piece),
+                    last_value << length | value, last_length + length
+                ))
+            else:
+                segments.append(('kanji', len(piece), value, length))
+
+        counts = [(mode, count) for mode, count, _, _ in segments]
+        if run is not None:
+            counts.append((run.current_mode, run.count))
+        num_bits = _get_segment_bits(counts, 40)
+        if num_bits is None or \
+                num_bits > _get_capacity(40, self.correction_level):
+            raise ValueError(
+                f'Message too long for correction level '
+                f'{self.correction_level}.'
+            )
+
+        self.segments, self.run = segments, run
+        self.count = sum(count for _, count in counts)
+        self.value = self.length = 0
+        self.pending = self.digits = ''
+
+    def finalize(self, mask: Optional[int] = None) -> QRSymbol:
+        """
+        Encodes the final partial group, fixes the version and builds the QR
+        code.
+
+        Parameters
+        ----------
+        mask : int, optional
+            Mask pattern reference. Defaults to the pattern with the lowest
+            penalty score.
+
+        Returns
+        -------
+        QRSymbol
+            The encoded QR code, identical to encoding the whole message
+            with select_encoder().
+
+        Raises
+        ------
+        ValueError
+            Message is too long for the smallest version.
+        """
+        if self.version is None and self.segments is not None:
+            segments = self.segments + (
+                [_close_run(self.run)] if self.run is not None else []
+            )
+            self.version = _select_segment_version(
+                [(mode, count) for mode, count, _, _ in segments],
+                self.correction_level, self.micro
+            )
+            self.segments, self.run = segments, None
+        elif self.version is None:
+            if not self.count:
+                # Like select_encoding(''), an empty message is alphanumeric.
+                self.current_mode = 'alphanumeric'
+
+            value, length = _encode_text(self.current_mode, self.pending)
+            version, bit_cap = _select_version(
+                self.current_mode, self.correction_level, self.count,
+                self.micro
+            )
+
+            self.value = self.value << length | value
+            self.length += length
+            self.pending = ''
+            self.version, self.bit_cap = version, bit_cap
+
+        return self.get_symbol(mask)
@@ -0,0 +1,183 @@
+import argparse
+import http.client
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """
+    Helper function: fetches a percentile of sorted values (nearest rank).
+    """
+    if not values:
+        return float('nan')
+
+    return values[min(len(values) - 1, int(fraction*len(values)))]
+
+
+def _run_client(
+    host: str,
+    port: int,
+    body: bytes,
+    deadline: float
+) -> Dict[str, List]:
+    """
+    Helper function: sends requests over one keep-alive connection until the
+    deadline.
+
+    Returns
+    -------
+    Dict[str, List]
+        Latencies of successful requests, in seconds, and the status codes
+        of failed ones.
+    """
+    connection = http.client.HTTPConnection(host, port)
+    headers = {'Content-Type': 'application/json'}
+    latencies, failures = [], []
+
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        connection.request('POST', '/encode', body, headers)
+        response = connection.getresponse()
+        response.read()
+
+        if response.status == 200:
+            latencies.append(time.perf_counter() - start)
+        else:
+            failures.append(response.status)
+
+    connection.close()
+
+    return {'latencies': latencies, 'failures': failures}
+
+
+def run(
+    host: str,
+    port: int,
+    text: str,
+    correction_level: str,
+    batch_size: int,
+    concurrency: int,
+    duration: float
+) -> Dict[str, float]:
+    """
+    Runs a load test against an encoding service.
+
+    Parameters
+    ----------
+    host : str
+        Service host.
+    port : int
+        Service port.
+    text : str
+        Payload to encode.
+    correction_level : str
+        Error correction level.
+    batch_size : int
+        Payloads per request (1 sends single requests).
+    concurrency : int
+        Number of concurrent connections.
+    duration : float
+        Length of the test in seconds.
+
+    Returns
+    -------
+    Dict[str, float]
+        Request count, rejected count, requests per second, payloads per
+        second and p50/p99 latencies in milliseconds.
+    """
+    payload = {'text': text, 'correction_level': correction_level}
+    if batch_size > 1:
+        payload = {'batch': [payload]*batch_size}
+    body = json.dumps(payload).encode()
+
+    start = time.perf_counter()
+    deadline = start + duration
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(
+            lambda _: _run_client(host, port, body, deadline),
+            range(concurrency)
+        ))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(sum((r['latencies'] for r in results), []))
+    failures = sum((r['failures'] for r in results), [])
+
+    return {
+        'requests': len(latencies),
+        'rejected': len(failures),
+        'requests_per_second': len(latencies) / elapsed,
+        'payloads_per_second': len(latencies)*batch_size / elapsed,
+        'p50_ms': 1000*_percentile(latencies, 0.5),
+        'p99_ms': 1000*_percentile(latencies, 0.99)
+    }
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """
+    Creates command line parser for the load test.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        Parser object.
+    """
+    parser = argparse.ArgumentParser(
+        description='Load test for the QR Encoder HTTP service'
+    )
+
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('-p', '--port', type=int, default=8080)
+    parser.add_argument(
+        '-t',
+        '--text',
+        type=str,
+        default='https://example.com/item/0123456789',
+        help='Payload to encode.'
+    )
+    parser.add_argument(
+        '-c',
+        '--correction-level',
+        type=str,
+        default='M',
+        help='Error correction level.'
+    )
+    parser.add_argument(
+        '-b',
+        '--batch-size',
+        type=int,
+        default=1,
+        help='Payloads per request.'
+    )
+    parser.add_argument(
+        '-n',
+        '--concurrency',
+        type=int,
+        default=8,
+        help='Number of concurrent connections.'
+    )
+    parser.add_argument(
+        '-d',
+        '--duration',
+        type=float,
+        default=10.0,
+        help='Length of the test in seconds.'
+    )
+
+    return parser
+
+
+def main():
+    args = get_parser().parse_args()
+
+    report = run(
+        args.host, args.port, args.text, args.correction_level,
+        args.batch_size, args.concurrency, args.duration
+    )
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,561 @@
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from encode.common import (
+    ALIGNMENT_POSITIONS,
+    FORMAT_INFORMATION,
+    MICRO_FORMAT_INFORMATION,
+    MICRO_VERSIONS,
+    VERSION_INFORMATION,
+    _get_capacity
+)
+
+
+def get_size(version: int) -> int:
+    """
+    Computes the side length of a QR code in modules.
+
+    Micro QR codes M1 to M4 (versions -3 to 0) are 11 to 17 modules wide.
+
+    Parameters
+    ----------
+    version : int
+        QR code version.
+
+    Returns
+    -------
+    int
+        Number of modules per side.
+    """
+    if version < 1:
+        return 17 + 2*version
+    return 17 + 4*version
+
+
+@lru_cache(maxsize=None)
+def get_format_indices(version: int) -> Tuple[int, ...]:
+    """
+    Computes the matrix positions of the format information modules.
+
+    The 15 bits of format information are written twice: once around the top
+    left finder pattern, and once split between the top right and bottom left
+    finder patterns. Micro QR codes only have the first copy.
+
+    Parameters
+    ----------
+    version : int
+        QR code version.
+
+    Returns
+    -------
+    Tuple[int, ...]
+        Row-major matrix indices of bits 0 to 14 (least significant first)
+        of the first copy, followed by those of the second copy.
+    """
+    size = get_size(version)
+
+    if version < 1:
+        return tuple(
+            [row*size + 8 for row in range(1, 9)] +
+            [8*size + col for col in range(7, 0, -1)]
+        )
+
+    first = [row*size + 8 for row in (0, 1, 2, 3, 4, 5, 7, 8)] + \
+        [8*size + 7] + [8*size + col for col in (5, 4, 3, 2, 1, 0)]
+    second = [8*size + size - 1 - i for i in range(8)] + \
+        [(size - 15 + i)*size + 8 for i in range(8, 15)]
+
+    return tuple(first + second)
+
+
+@lru_cache(maxsize=None)
+def get_version_indices(version: int) -> Tuple[int, ...]:
+    """
+    Computes the matrix positions of the version information modules.
+
+    Version information is only present from version 7. The 18 bits are
+    written as a 6x3 block to the left of the top right finder pattern, and
+    as its transpose above the bottom left finder pattern.
+
+    Parameters
+    ----------
+    version : int
+        QR code version.
+
+    Returns
+    -------
+    Tuple[int, ...]
+        Row-major matrix indices of bits 0 to 17 (least significant first)
+        of the first copy, followed by those of the second copy.
+    """
+    if version < 7:
+        return ()
+
+    size = get_size(version)
+    first, second = [], []
+
+    for i in range(18):
+        a, b = size - 11 + i % 3, i // 3
+        first.append(b*size + a)
+        second.append(a*size + b)
+
+    return tuple(first + second)
+
+
+@lru_cache(maxsize=None)
+def get_format_modules(
+    correction_level: str,
+    mask: int,
+    version: int = 1
+) -> bytes:
+    """
+    Renders the format information for a correction level and mask as
+    module values, ordered as in get_format_indices().
+
+    Parameters
+    ----------
+    correction_level : str
+        Error correction level.
+    mask : int
+        Mask pattern reference (0 to 7, or 0 to 3 for Micro QR codes).
+    version : int, optional
+        QR code version. Only Micro QR codes (versions -3 to 0) have format
+        information that depends on the version (defaults to 1).
+
+    Returns
+    -------
+    bytes
+        Module values (1 for dark) for both copies of the format information
+        (the only copy for Micro QR codes).
+    """
+    if version < 1:
+        bits = MICRO_FORMAT_INFORMATION[version][correction_level][mask]
+        return bytes((bits >> i) & 1 for i in range(15))
+
+    bits = FORMAT_INFORMATION[correction_level][mask]
+
+    return bytes((bits >> i) & 1 for i in range(15)) * 2
+
+
+def write_format_information(
+    matrix: bytearray,
+    version: int,
+    correction_level: str,
+    mask: int
+) -> None:
+    """
+    Writes format information into a matrix.
+
+    Parameters
+    ----------
+    matrix : bytearray
+        Row-major module values of the QR code.
+    version : int
+        QR code version.
+    correction_level : str
+        Error correction level.
+    mask : int
+        Mask pattern reference (0 to 7, or 0 to 3 for Micro QR codes).
+    """
+    if version < 1:
+        modules = get_format_modules(correction_level, mask, version)
+    else:
+        modules = get_format_modules(correction_level, mask)
+
+    for idx, value in zip(get_format_indices(version), modules):
+        matrix[idx] = value
+
+
+def _draw_square(
+    modules: bytearray,
+    reserved: bytearray,
+    size: int,
+    row: int,
+    col: int,
+    pattern: Tuple[int, ...]
+) -> None:
+    """
+    Helper function: draws a square function pattern made of concentric
+    rings.
+
+    Parameters
+    ----------
+    modules : bytearray
+        Module values.
+    reserved : bytearray
+        Function module flags.
+    size : int
+        Number of modules per side.
+    row : int
+        Row of the centre of the pattern.
+    col : int
+        Column of the centre of the pattern.
+    pattern : Tuple[int, ...]
+        Module value of each ring, starting from the centre.
+    """
+    radius = len(pattern) - 1
+
+    for r in range(row - radius, row + radius + 1):
+        for c in range(col - radius, col + radius + 1):
+            if 0 <= r < size and 0 <= c < size:
+                ring = max(abs(r - row), abs(c - col))
+                modules[r*size + c] = pattern[ring]
+                reserved[r*size + c] = 1
+
+
+@lru_cache(maxsize=None)
+def get_function_patterns(version: int) -> Tuple[bytes, bytes]:
+    """
+    Renders the function patterns of a QR code.
+
+    The template contains the finder patterns and their separators, the
+    timing patterns, the alignment patterns, the dark module and the version
+    information. The format information modules are reserved but left
+    light, since they depend on the correction level and mask.
+
+    Micro QR codes only have the top left finder pattern, and their timing
+    patterns run along the top row and left column.
+
+    Parameters
+    ----------
+    version : int
+        QR code version.
+
+    Returns
+    -------
+    Tuple[bytes, bytes]
+        Row-major module values (1 for dark) and function module flags (1
+        for modules which do not hold data).
+    """
+    size = get_size(version)
+    modules, reserved = bytearray(size*size), bytearray(size*size)
+    finder = (1, 1, 0, 1, 0)
+
+    if version < 1:
+        for idx in range(8, size):
+            modules[idx] = modules[idx*size] = (idx + 1) % 2
+            reserved[idx] = reserved[idx*size] = 1
+
+        _draw_square(modules, reserved, size, 3, 3, finder)
+        for idx in get_format_indices(version):
+            reserved[idx] = 1
+
+        return bytes(modules), bytes(reserved)
+
+    for idx in range(8, size - 8):
+        modules[6*size + idx] = modules[idx*size + 6] = (idx + 1) % 2
+        reserved[6*size + idx] = reserved[idx*size + 6] = 1
+
+    for row, col in ((3, 3), (3, size - 4), (size - 4, 3)):
+        _draw_square(modules, reserved, size, row, col, finder)
+
+    positions = ALIGNMENT_POSITIONS[version]
+    last = len(positions) - 1
+    for i, row in enumerate(positions):
+        for j, col in enumerate(positions):
+            if (i, j) not in ((0, 0), (0, last), (last, 0)):
+                _draw_square(modules, reserved, size, row, col, (1, 0, 1))
+
+    for idx in get_format_indices(version):
+        reserved[idx] = 1
+    modules[(size - 8)*size + 8] = reserved[(size - 8)*size + 8] = 1
+
+    if version >= 7:
+        bits = VERSION_INFORMATION[version]
+        for i, idx in enumerate(get_version_indices(version)):
+            modules[idx] = (bits >> (i % 18)) & 1
+            reserved[idx] = 1
+
+    return bytes(modules), bytes(reserved)
+
+
+@lru_cache(maxsize=None)
+def get_placement_order(version: int) -> Tuple[int, ...]:
+    """
+    Computes the order in which data bits are placed in the matrix.
+
+    Bits are placed in two-module wide columns, starting from the bottom
+    right corner and moving upwards, then downwards in the next column to the
+    left, and so on. The vertical timing pattern column of QR codes is
+    skipped and function modules are passed over.
+
+    Parameters
+    ----------
+    version : int
+        QR code version.
+
+    Returns
+    -------
+    Tuple[int, ...]
+        Row-major matrix indices of every data module, in placement order.
+    """
+    size = get_size(version)
+    _, reserved = get_function_patterns(version)
+    order = []
+
+    right, upwards = size - 1, True
+    while right > 0:
+        if right == 6 and version > 0:
+            right = 5
+
+        rows = range(size - 1, -1, -1) if upwards else range(size)
+        for row in rows:
+            for col in (right, right - 1):
+                if not reserved[row*size + col]:
+                    order.append(row*size + col)
+
+        right, upwards = right - 2, not upwards
+
+    return tuple(order)
+
+
+_MASK_CONDITIONS = (
+    lambda i, j: (i + j) % 2 == 0,
+    lambda i, j: i % 2 == 0,
+    lambda i, j: j % 3 == 0,
+    lambda i, j: (i + j) % 3 == 0,
+    lambda i, j: (i // 2 + j // 3) % 2 == 0,
+    lambda i, j: (i*j) % 2 + (i*j) % 3 == 0,
+    lambda i, j: ((i*j) % 2 + (i*j) % 3) % 2 == 0,
+    lambda i, j: ((i + j) % 2 + (i*j) % 3) % 2 == 0
+)
+_MICRO_MASKS = (1, 4, 6, 7)
+
+_BYTE_BITS = tuple(
+    bytes((value >> shift) & 1 for shift in range(7, -1, -1))
+    for value in range(256)
+)
+
+
+@lru_cache(maxsize=None)
+def get_mask_pattern(version: int, mask: int) -> int:
+    """
+    Renders a mask pattern over the data modules of a QR code.
+
+    Parameters
+    ----------
+    version : int
+        QR code version.
+    mask : int
+        Mask pattern reference (0 to 7). Micro QR codes use patterns 1, 4, 6
+        and 7 as their patterns 0 to 3.
+
+    Returns
+    -------
+    int
+        The row-major module values of the pattern (1 where a data module is
+        inverted), as a big-endian integer with one byte per module, so the
+        mask can be applied to a whole matrix with a single XOR.
+    """
+    size = get_size(version)
+    _, reserved = get_function_patterns(version)
+    condition = _MASK_CONDITIONS[_MICRO_MASKS[mask] if version < 1 else mask]
+
+    pattern = bytes(
+        int(not reserved[i*size + j] and condition(i, j))
+        for i in range(size) for j in range(size)
+    )
+
+    return int.from_bytes(pattern, 'big')
+
+
+def place_data(
+    version: int,
+    codewords: List[int],
+    correction_level: Optional[str] = None
+) -> bytearray:
+    """
+    Places codewords in the function pattern template of a QR code.
+
+    Parameters
+    ----------
+    version : int
+        QR code version.
+    codewords : List[int]
+        Final (interleaved) codewords.
+    correction_level : str, optional
+        Error correction level. Only needed for M1 and M3 Micro QR codes,
+        whose final data codeword is 4 bits: the low 4 bits of that
+        codeword are not placed.
+
+    Returns
+    -------
+    bytearray
+        Row-major module values (1 for dark), unmasked and without format
+        information. Remainder modules are left light.
+    """
+    modules, _ = get_function_patterns(version)
+    matrix = bytearray(modules)
+    bits = b''.join(_BYTE_BITS[codeword] for codeword in codewords)
+
+    if version in (MICRO_VERSIONS['M1'], MICRO_VERSIONS['M3']):
+        num_bits = _get_capacity(version, correction_level)
+        bits = bits[:num_bits] + bits[num_bits + 4:]
+
+    for idx, bit in zip(get_placement_order(version), bits):
+        matrix[idx] = bit
+
+    return matrix
+
+
+def apply_mask(matrix: bytearray, version: int, mask: int) -> bytearray:
+    """
+    Applies a mask pattern to the data modules of a matrix.
+
+    Parameters
+    ----------
+    matrix : bytearray
+        Row-major module values.
+    version : int
+        QR code version.
+    mask : int
+        Mask pattern reference (0 to 7, or 0 to 3 for Micro QR codes).
+
+    Returns
+    -------
+    bytearray
+        Masked copy of the matrix.
+    """
+    masked = int.from_bytes(matrix, 'big') ^ get_mask_pattern(version, mask)
+
+    return bytearray(masked.to_bytes(len(matrix), 'big'))
+
+
+_RUN_PATTERN = re.compile(rb'\x00{5,}|\x01{5,}')
+_FINDER_PATTERN = bytes((1, 0, 1, 1, 1, 0, 1))
+
+
+def get_penalty(matrix: bytearray, size: int) -> int:
+    """
+    Scores a masked matrix using the four penalty rules.
+
+    1. 3 + (n - 5) for each run of n >= 5 same-coloured modules in a row or
+       column.
+    2. 3 for each 2x2 block of same-coloured modules.
+    3. 40 for each finder-like 1:1:3:1:1 pattern preceded or followed by
+       four light modules in a row or column (modules outside the symbol
+       count as light).
+    4. 10 for each full 5% the proportion of dark modules deviates from
+       50%.
+
+    Parameters
+    ----------
+    matrix : bytearray
+        Row-major module values.
+    size : int
+        Number of modules per side.
+
+    Returns
+    -------
+    int
+        Penalty score (lower is better).
+    """
+    rows = [bytes(matrix[i*size:(i + 1)*size]) for i in range(size)]
+    cols = [bytes(matrix[j::size]) for j in range(size)]
+    penalty = 0
+
+    for line in rows + cols:
+        for run in _RUN_PATTERN.finditer(line):
+            penalty += run.end() - run.start() - 2
+
+        padded = bytes(4) + line + bytes(4)
+        idx = padded.find(_FINDER_PATTERN)
+        while idx != -1:
+            if not any(padded[idx - 4:idx]) or \
+                    not any(padded[idx + 7:idx + 11]):
+                penalty += 40
+                idx = padded.find(_FINDER_PATTERN, idx + 7)
+            else:
+                idx = padded.find(_FINDER_PATTERN, idx + 4)
+
+    full = (1 << size) - 1
+    row_bits = [int(row.hex()[1::2], 2) for row in rows]
+    for upper, lower in zip(row_bits, row_bits[1:]):
+        dark = upper & lower
+        light = ~(upper | lower) & full
+        penalty += 3*(
+            bin(dark & (dark >> 1)).count('1') +
+            bin(light & (light >> 1)).count('1')
+        )
+
+    dark, total = sum(matrix), size*size
+    penalty += 10*(abs(20*dark - 10*total) // total)
+
+    return penalty
+
+
+def get_micro_score(matrix: bytearray, size: int) -> int:
+    """
+    Scores a masked Micro QR code matrix.
+
+    The dark modules of the right column (SUM1) and bottom row (SUM2) are
+    counted, excluding the timing pattern module. The score is
+    16*min(SUM1, SUM2) + max(SUM1, SUM2).
+
+    Parameters
+    ----------
+    matrix : bytearray
+        Row-major module values.
+    size : int
+        Number of modules per side.
+
+    Returns
+    -------
+    int
+        Score (higher is better).
+    """
+    right = sum(matrix[2*size - 1::size])
+    bottom = sum(matrix[(size - 1)*size + 1:])
+
+    return 16*min(right, bottom) + max(right, bottom)
+
+
+def build_matrix(
+    version: int,
+    correction_level: str,
+    codewords: List[int],
+    mask: Optional[int] = None
+) -> Tuple[bytearray, int]:
+    """
+    Builds the complete module matrix of a QR code.
+
+    Parameters
+    ----------
+    version : int
+        QR code version.
+    correction_level : str
+        Error correction level.
+    codewords : List[int]
+        Final (interleaved) codewords.
+    mask : int, optional
+        Mask pattern reference. Defaults to the pattern with the lowest
+        penalty score (the highest get_micro_score() for Micro QR codes).
+
+    Returns
+    -------
+    bytearray, int
+        Row-major module values (1 for dark), and the mask pattern used.
+    """
+    unmasked = place_data(version, codewords, correction_level)
+    size = get_size(version)
+
+    num_masks = 4 if version < 1 else 8
+    candidates = range(num_masks) if mask is None else (mask,)
+    best_matrix, best_mask, best_penalty = None, None, None
+
+    for candidate in candidates:
+        matrix = apply_mask(unmasked, version, candidate)
+        write_format_information(matrix, version, correction_level, candidate)
+
+        if mask is not None:
+            return matrix, candidate
+
+        if version < 1:
+            penalty = -get_micro_score(matrix, size)
+        else:
+            penalty = get_penalty(matrix, size)
+        if best_penalty is None or penalty < best_penalty:
+            best_matrix, best_mask, best_penalty = matrix, candidate, penalty
+
+    return best_matrix, best_mask
@@ -0,0 +1,89 @@
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+from encode.common import (
+    _get_block_info, _get_capacity, _get_indicator_length,
+    _get_mode_indicator, _get_terminator_length
+)
+from encode.error_correction import _get_generator, get_interleave_order
+from encode.matrix import get_placement_order
+
+
+class EncodingPlan(NamedTuple):
+    """
+    Everything about encoding a QR code that depends only on its mode,
+    version and error correction level.
+
+    Plans are immutable and built once per (mode, version, level) by
+    get_plan(), so encoders only do the work that depends on the message.
+    """
+    mode: str
+    version: int
+    correction_level: str
+    mode_indicator: str
+    indicator_length: int
+    terminator_length: int
+    num_bits: int
+    block_info: Tuple[int, int, int, Optional[int], Optional[int]]
+    block_bounds: Tuple[Tuple[int, int], ...]
+    num_ec: int
+    generator: Tuple[int, ...]
+    interleave_order: Tuple[int, ...]
+    placement_order: Tuple[int, ...]
+
+
+@lru_cache(maxsize=None)
+def get_plan(mode: str, version: int, correction_level: str) -> EncodingPlan:
+    """
+    Builds the encoding plan for a mode, version and correction level.
+
+    Parameters
+    ----------
+    mode : str
+        Encoding mode ('numeric', 'alphanumeric', 'bytes' or 'kanji').
+    version : int
+        QR code version (Micro QR versions M1 to M4 are -3 to 0).
+    correction_level : str
+        Error correction level.
+
+    Returns
+    -------
+    EncodingPlan
+        Mode indicator, character count indicator length, terminator
+        length, number of data bits, block information, (start, stop)
+        message codeword indices of each block, error correction bytes per
+        block, generator polynomial, interleaving permutation (see
+        get_interleave_order()) and data module placement order.
+
+    Raises
+    ------
+    ValueError
+        The mode is not available in the (Micro QR) version.
+    """
+    mode_indicator = _get_mode_indicator(mode, version)
+    if mode_indicator is None:
+        raise ValueError(f'Version {version} does not support {mode} mode.')
+
+    block_info = _get_block_info(version, correction_level)
+    num_ec, g1_count, g1_size, g2_count, g2_size = block_info
+
+    bounds, start = [], 0
+    for size in [g1_size]*g1_count + [g2_size]*(g2_count or 0):
+        bounds.append((start, start + size))
+        start += size
+
+    return EncodingPlan(
+        mode=mode,
+        version=version,
+        correction_level=correction_level,
+        mode_indicator=mode_indicator,
+        indicator_length=_get_indicator_length(mode, version),
+        terminator_length=_get_terminator_length(version),
+        num_bits=_get_capacity(version, correction_level),
+        block_info=block_info,
+        block_bounds=tuple(bounds),
+        num_ec=num_ec,
+        generator=_get_generator(num_ec),
+        interleave_order=get_interleave_order(block_info),
+        placement_order=get_placement_order(version)
+    )
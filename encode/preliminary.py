@@ -1,3 +1,6 @@
+from itertools import groupby
+from typing import List, Tuple
+
 from encode.common import (
     ALPHANUMERIC_CHARS,
     CORRECTION_LEVELS
@@ -5,10 +8,22 @@ from encode.common import (
 from encode.data_encoder import (
     AlphanumericEncoder,
     BytesEncoder,
+    KanjiEncoder,
+    MixedEncoder,
     NumericEncoder,
     QREncoder
 )
 
+_ALPHANUMERIC_BYTES = b'0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ' + \
+    ''.join(ALPHANUMERIC_CHARS).encode()
+
+ENCODERS = {
+    'numeric': NumericEncoder,
+    'alphanumeric': AlphanumericEncoder,
+    'byte': BytesEncoder,
+    'kanji': KanjiEncoder
+}
+
 
 def select_encoding(msg: str) -> str:
     """
@@ -17,7 +32,8 @@ def select_encoding(msg: str) -> str:
     If msg is strictly decimal, specifies numeric encoding. If msg is composed
     of numbers, uppercase letters, and characters in
     (' ', '$', '%', '*', '+', '-', '.', '/', ':'), specifies alphanumeric
-    encoding. Otherwise, specifies byte encoding.
+    encoding. If every character of msg is a double-byte Shift JIS character,
+    specifies kanji encoding. Otherwise, specifies byte encoding.
 
     Parameters
     ----------
@@ -37,28 +53,137 @@ def select_encoding(msg: str) -> str:
     if len(msg) > 7089:
         raise ValueError('Input exceeds maximum encoding length.')
 
+    return _classify(msg)
+
+
+def _classify(msg: str) -> str:
+    """
+    Helper function: determines the encoding mode of msg regardless of its
+    length.
+
+    Parameters
+    ----------
+    msg : str
+        Text to be encoded.
+
+    Returns
+    -------
+    str
+        Specified encoding mode.
+    """
     if msg.isdecimal():
         return 'numeric'
 
+    # ASCII text is never kanji.
+    if not msg.isascii() and _is_kanji(msg):
+        return 'kanji'
+
+    return 'alphanumeric' if _is_alphanumeric(msg) else 'byte'
+
+
+def _is_alphanumeric(msg: str) -> bool:
+    """
+    Helper function: determines whether msg can be encoded in alphanumeric
+    mode.
+
+    Parameters
+    ----------
+    msg : str
+        Text to be encoded.
+
+    Returns
+    -------
+    bool
+        True if every character of msg is an ASCII digit, an ASCII
+        uppercase letter or one of ALPHANUMERIC_CHARS.
+    """
+    if not msg.isascii():
+        return False
+
+    # Deleting every alphanumeric character leaves nothing.
+    return not msg.encode('ascii').translate(None, _ALPHANUMERIC_BYTES)
+
+
+def _is_kanji(msg: str) -> bool:
+    """
+    Helper function: determines whether msg can be encoded in kanji mode.
+
+    Parameters
+    ----------
+    msg : str
+        Text to be encoded.
+
+    Returns
+    -------
+    bool
+        True if every character of msg is a double-byte Shift JIS character
+        in the ranges [0x8140, 0x9FFC] or [0xE040, 0xEBBF].
+    """
+    if not msg:
+        return False
+
     for char in msg:
-        if (char.isalpha() and char.islower()) or \
-            (not char.isalpha() and not char.isdecimal()
-             and char not in ALPHANUMERIC_CHARS):
-            return 'byte'
+        try:
+            encoded = char.encode('shift_jis')
+        except UnicodeEncodeError:
+            return False
 
-    return 'alphanumeric'
+        if len(encoded) != 2:
+            return False
 
+        value = int.from_bytes(encoded, 'big')
+        if not (0x8140 <= value <= 0x9FFC or 0xE040 <= value <= 0xEBBF):
+            return False
 
-def select_encoder(msg: str, correction_level: str) -> QREncoder:
+    return True
+
+
+def _segment(msg: str) -> List[Tuple[str, str]]:
+    """
+    Helper function: splits msg into runs of kanji and runs of other
+    characters, with the encoding mode of each run.
+
+    Parameters
+    ----------
+    msg : str
+        Text to be encoded.
+
+    Returns
+    -------
+    List[Tuple[str, str]]
+        Mode ('numeric', 'alphanumeric', 'bytes' or 'kanji') and text of
+        each run, in order.
+    """
+    segments = []
+
+    for is_kanji, run in groupby(msg, _is_kanji):
+        text = ''.join(run)
+        mode = 'kanji' if is_kanji else _classify(text)
+        segments.append(('bytes' if mode == 'byte' else mode, text))
+
+    return segments
+
+
+def select_encoder(
+    msg: str,
+    correction_level: str,
+    micro: bool = False
+) -> QREncoder:
     """
     Selects an appropriate QR encoder for the message input.
 
+    Byte mode only holds Latin-1 characters, so messages mixing kanji with
+    other characters are split into segments (see MixedEncoder).
+
     Parameters
     ----------
     msg: str
         Text to be encoded as a QR code.
     correction_level : str
         Specified error correction level.
+    micro : bool, optional
+        Pick the smallest symbol including Micro QR codes M1 to M4 (defaults
+        to False).
 
     Returns
     -------
@@ -70,17 +195,17 @@ def select_encoder(msg: str, correction_level: str) -> QREncoder:
     TypeError
         Input is not a string.
     ValueError
-        Correction level not in ('L', 'M', 'Q', 'H')
+        Correction level not in ('L', 'M', 'Q', 'H'), message too long, or
+        a character is neither kanji nor Latin-1.
     """
     if not isinstance(msg, str):
         raise TypeError(f'Message is not a string: {msg}.')
     if correction_level.upper() not in CORRECTION_LEVELS:
         raise ValueError(f'Unrecognized correction level: {correction_level}.')
 
-    encoding = select_encoding(msg)
-    if encoding == 'numeric':
-        return NumericEncoder(msg, correction_level.upper())
-    if encoding == 'alphanumeric':
-        return AlphanumericEncoder(msg, correction_level.upper())
-    else:
-        return BytesEncoder(msg, correction_level.upper())
+    level, encoding = correction_level.upper(), select_encoding(msg)
+    if encoding == 'byte' and not msg.isascii() and \
+            max(map(ord, msg)) > 0xFF:
+        return MixedEncoder(_segment(msg), level, micro=micro)
+
+    return ENCODERS[encoding](msg, level, micro=micro)
@@ -0,0 +1,191 @@
+import os
+import struct
+import zlib
+from typing import BinaryIO, Iterable, Iterator
+
+from encode.symbol import QRSymbol
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_CHUNK_SIZE = 1 << 16
+
+
+def iter_scanlines(
+    rows: Iterable[bytes],
+    size: int,
+    scale: int = 1,
+    border: int = 4,
+    dark_bit: int = 1
+) -> Iterator[bytes]:
+    """
+    Upscales module rows to packed one bit per pixel scanlines.
+
+    Each module row is packed once and yielded scale times, so only one
+    scanline is held in memory at a time. Scanlines are packed most
+    significant bit first and padded with light pixels to a whole number of
+    bytes, as in the PBM and PNG formats.
+
+    Parameters
+    ----------
+    rows : Iterable[bytes]
+        Module values of each row (1 for dark), such as QRSymbol.rows().
+    size : int
+        Number of modules per row.
+    scale : int, optional
+        Pixels per module (defaults to 1).
+    border : int, optional
+        Quiet zone width in modules (defaults to 4).
+    dark_bit : int, optional
+        Bit value of dark pixels: 1 for PBM, 0 for greyscale PNG (defaults
+        to 1).
+
+    Yields
+    ------
+    bytes
+        Packed scanline.
+    """
+    width = (size + 2*border)*scale
+    row_bytes = (width + 7) // 8
+    padding = 8*row_bytes - width
+
+    dark, light = str(dark_bit), str(1 - dark_bit)
+    expand = {ord('0'): light*scale, ord('1'): dark*scale}
+    edge = light*(border*scale)
+    pad = light*padding
+
+    quiet = int(light*width + pad, 2).to_bytes(row_bytes, 'big')
+    for _ in range(border*scale):
+        yield quiet
+
+    for row in rows:
+        bits = edge + row.hex()[1::2].translate(expand) + edge + pad
+        scanline = int(bits, 2).to_bytes(row_bytes, 'big')
+        for _ in range(scale):
+            yield scanline
+
+    for _ in range(border*scale):
+        yield quiet
+
+
+def write_pbm(
+    symbol: QRSymbol,
+    file: BinaryIO,
+    scale: int = 1,
+    border: int = 4
+) -> None:
+    """
+    Writes a QR code as a binary PBM (P4) image, one scanline at a time.
+
+    Parameters
+    ----------
+    symbol : QRSymbol
+        QR code to render.
+    file : BinaryIO
+        Writable binary file.
+    scale : int, optional
+        Pixels per module (defaults to 1).
+    border : int, optional
+        Quiet zone width in modules (defaults to 4).
+    """
+    width = (symbol.size + 2*border)*scale
+    file.write(f'P4\n{width} {width}\n'.encode())
+
+    for scanline in iter_scanlines(symbol.rows(), symbol.size, scale, border):
+        file.write(scanline)
+
+
+def _write_chunk(file: BinaryIO, kind: bytes, data: bytes) -> None:
+    """
+    Helper function: writes a PNG chunk.
+    """
+    file.write(struct.pack('>I', len(data)))
+    file.write(kind)
+    file.write(data)
+    file.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(kind))))
+
+
+def write_png(
+    symbol: QRSymbol,
+    file: BinaryIO,
+    scale: int = 1,
+    border: int = 4,
+    compression: int = 9
+) -> None:
+    """
+    Writes a QR code as a 1-bit greyscale PNG image, one scanline at a time.
+
+    Scanlines are fed to a streaming compressor and the compressed data is
+    written out in IDAT chunks of at most PNG_CHUNK_SIZE bytes.
+
+    Parameters
+    ----------
+    symbol : QRSymbol
+        QR code to render.
+    file : BinaryIO
+        Writable binary file.
+    scale : int, optional
+        Pixels per module (defaults to 1).
+    border : int, optional
+        Quiet zone width in modules (defaults to 4).
+    compression : int, optional
+        zlib compression level (defaults to 9).
+    """
+    width = (symbol.size + 2*border)*scale
+
+    file.write(PNG_SIGNATURE)
+    _write_chunk(
+        file, b'IHDR', struct.pack('>IIBBBBB', width, width, 1, 0, 0, 0, 0)
+    )
+
+    compressor = zlib.compressobj(compression)
+    pending = bytearray()
+    for scanline in iter_scanlines(
+        symbol.rows(), symbol.size, scale, border, dark_bit=0
+    ):
+        # Each scanline is preceded by its filter type (0, none).
+        pending += compressor.compress(b'\x00' + scanline)
+        while len(pending) >= PNG_CHUNK_SIZE:
+            _write_chunk(file, b'IDAT', bytes(pending[:PNG_CHUNK_SIZE]))
+            del pending[:PNG_CHUNK_SIZE]
+
+    pending += compressor.flush()
+    while pending:
+        _write_chunk(file, b'IDAT', bytes(pending[:PNG_CHUNK_SIZE]))
+        del pending[:PNG_CHUNK_SIZE]
+
+    _write_chunk(file, b'IEND', b'')
+
+
+RENDERERS = {'.pbm': write_pbm, '.png': write_png}
+
+
+def save(
+    symbol: QRSymbol,
+    path: str,
+    scale: int = 1,
+    border: int = 4
+) -> None:
+    """
+    Saves a QR code as an image, in the format given by the file extension.
+
+    Parameters
+    ----------
+    symbol : QRSymbol
+        QR code to render.
+    path : str
+        Image path ending in .pbm or .png.
+    scale : int, optional
+        Pixels per module (defaults to 1).
+    border : int, optional
+        Quiet zone width in modules (defaults to 4).
+
+    Raises
+    ------
+    ValueError
+        Unrecognized image format.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in RENDERERS:
+        raise ValueError(f'Unrecognized image format: {extension}.')
+
+    with open(path, 'wb') as file:
+        RENDERERS[extension](symbol, file, scale, border)
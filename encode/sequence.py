@@ -0,0 +1,175 @@
+from functools import lru_cache
+from operator import itemgetter
+from typing import Iterator, Optional, Tuple
+
+from encode.common import CORRECTION_LEVELS
+from encode.error_correction import _get_delta_table, ErrorCorrector
+from encode.data_encoder import NumericEncoder
+from encode.matrix import _BYTE_BITS, build_matrix, get_penalty, get_size
+from encode.plan import get_plan
+from encode.symbol import QRSymbol
+
+
+@lru_cache(maxsize=None)
+def _get_codeword_modules(
+    version: int,
+    correction_level: str
+) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Helper function: matrix indices of the 8 modules (most significant bit
+    first) holding each codeword, in message-then-error-correction order.
+    """
+    plan = get_plan('numeric', version, correction_level)
+    order = plan.placement_order
+    modules = [None]*len(plan.interleave_order)
+
+    for position, idx in enumerate(plan.interleave_order):
+        modules[idx] = order[8*position:8*position + 8]
+
+    return tuple(modules)
+
+
+def iter_sequence(
+    start: int,
+    count: int,
+    width: int,
+    correction_level: str,
+    mask: Optional[int] = None,
+    mask_slack: int = 120
+) -> Iterator[QRSymbol]:
+    """
+    Encodes a run of consecutive serial numbers as numeric QR codes.
+
+    Only the first number is encoded from scratch. Each following number
+    is a delta on the previous QR code: the 10-bit groups of 3 digits which
+    changed are patched in its codewords, the error correction bytes of the
+    affected blocks are XORed with the error correction bytes of the change
+    (Reed-Solomon codes are linear over GF(256)), and the modules of the
+    changed codewords are flipped in its (masked) matrix.
+
+    With a fixed mask, each QR code is identical to encoding its number from
+    scratch. Otherwise the first QR code's best mask is kept, and all masks
+    are only scored again once the kept mask's penalty rises above its
+    penalty when it was chosen by more than mask_slack. The QR codes are
+    valid either way, but may use a different mask than encoding them one
+    at a time would.
+
+    Parameters
+    ----------
+    start : int
+        First serial number.
+    count : int
+        Number of serial numbers.
+    width : int
+        Number of digits, with leading 0s (e.g. 9 for '000123456').
+    correction_level : str
+        Error correction level.
+    mask : int, optional
+        Mask pattern reference. Defaults to keeping a good mask as described
+        above.
+    mask_slack : int, optional
+        Penalty increase tolerated before masks are scored again (defaults
+        to 120, three finder-like patterns). Ignored with a fixed mask.
+
+    Yields
+    ------
+    QRSymbol
+        QR code of each serial number, in order.
+
+    Raises
+    ------
+    ValueError
+        Correction level not in ('L', 'M', 'Q', 'H'), or the serial numbers
+        do not all have width digits or do not fit in a QR code.
+    """
+    if correction_level.upper() not in CORRECTION_LEVELS:
+        raise ValueError(f'Unrecognized correction level: {correction_level}.')
+    correction_level = correction_level.upper()
+
+    if width < 1 or start < 0 or start + count > 10**width:
+        raise ValueError(
+            f'Serial numbers {start} to {start + count - 1} do not all have '
+            f'{width} digits.'
+        )
+    if count < 1:
+        return
+
+    message = f'{start:0{width}d}'
+    encoder = NumericEncoder(message, correction_level)
+    version, plan = encoder.version, encoder.plan
+    size, num_ec = get_size(version), plan.num_ec
+
+    codewords = encoder.correct_error(ErrorCorrector(plan.block_info))
+    buffer = bytearray(len(codewords))
+    for codeword, idx in zip(codewords, plan.interleave_order):
+        buffer[idx] = codeword
+
+    matrix, used = build_matrix(version, correction_level, codewords, mask)
+    if mask is None:
+        reference = get_penalty(matrix, size)
+    yield QRSymbol(
+        bytearray(matrix), version, correction_level, used, 'numeric'
+    )
+
+    # Bit offset and length of each group of digits, and the first error
+    # correction byte and delta table of each message codeword.
+    groups, offset = [], len(plan.mode_indicator) + plan.indicator_length
+    for i in range(0, width, 3):
+        length = (0, 4, 7, 10)[len(message[i:i + 3])]
+        groups.append((i, offset, length))
+        offset += length
+
+    targets, ec_start = [], (plan.num_bits + 7) // 8
+    for first, last in plan.block_bounds:
+        for idx in range(first, last):
+            targets.append(
+                (ec_start, _get_delta_table(plan.generator, last - 1 - idx))
+            )
+        ec_start += num_ec
+
+    modules = _get_codeword_modules(version, correction_level)
+
+    def flip(idx: int, diff: int) -> None:
+        buffer[idx] ^= diff
+        for bit, module in zip(_BYTE_BITS[diff], modules[idx]):
+            if bit:
+                matrix[module] ^= 1
+
+    previous = message
+    for number in range(start + 1, start + count):
+        message = f'{number:0{width}d}'
+        ec_diffs = {}
+
+        for i, offset, length in groups:
+            old, new = previous[i:i + 3], message[i:i + 3]
+            if old == new:
+                continue
+
+            first, last = offset // 8, (offset + length - 1) // 8
+            delta = (int(old) ^ int(new)) << 8*(last + 1) - offset - length
+            for idx, diff in enumerate(
+                delta.to_bytes(last - first + 1, 'big'), first
+            ):
+                if diff:
+                    flip(idx, diff)
+                    ec_start, table = targets[idx]
+                    ec_diffs[ec_start] = ec_diffs.get(ec_start, 0) ^ \
+                        table[diff]
+
+        for ec_start, ec_diff in ec_diffs.items():
+            for idx, diff in enumerate(
+                ec_diff.to_bytes(num_ec, 'big'), ec_start
+            ):
+                if diff:
+                    flip(idx, diff)
+
+        if mask is None and get_penalty(matrix, size) > reference + \
+                mask_slack:
+            codewords = list(itemgetter(*plan.interleave_order)(buffer))
+            matrix, used = build_matrix(version, correction_level, codewords)
+            reference = get_penalty(matrix, size)
+
+        previous = message
+        yield QRSymbol(
+            bytearray(matrix), version, correction_level, used, 'numeric'
+        )
@@ -0,0 +1,492 @@
+import argparse
+import asyncio
+import json
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+
+from encode.preliminary import select_encoder
+from encode.warmup import warmup
+
+MAX_BODY_SIZE = 1 << 20
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def encode_payload(message: str, correction_level: str = 'L') -> Dict:
+    """
+    Encodes a message and summarises the result.
+
+    Parameters
+    ----------
+    message : str
+        The message to be encoded.
+    correction_level : str, optional
+        Error correction level (defaults to 'L').
+
+    Returns
+    -------
+    Dict
+        Version, correction level, mode and final codewords (as a hex
+        string) of the QR code.
+    """
+    encoder = select_encoder(message, correction_level)
+
+    return {
+        'version': encoder.version,
+        'correction_level': encoder.correction_level,
+        'mode': encoder.mode,
+        'codewords': bytes(encoder.correct_error()).hex()
+    }
+
+
+def _get_executor() -> Executor:
+    """
+    Helper function: fetches the default process pool, creating it on first
+    use.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            warmup()
+            _executor = ProcessPoolExecutor()
+
+    return _executor
+
+
+async def encode_async(
+    message: str,
+    correction_level: str = 'L',
+    executor: Optional[Executor] = None
+) -> Dict:
+    """
+    Encodes a message without blocking the event loop.
+
+    Parameters
+    ----------
+    message : str
+        The message to be encoded.
+    correction_level : str, optional
+        Error correction level (defaults to 'L').
+    executor : Executor, optional
+        Executor to run the encoding in. Defaults to a shared process pool.
+
+    Returns
+    -------
+    Dict
+        See encode_payload.
+    """
+    loop = asyncio.get_running_loop()
+
+    return await loop.run_in_executor(
+        executor or _get_executor(), encode_payload, message,
+        correction_level
+    )
+
+
+def _parse_items(body: bytes) -> Tuple[List[Tuple[str, str]], bool]:
+    """
+    Helper function: parses the payloads of a request body.
+
+    The body is a JSON object with 'text' and optional 'correction_level'
+    keys, or a JSON object whose 'batch' key holds a list of such objects.
+
+    Parameters
+    ----------
+    body : bytes
+        Request body.
+
+    Returns
+    -------
+    List[Tuple[str, str]], bool
+        (message, correction level) pairs, and whether the request is a
+        batch.
+
+    Raises
+    ------
+    ValueError
+        Body is malformed.
+    """
+    try:
+        request = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as error:
+        raise ValueError(f'Invalid JSON: {error}.')
+
+    if not isinstance(request, dict):
+        raise ValueError('Request body is not an object.')
+
+    is_batch = 'batch' in request
+    entries = request['batch'] if is_batch else [request]
+    if not isinstance(entries, list):
+        raise ValueError('Batch is not a list.')
+
+    items = []
+    for entry in entries:
+        if not isinstance(entry, dict) or not isinstance(
+            entry.get('text'), str
+        ):
+            raise ValueError('Each payload needs a text string.')
+        items.append((entry['text'], str(entry.get('correction_level', 'L'))))
+
+    return items, is_batch
+
+
+class EncodingServer:
+    """
+    HTTP/1.1 server which encodes payloads on a process pool.
+
+    POST /encode accepts a single payload or a batch. Batch results are
+    streamed back as newline-delimited JSON, in request order, as they
+    complete. Requests which would take the number of queued payloads above
+    queue_depth are rejected with 503 Service Unavailable.
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        queue_depth: int = 256,
+        keep_alive_timeout: float = 15.0
+    ) -> None:
+        """
+        Constructor for the EncodingServer class.
+
+        Parameters
+        ----------
+        executor : Executor
+            Executor to run the encoding in.
+        queue_depth : int, optional
+            Maximum number of payloads queued or being encoded (defaults to
+            256).
+        keep_alive_timeout : float, optional
+            Seconds an idle connection is kept open (defaults to 15).
+        """
+        self.executor = executor
+        self.queue_depth = queue_depth
+        self.keep_alive_timeout = keep_alive_timeout
+        self.pending = 0
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080):
+        """
+        Starts listening for connections.
+
+        Parameters
+        ----------
+        host : str, optional
+            Interface to bind to (defaults to '127.0.0.1').
+        port : int, optional
+            Port to bind to (defaults to 8080, 0 picks a free port).
+
+        Returns
+        -------
+        asyncio.Server
+            The listening server.
+        """
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Serves requests on a connection until the client closes it, asks for
+        it to be closed, or it is idle for keep_alive_timeout seconds.
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            Connection reader.
+        writer : asyncio.StreamWriter
+            Connection writer.
+        """
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    head = await asyncio.wait_for(
+                        reader.readuntil(b'\r\n\r\n'), self.keep_alive_timeout
+                    )
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    break
+
+                keep_alive = await self.handle_request(head, reader, writer)
+        except (ConnectionError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(
+        self,
+        head: bytes,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> bool:
+        """
+        Serves a single request.
+
+        Parameters
+        ----------
+        head : bytes
+            Request line and headers.
+        reader : asyncio.StreamReader
+            Connection reader.
+        writer : asyncio.StreamWriter
+            Connection writer.
+
+        Returns
+        -------
+        bool
+            Whether the connection should be kept open.
+        """
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, path, protocol = lines[0].split(' ')
+        except ValueError:
+            await self._respond(writer, HTTPStatus.BAD_REQUEST, False)
+            return False
+
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if protocol == 'HTTP/1.1' \
+            else connection == 'keep-alive'
+
+        length = headers.get('content-length') or '0'
+        if not (length.isascii() and length.isdigit()):
+            await self._respond(
+                writer, HTTPStatus.BAD_REQUEST, False,
+                {'error': f'Invalid Content-Length: {length}.'}
+            )
+            return False
+        if int(length) > MAX_BODY_SIZE:
+            await self._respond(
+                writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, False
+            )
+            return False
+
+        try:
+            body = await reader.readexactly(int(length))
+        except asyncio.IncompleteReadError:
+            await self._respond(
+                writer, HTTPStatus.BAD_REQUEST, False,
+                {'error': 'Body is shorter than its Content-Length.'}
+            )
+            return False
+
+        if path != '/encode':
+            await self._respond(writer, HTTPStatus.NOT_FOUND, keep_alive)
+            return keep_alive
+        if method != 'POST':
+            await self._respond(
+                writer, HTTPStatus.METHOD_NOT_ALLOWED, keep_alive
+            )
+            return keep_alive
+
+        try:
+            items, is_batch = _parse_items(body)
+        except ValueError as error:
+            await self._respond(
+                writer, HTTPStatus.BAD_REQUEST, keep_alive,
+                {'error': str(error)}
+            )
+            return keep_alive
+
+        if self.pending + len(items) > self.queue_depth:
+            await self._respond(
+                writer, HTTPStatus.SERVICE_UNAVAILABLE, keep_alive,
+                {'error': 'Encoding queue is full.'}, {'Retry-After': '1'}
+            )
+            return keep_alive
+
+        self.pending += len(items)
+        loop = asyncio.get_running_loop()
+        futures = [
+            loop.run_in_executor(self.executor, encode_payload, *item)
+            for item in items
+        ]
+
+        try:
+            if is_batch:
+                await self._stream(writer, futures, keep_alive)
+            else:
+                try:
+                    result = await futures[0]
+                except (TypeError, ValueError) as error:
+                    await self._respond(
+                        writer, HTTPStatus.BAD_REQUEST, keep_alive,
+                        {'error': str(error)}
+                    )
+                else:
+                    await self._respond(
+                        writer, HTTPStatus.OK, keep_alive, result
+                    )
+        finally:
+            self.pending -= len(items)
+
+        return keep_alive
+
+    async def _stream(
+        self,
+        writer: asyncio.StreamWriter,
+        futures: List[asyncio.Future],
+        keep_alive: bool
+    ) -> None:
+        """
+        Streams batch results as chunks of newline-delimited JSON.
+
+        Parameters
+        ----------
+        writer : asyncio.StreamWriter
+            Connection writer.
+        futures : List[asyncio.Future]
+            Pending results, in request order.
+        keep_alive : bool
+            Whether the connection will be kept open.
+        """
+        writer.write(_get_head(HTTPStatus.OK, keep_alive, {
+            'Content-Type': 'application/x-ndjson',
+            'Transfer-Encoding': 'chunked'
+        }))
+
+        for future in futures:
+            try:
+                result = await future
+            except (TypeError, ValueError) as error:
+                result = {'error': str(error)}
+
+            line = json.dumps(result).encode() + b'\n'
+            writer.write(b'%x\r\n%s\r\n' % (len(line), line))
+            await writer.drain()
+
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        keep_alive: bool,
+        content: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Writes a complete JSON response.
+
+        Parameters
+        ----------
+        writer : asyncio.StreamWriter
+            Connection writer.
+        status : HTTPStatus
+            Response status.
+        keep_alive : bool
+            Whether the connection will be kept open.
+        content : Dict, optional
+            Response body (defaults to the status phrase).
+        headers : Dict[str, str], optional
+            Additional response headers.
+        """
+        body = json.dumps(
+            content if content is not None else {'error': status.phrase}
+        ).encode()
+
+        writer.write(_get_head(status, keep_alive, {
+            'Content-Type': 'application/json',
+            'Content-Length': str(len(body)),
+            **(headers or {})
+        }) + body)
+        await writer.drain()
+
+
+def _get_head(
+    status: HTTPStatus,
+    keep_alive: bool,
+    headers: Dict[str, str]
+) -> bytes:
+    """
+    Helper function: formats a response status line and headers.
+    """
+    lines = [f'HTTP/1.1 {status.value} {status.phrase}']
+    lines.extend(f'{name}: {value}' for name, value in headers.items())
+    lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """
+    Creates command line parser for the encoding service.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        Parser object.
+    """
+    parser = argparse.ArgumentParser(description='QR Encoder HTTP service')
+
+    parser.add_argument(
+        '--host',
+        type=str,
+        default='127.0.0.1',
+        help='Interface to bind to.'
+    )
+    parser.add_argument(
+        '-p',
+        '--port',
+        type=int,
+        default=8080,
+        help='Port to bind to.'
+    )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of encoding processes (defaults to the CPU count).'
+    )
+    parser.add_argument(
+        '-q',
+        '--queue-depth',
+        type=int,
+        default=256,
+        help='Maximum number of queued payloads before responding 503.'
+    )
+
+    return parser
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """
+    Runs the encoding service until cancelled.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed command line arguments.
+    """
+    warmup(freeze=True)
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        server = await EncodingServer(executor, args.queue_depth).start(
+            args.host, args.port
+        )
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    args = get_parser().parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from encode.matrix import get_size
+from encode.preliminary import select_encoder
+from encode.symbol import QRSymbol
+
+SHEET_FORMATS = ('pbm', 'raw')
+
+
+class SheetWriter:
+    """
+    Writes same-version QR codes into the tiles of a memory-mapped sheet.
+
+    The sheet is either a binary PBM (P4) image, with one bit per pixel, or
+    a headerless raw bitmap with one byte per pixel (1 for dark). Tiles are
+    (size + 2*border)*scale pixels square; in PBM sheets each tile row is
+    padded to a whole number of bytes so that no two tiles share a byte, and
+    tiles can be written concurrently from several processes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        version: int,
+        columns: int,
+        rows: int,
+        scale: int = 1,
+        border: int = 4,
+        fmt: str = 'pbm'
+    ) -> None:
+        """
+        Constructor for the SheetWriter class. Creates the sheet file.
+
+        Parameters
+        ----------
+        path : str
+            Sheet file path.
+        version : int
+            Version of every QR code on the sheet.
+        columns : int
+            Number of tiles per row.
+        rows : int
+            Number of tile rows.
+        scale : int, optional
+            Pixels per module (defaults to 1).
+        border : int, optional
+            Quiet zone width in modules (defaults to 4).
+        fmt : str, optional
+            'pbm' or 'raw' (defaults to 'pbm').
+
+        Raises
+        ------
+        ValueError
+            Unrecognized format.
+        """
+        if fmt not in SHEET_FORMATS:
+            raise ValueError(f'Unrecognized sheet format: {fmt}.')
+
+        self.path = path
+        self.version = version
+        self.columns = columns
+        self.rows = rows
+        self.scale = scale
+        self.border = border
+        self.fmt = fmt
+
+        self.tile_size = (get_size(version) + 2*border)*scale
+        if fmt == 'pbm':
+            self.tile_pitch = -(-self.tile_size // 8)
+            self.width = 8*self.tile_pitch*columns
+            self.header = f'P4\n{self.width} {self.tile_size*rows}\n'.encode()
+            self.row_bytes = self.width // 8
+        else:
+            self.tile_pitch = self.tile_size
+            self.width = self.tile_size*columns
+            self.header = b''
+            self.row_bytes = self.width
+
+        self.length = len(self.header) + self.row_bytes*self.tile_size*rows
+
+        with open(path, 'w+b') as file:
+            file.truncate(self.length)
+            file.write(self.header)
+
+        self._mapped = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_mapped'] = None
+        return state
+
+    def _get_mapped(self) -> mmap.mmap:
+        """
+        Helper function: maps the sheet file, on first use in each process.
+        """
+        if self._mapped is None:
+            with open(self.path, 'r+b') as file:
+                self._mapped = mmap.mmap(file.fileno(), self.length)
+
+        return self._mapped
+
+    def render_rows(self, symbol: QRSymbol) -> List[bytes]:
+        """
+        Renders the distinct pixel rows of a tile.
+
+        Parameters
+        ----------
+        symbol : QRSymbol
+            QR code to render.
+
+        Returns
+        -------
+        List[bytes]
+            One pixel row (in the sheet's format) per module row, including
+            the quiet zone rows.
+        """
+        scale, border = self.scale, self.border
+        light = '0'*(border*scale)
+        expand = {ord('0'): '0'*scale, ord('1'): '1'*scale}
+
+        quiet = '0'*self.tile_size
+        pixel_rows = [quiet]*border
+        for row in symbol.rows():
+            bits = row.hex()[1::2].translate(expand)
+            pixel_rows.append(light + bits + light)
+        pixel_rows.extend([quiet]*border)
+
+        if self.fmt == 'pbm':
+            padding = 8*self.tile_pitch - self.tile_size
+            return [
+                (int(bits, 2) << padding).to_bytes(self.tile_pitch, 'big')
+                for bits in pixel_rows
+            ]
+
+        return [bits.encode().translate(_PIXEL_BYTES) for bits in pixel_rows]
+
+    def write(self, index: int, symbol: QRSymbol) -> None:
+        """
+        Writes a QR code into its tile.
+
+        Parameters
+        ----------
+        index : int
+            Tile index, in row-major order.
+        symbol : QRSymbol
+            QR code to write.
+
+        Raises
+        ------
+        ValueError
+            Symbol has the wrong version or index is out of range.
+        """
+        if symbol.version != self.version:
+            raise ValueError(
+                f'Symbol version {symbol.version} does not match sheet '
+                f'version {self.version}.'
+            )
+        if not 0 <= index < self.columns*self.rows:
+            raise ValueError(f'Tile index out of range: {index}.')
+
+        mapped = self._get_mapped()
+        tile_row, tile_col = divmod(index, self.columns)
+        offset = len(self.header) + \
+            tile_row*self.tile_size*self.row_bytes + tile_col*self.tile_pitch
+
+        for row in self.render_rows(symbol):
+            for _ in range(self.scale):
+                mapped[offset:offset + self.tile_pitch] = row
+                offset += self.row_bytes
+
+    def close(self) -> None:
+        """Flushes and unmaps the sheet."""
+        if self._mapped is not None:
+            self._mapped.flush()
+            self._mapped.close()
+            self._mapped = None
+
+
+_PIXEL_BYTES = bytes.maketrans(b'01', bytes((0, 1)))
+
+
+def _render_tiles(
+    writer: SheetWriter,
+    tiles: List[Tuple[int, str]],
+    correction_level: str
+) -> None:
+    """
+    Helper function: encodes messages and writes them into their tiles
+    (used by worker processes).
+    """
+    for index, message in tiles:
+        encoder = select_encoder(message, correction_level)
+        encoder.version = writer.version
+        writer.write(index, encoder.get_symbol())
+
+    writer.close()
+
+
+def render_sheet(
+    messages: Sequence[str],
+    correction_level: str,
+    path: str,
+    columns: int,
+    scale: int = 1,
+    border: int = 4,
+    fmt: str = 'pbm',
+    workers: Optional[int] = None
+) -> SheetWriter:
+    """
+    Encodes messages straight into the tiles of a sheet.
+
+    Every QR code uses the smallest version able to hold the longest
+    message. Workers map the sheet themselves and write their tiles in
+    place, so no per-symbol images are built.
+
+    Parameters
+    ----------
+    messages : Sequence[str]
+        Messages to encode, in tile order.
+    correction_level : str
+        Error correction level.
+    path : str
+        Sheet file path.
+    columns : int
+        Number of tiles per row.
+    scale : int, optional
+        Pixels per module (defaults to 1).
+    border : int, optional
+        Quiet zone width in modules (defaults to 4).
+    fmt : str, optional
+        'pbm' or 'raw' (defaults to 'pbm').
+    workers : int, optional
+        Number of worker processes. Tiles are written in the current process
+        if this is None or 1 (defaults to None).
+
+    Returns
+    -------
+    SheetWriter
+        The (closed) writer, describing the sheet layout.
+    """
+    version = max(
+        select_encoder(message, correction_level).version
+        for message in messages
+    )
+    writer = SheetWriter(
+        path, version, columns, -(-len(messages) // columns), scale, border,
+        fmt
+    )
+    tiles = list(enumerate(messages))
+
+    if workers is None or workers == 1:
+        _render_tiles(writer, tiles, correction_level)
+        return writer
+
+    chunk = -(-len(tiles) // (4*workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _render_tiles, writer, tiles[start:start + chunk],
+                correction_level
+            )
+            for start in range(0, len(tiles), chunk)
+        ]
+        for future in futures:
+            future.result()
+
+    return writer
@@ -0,0 +1,334 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from encode.common import (
+    CHAR_CAP,
+    CORRECTION_LEVELS,
+    _get_capacity,
+    _get_data_length,
+    _get_indicator_length
+)
+from encode.data_encoder import QREncoder
+from encode.preliminary import ENCODERS, _classify
+
+MAX_SYMBOLS = 16
+SA_INDICATOR = '0011'
+SA_HEADER_LENGTH = 20
+
+
+def _module_count(version: int) -> int:
+    """
+    Helper function: computes the number of modules in a QR code.
+
+    Parameters
+    ----------
+    version : int
+        QR code version.
+
+    Returns
+    -------
+    int
+        Number of modules in the (square) symbol.
+    """
+    return (17 + 4*version) ** 2
+
+
+def _fit_version(
+    mode: str,
+    char_count: int,
+    correction_level: str
+) -> Optional[int]:
+    """
+    Helper function: finds the smallest version able to hold a structured
+    append segment.
+
+    Parameters
+    ----------
+    mode : str
+        Encoding mode of the segment.
+    char_count : int
+        Number of characters in the segment.
+    correction_level : str
+        Error correction level.
+
+    Returns
+    -------
+    int or None
+        Smallest suitable version, or None if the segment does not fit in
+        a version 40 symbol.
+    """
+    data_length = _get_data_length(mode, char_count)
+
+    for version in range(1, 41):
+        required_bits = SA_HEADER_LENGTH + 4 + data_length + \
+            _get_indicator_length(mode, version)
+        if required_bits <= _get_capacity(version, correction_level):
+            return version
+
+    return None
+
+
+def get_parity(message: str, mode: Optional[str] = None) -> int:
+    """
+    Computes the structured append parity byte of a message.
+
+    The parity byte is the bitwise XOR of every byte of the original
+    (unsplit) message in its encoded form: the 2-byte Shift JIS value of
+    each character in kanji mode, otherwise one byte per character.
+
+    Parameters
+    ----------
+    message : str
+        The full message.
+    mode : str, optional
+        Encoding mode of the message (defaults to the mode selected for
+        it).
+
+    Returns
+    -------
+    int
+        Parity byte.
+    """
+    if mode is None:
+        mode = _classify(message)
+
+    if mode == 'kanji':
+        data = message.encode('shift_jis')
+    else:
+        data = bytes(ord(char) & 0xFF for char in message)
+
+    parity = 0
+    for byte in data:
+        parity ^= byte
+
+    return parity
+
+
+def plan_split(
+    message: str,
+    correction_level: str,
+    mode: str,
+    objective: str = 'modules',
+    max_symbols: int = MAX_SYMBOLS
+) -> List[Tuple[int, int, int]]:
+    """
+    Chooses how to split a message across structured append symbols.
+
+    Every symbol count from 1 to max_symbols is considered, with the message
+    split into near-equal parts. The split minimising the objective is
+    selected; ties are broken by preferring fewer symbols.
+
+    Parameters
+    ----------
+    message : str
+        The full message.
+    correction_level : str
+        Error correction level.
+    mode : str
+        Encoding mode shared by all parts.
+    objective : str, optional
+        'modules' to minimise the total number of modules across symbols, or
+        'version' to minimise the largest version (defaults to 'modules').
+    max_symbols : int, optional
+        Maximum number of symbols (defaults to 16).
+
+    Returns
+    -------
+    List[Tuple[int, int, int]]
+        (start, stop, version) for each part.
+
+    Raises
+    ------
+    ValueError
+        Message cannot be split into max_symbols symbols or objective is
+        not recognised.
+    """
+    if objective not in ('modules', 'version'):
+        raise ValueError(f'Unrecognized objective: {objective}.')
+
+    best_plan, best_score = None, None
+
+    for num_parts in range(1, max_symbols + 1):
+        base, extra = divmod(len(message), num_parts)
+        if not base:
+            break
+
+        plan, start = [], 0
+        for idx in range(num_parts):
+            stop = start + base + (idx < extra)
+            version = _fit_version(mode, stop - start, correction_level)
+            if version is None:
+                break
+            plan.append((start, stop, version))
+            start = stop
+        else:
+            versions = [part[2] for part in plan]
+            if objective == 'modules':
+                score = sum(_module_count(v) for v in versions)
+            else:
+                score = max(versions)
+
+            if best_score is None or score < best_score:
+                best_plan, best_score = plan, score
+
+    if best_plan is None:
+        raise ValueError(
+            f'Message too long for {max_symbols} symbols at correction level '
+            f'{correction_level}.'
+        )
+
+    return best_plan
+
+
+class StructuredAppendSymbol:
+    """
+    A single symbol of a structured append sequence.
+    """
+
+    def __init__(
+        self,
+        encoder: QREncoder,
+        index: int,
+        total: int,
+        parity: int
+    ) -> None:
+        """
+        Constructor for the StructuredAppendSymbol class.
+
+        Parameters
+        ----------
+        encoder : QREncoder
+            Encoder for this symbol's part of the message.
+        index : int
+            Position of the symbol in the sequence (0-based).
+        total : int
+            Number of symbols in the sequence.
+        parity : int
+            Parity byte of the full message.
+        """
+        self.encoder = encoder
+        self.index = index
+        self.total = total
+        self.parity = parity
+
+    def get_header(self) -> str:
+        """
+        Generates the structured append header.
+
+        The header is the structured append mode indicator, followed by the
+        4-bit symbol position, the 4-bit total number of symbols (less one)
+        and the 8-bit parity byte.
+
+        Returns
+        -------
+        str
+            Structured append header.
+        """
+        return SA_INDICATOR + format(self.index, '04b') + \
+            format(self.total - 1, '04b') + format(self.parity, '08b')
+
+    def encode(self) -> str:
+        """
+        Encodes the symbol's data codewords.
+
+        Returns
+        -------
+        str
+            Header, prefix, encoded message and suffix.
+        """
+        encoder = self.encoder
+        encoded = self.get_header() + encoder.get_prefix() + encoder.encode()
+
+        return encoded + encoder.get_suffix(len(encoded))
+
+
+def _encode_symbol(symbol: StructuredAppendSymbol) -> str:
+    """
+    Helper function: encodes a symbol (used by worker processes).
+    """
+    return symbol.encode()
+
+
+class StructuredAppendEncoder:
+    """
+    Encodes a message too long for a single QR code as a structured append
+    sequence of up to 16 QR codes.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        correction_level: str,
+        objective: str = 'modules',
+        max_symbols: int = MAX_SYMBOLS
+    ) -> None:
+        """
+        Constructor for the StructuredAppendEncoder class.
+
+        Parameters
+        ----------
+        message : str
+            The message to be encoded.
+        correction_level : str
+            Error correction level for the QR codes.
+        objective : str, optional
+            Split objective, see plan_split (defaults to 'modules').
+        max_symbols : int, optional
+            Maximum number of symbols (defaults to 16).
+
+        Raises
+        ------
+        TypeError
+            Message is not a string.
+        ValueError
+            Unrecognized correction level or message is too long.
+        """
+        if not isinstance(message, str):
+            raise TypeError(f'Message is not a string: {message}.')
+        if correction_level.upper() not in CORRECTION_LEVELS:
+            raise ValueError(
+                f'Unrecognized correction level: {correction_level}.'
+            )
+        if not 1 <= max_symbols <= MAX_SYMBOLS:
+            raise ValueError(f'Invalid number of symbols: {max_symbols}.')
+
+        self.message = message
+        self.correction_level = correction_level.upper()
+
+        encoding = _classify(message)
+        encoder_class = ENCODERS[encoding]
+        mode = 'bytes' if encoding == 'byte' else encoding
+        plan = plan_split(
+            message, self.correction_level, mode, objective, max_symbols
+        )
+        parity = get_parity(message, mode)
+
+        self.symbols = []
+        for idx, (start, stop, version) in enumerate(plan):
+            encoder = encoder_class(message[start:stop], self.correction_level)
+            encoder.version = version
+            encoder.bit_cap = CHAR_CAP[mode][self.correction_level][version-1]
+            self.symbols.append(
+                StructuredAppendSymbol(encoder, idx, len(plan), parity)
+            )
+
+    def encode(self, max_workers: Optional[int] = None) -> List[str]:
+        """
+        Encodes the data codewords of every symbol in the sequence.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            Number of worker processes. Symbols are encoded in the current
+            process if this is None or 1 (defaults to None).
+
+        Returns
+        -------
+        List[str]
+            Encoded symbols, in sequence order.
+        """
+        if max_workers is None or max_workers == 1 or len(self.symbols) == 1:
+            return [symbol.encode() for symbol in self.symbols]
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_encode_symbol, self.symbols))
@@ -0,0 +1,386 @@
+import mmap
+import struct
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+from encode.common import INDICATORS
+from encode.matrix import build_matrix, get_size
+
+# Wire form header: magic, flags, version, level, mask, mode and number of
+# codewords.
+_WIRE_HEADER = struct.Struct('>2sBbcBBH')
+_WIRE_MAGIC = b'QR'
+_WIRE_MATRIX = 1
+_WIRE_CODEWORDS = 2
+_WIRE_MODES = tuple(INDICATORS)
+_NO_MODE = 255
+# Mask of codewords packed before a mask was chosen.
+_NO_MASK = 255
+_MODULE_BITS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+class QRSymbol:
+    """
+    An encoded QR code: its module matrix and the parameters used to build
+    it.
+
+    The matrix is a row-major bytearray with one byte per module (1 for
+    dark). It is exposed without copying through get_view() and
+    __array_interface__, so numpy.asarray(symbol) is a zero-copy (size,
+    size) uint8 array on every Python version. memoryview(symbol) and other
+    buffer protocol consumers need Python 3.12+ (PEP 688), which calls
+    __buffer__; earlier versions raise TypeError, so use get_view() there.
+
+    Symbols pickle to their compact wire form (see to_bytes()), so they are
+    cheap to send between processes.
+    """
+
+    def __init__(
+        self,
+        matrix: bytearray,
+        version: int,
+        correction_level: str,
+        mask: int,
+        mode: Optional[str] = None,
+        codewords: Optional[bytes] = None
+    ) -> None:
+        """
+        Constructor for the QRSymbol class.
+
+        Parameters
+        ----------
+        matrix : bytearray
+            Row-major module values (1 for dark).
+        version : int
+            QR code version.
+        correction_level : str
+            Error correction level.
+        mask : int
+            Mask pattern reference.
+        mode : str, optional
+            Encoding mode of the message, if known.
+        codewords : bytes, optional
+            Final (interleaved) codewords placed in the matrix, if known.
+        """
+        self.matrix = matrix
+        self.version = version
+        self.correction_level = correction_level
+        self.mask = mask
+        self.mode = mode
+        self.codewords = codewords
+
+    @property
+    def size(self) -> int:
+        """Number of modules per side."""
+        return get_size(self.version)
+
+    @property
+    def __array_interface__(self) -> Dict:
+        return {
+            'shape': (self.size, self.size),
+            'typestr': '|u1',
+            'data': self.matrix,
+            'version': 3
+        }
+
+    def __buffer__(self, flags: int) -> memoryview:
+        return self.get_view()
+
+    def __reduce__(self) -> Tuple:
+        return QRSymbol.from_bytes, (self.to_bytes(),)
+
+    def get_view(self) -> memoryview:
+        """
+        Fetches a view of the matrix.
+
+        Returns
+        -------
+        memoryview
+            Read-write (size, size) view of the module values.
+        """
+        return memoryview(self.matrix).cast('B', (self.size, self.size))
+
+    def rows(self) -> Iterator[bytes]:
+        """
+        Iterates over the rows of the matrix.
+
+        Yields
+        ------
+        bytes
+            Module values of a row.
+        """
+        size = self.size
+
+        for start in range(0, size*size, size):
+            yield bytes(self.matrix[start:start + size])
+
+    def pack(self) -> bytes:
+        """
+        Packs the matrix to one bit per module.
+
+        Each row is packed most significant bit first and padded with light
+        modules to a whole number of bytes, as in the PBM format.
+
+        Returns
+        -------
+        bytes
+            Packed rows.
+        """
+        size = self.size
+        row_bytes = (size + 7) // 8
+        padding = 8*row_bytes - size
+
+        return b''.join(
+            (int(row.hex()[1::2], 2) << padding).to_bytes(row_bytes, 'big')
+            for row in self.rows()
+        )
+
+    def to_bytes(self, matrix: bool = True, codewords: bool = True) -> bytes:
+        """
+        Serializes the symbol to its compact wire form.
+
+        A 9-byte header (b'QR', flags, version, level, mask, mode and
+        number of codewords) is followed by the codewords and/or the matrix
+        packed as in pack(). Without the matrix, from_bytes() rebuilds it
+        from the codewords.
+
+        Parameters
+        ----------
+        matrix : bool, optional
+            Include the packed matrix (defaults to True).
+        codewords : bool, optional
+            Include the codewords, if known (defaults to True).
+
+        Returns
+        -------
+        bytes
+            Wire form of the symbol.
+
+        Raises
+        ------
+        ValueError
+            Neither the matrix nor any codewords would be included.
+        """
+        codewords = codewords and self.codewords is not None
+        if not (matrix or codewords):
+            raise ValueError('Wire form needs the matrix or the codewords.')
+
+        flags = (_WIRE_MATRIX if matrix else 0) | \
+            (_WIRE_CODEWORDS if codewords else 0)
+        mode = _NO_MODE if self.mode is None else \
+            _WIRE_MODES.index(self.mode)
+        payload = bytes(self.codewords) if codewords else b''
+
+        header = _WIRE_HEADER.pack(
+            _WIRE_MAGIC, flags, self.version,
+            self.correction_level.encode('ascii'), self.mask, mode,
+            len(payload)
+        )
+
+        return header + payload + (self.pack() if matrix else b'')
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'QRSymbol':
+        """
+        Deserializes a symbol from its wire form (see to_bytes()).
+
+        Parameters
+        ----------
+        data : bytes
+            Wire form of the symbol.
+
+        Returns
+        -------
+        QRSymbol
+            The symbol.
+
+        Raises
+        ------
+        ValueError
+            Data is not a complete wire form.
+        """
+        flags, version, level, mask, mode, codewords = _unpack_header(data)
+        size = get_size(version)
+        start = _WIRE_HEADER.size + (len(codewords) if codewords else 0)
+
+        if flags & _WIRE_MATRIX:
+            matrix = _unpack_rows(data[start:], size)
+        elif codewords is not None:
+            matrix, mask = build_matrix(
+                version, level, list(codewords),
+                None if mask == _NO_MASK else mask
+            )
+        else:
+            raise ValueError('Wire form has neither matrix nor codewords.')
+
+        return cls(matrix, version, level, mask, mode, codewords)
+
+
+def pack_codewords(
+    version: int,
+    correction_level: str,
+    mode: Optional[str],
+    codewords: bytes
+) -> bytes:
+    """
+    Serializes the final codewords of a QR code to the wire form (see
+    QRSymbol.to_bytes()) without building its matrix.
+
+    No mask is recorded: QRSymbol.from_bytes() builds the matrix with the
+    lowest penalty mask.
+
+    Parameters
+    ----------
+    version : int
+        QR code version.
+    correction_level : str
+        Error correction level.
+    mode : str or None
+        Encoding mode of the message, if known.
+    codewords : bytes
+        Final (interleaved) codewords.
+
+    Returns
+    -------
+    bytes
+        Wire form holding only the codewords.
+    """
+    return _WIRE_HEADER.pack(
+        _WIRE_MAGIC, _WIRE_CODEWORDS, version,
+        correction_level.encode('ascii'), _NO_MASK,
+        _NO_MODE if mode is None else _WIRE_MODES.index(mode),
+        len(codewords)
+    ) + bytes(codewords)
+
+
+def unpack_codewords(
+    data: bytes
+) -> Tuple[int, str, Optional[str], Optional[bytes]]:
+    """
+    Reads the parameters and codewords of a wire form without building the
+    matrix.
+
+    Parameters
+    ----------
+    data : bytes
+        Wire form (see QRSymbol.to_bytes() and pack_codewords()).
+
+    Returns
+    -------
+    int, str, str or None, bytes or None
+        Version, correction level, mode and codewords, if included.
+
+    Raises
+    ------
+    ValueError
+        Data is not a complete wire form.
+    """
+    _, version, level, _, mode, codewords = _unpack_header(data)
+
+    return version, level, mode, codewords
+
+
+def _unpack_header(data: bytes) -> Tuple:
+    """
+    Helper function: checks a wire form, returning its flags, version,
+    level, mask, mode and codewords (None if not included).
+    """
+    try:
+        magic, flags, version, level, mask, mode, num_codewords = \
+            _WIRE_HEADER.unpack_from(data)
+    except struct.error:
+        raise ValueError('Wire form header is truncated.') from None
+    if magic != _WIRE_MAGIC:
+        raise ValueError('Data is not a QR symbol wire form.')
+
+    size = get_size(version)
+    start = _WIRE_HEADER.size + num_codewords
+    expected = start + (
+        size*((size + 7) // 8) if flags & _WIRE_MATRIX else 0
+    )
+    if len(data) != expected:
+        raise ValueError(
+            f'Wire form is {len(data)} bytes, expected {expected}.'
+        )
+
+    codewords = None
+    if flags & _WIRE_CODEWORDS:
+        codewords = bytes(data[_WIRE_HEADER.size:start])
+
+    return (
+        flags, version, level.decode('ascii'), mask,
+        None if mode == _NO_MODE else _WIRE_MODES[mode], codewords
+    )
+
+
+def _unpack_rows(data: bytes, size: int) -> bytearray:
+    """
+    Helper function: unpacks rows packed by QRSymbol.pack() to one byte per
+    module.
+    """
+    row_bytes = (size + 7) // 8
+    padding = 8*row_bytes - size
+    matrix = bytearray()
+
+    for start in range(0, size*row_bytes, row_bytes):
+        value = int.from_bytes(data[start:start + row_bytes], 'big')
+        matrix += format(value >> padding, f'0{size}b').encode().translate(
+            _MODULE_BITS
+        )
+
+    return matrix
+
+
+def export_matrices(
+    symbols: Sequence[QRSymbol],
+    out=None,
+    path: Optional[str] = None
+) -> memoryview:
+    """
+    Copies the matrices of same-sized symbols into one contiguous buffer.
+
+    Parameters
+    ----------
+    symbols : Sequence[QRSymbol]
+        Symbols to export. All must have the same version.
+    out : writable buffer, optional
+        Preallocated buffer of at least len(symbols)*size*size bytes, such as
+        a bytearray, mmap or C-contiguous uint8 NumPy array.
+    path : str, optional
+        File to memory-map and export into, if out is not given. The file is
+        created or resized as needed.
+
+    Returns
+    -------
+    memoryview
+        (len(symbols), size, size) view of the exported matrices.
+
+    Raises
+    ------
+    ValueError
+        Symbols have different versions or out is too small.
+    """
+    if not symbols:
+        raise ValueError('No symbols to export.')
+
+    version = symbols[0].version
+    if any(symbol.version != version for symbol in symbols):
+        raise ValueError('Symbols must have the same version.')
+
+    size = get_size(version)
+    area, total = size*size, len(symbols)*size*size
+
+    if out is None and path is not None:
+        with open(path, 'w+b') as file:
+            file.truncate(total)
+            out = mmap.mmap(file.fileno(), total)
+    elif out is None:
+        out = bytearray(total)
+
+    view = memoryview(out).cast('B')
+    if len(view) < total:
+        raise ValueError(f'Output buffer needs at least {total} bytes.')
+
+    for idx, symbol in enumerate(symbols):
+        view[idx*area:(idx + 1)*area] = symbol.matrix
+
+    return view[:total].cast('B', (len(symbols), size, size))
@@ -0,0 +1,379 @@
+import re
+from typing import Dict, List, Optional
+
+from encode.common import (
+    BLOCK_INFORMATION,
+    CORRECTION_LEVELS,
+    _get_data_length
+)
+from encode.error_correction import ErrorCorrector
+from encode.matrix import _BYTE_BITS, build_matrix, get_placement_order
+from encode.preliminary import ENCODERS, _classify, _is_kanji
+from encode.symbol import QRSymbol
+
+MODE_RANKS = {'numeric': 0, 'alphanumeric': 1, 'byte': 2}
+GROUP_SIZES = {'numeric': 3, 'alphanumeric': 2, 'byte': 1, 'kanji': 1}
+GROUP_LENGTHS = {'numeric': 10, 'alphanumeric': 11, 'byte': 8, 'kanji': 13}
+SLOT_PATTERN = re.compile(r'\{(\d+)\}')
+
+
+class Template:
+    """
+    Encodes messages sharing a fixed layout, such as a constant prefix
+    followed by a fixed-width identifier.
+
+    Reed-Solomon error correction is linear over GF(2^8), so the error
+    correction bytes of a message are those of the template (with every slot
+    filled) XORed with those of the difference between the two. Only the
+    codewords overlapping a variable slot differ, so each message costs a few
+    GF(2^8) multiplications per changed codeword rather than a full
+    polynomial division.
+
+    The template's matrix is also built once, with a fixed mask, and each QR
+    code only flips the modules of the codewords which changed.
+    """
+
+    def __init__(
+        self,
+        pattern: str,
+        correction_level: str,
+        mode: Optional[str] = None,
+        mask: Optional[int] = None
+    ) -> None:
+        """
+        Constructor for the Template class.
+
+        Parameters
+        ----------
+        pattern : str
+            Message layout. Variable slots are written as {n}, where n is the
+            number of characters in the slot.
+        correction_level : str
+            Error correction level for the QR codes.
+        mode : str, optional
+            Encoding mode shared by all messages. Defaults to the mode of the
+            pattern's fixed text.
+        mask : int, optional
+            Mask pattern reference shared by all QR codes. Defaults to the
+            pattern with the lowest penalty score for the template with
+            every slot filled.
+
+        Raises
+        ------
+        ValueError
+            Unrecognized correction level or mode, or the pattern has no
+            slots or is too long.
+        """
+        if correction_level.upper() not in CORRECTION_LEVELS:
+            raise ValueError(
+                f'Unrecognized correction level: {correction_level}.'
+            )
+
+        pieces = SLOT_PATTERN.split(pattern)
+        fixed_text, widths = pieces[::2], [int(w) for w in pieces[1::2]]
+        if not widths or not all(widths):
+            raise ValueError(f'Pattern has no variable slots: {pattern}.')
+
+        if mode is None:
+            mode = _classify(''.join(fixed_text)) if any(fixed_text) \
+                else 'alphanumeric'
+        if mode not in ENCODERS:
+            raise ValueError(f'Unrecognized mode: {mode}.')
+
+        self.mode = mode
+        self.correction_level = correction_level.upper()
+        self.fixed_text = fixed_text
+        self.widths = widths
+
+        fill = '　' if mode == 'kanji' else '0'
+        base_message = fixed_text[0]
+        self.slots = []
+        for width, text in zip(widths, fixed_text[1:]):
+            self.slots.append((len(base_message), width))
+            base_message += fill*width + text
+
+        self._check_mode(''.join(fixed_text))
+        self._encoder_class = ENCODERS[mode]
+        encoder = self._encoder_class(base_message, self.correction_level)
+        self.version = encoder.version
+
+        self._precompute(encoder)
+        self.matrix, self.mask = build_matrix(
+            self.version, self.correction_level, self.codewords, mask
+        )
+
+    def _check_mode(self, text: str) -> None:
+        """
+        Checks that text can be encoded in the template's mode.
+
+        Parameters
+        ----------
+        text : str
+            Text to be checked.
+
+        Raises
+        ------
+        ValueError
+            Text cannot be encoded in the template's mode.
+        """
+        if not text:
+            return
+
+        if self.mode == 'kanji':
+            valid = _is_kanji(text)
+        else:
+            valid = MODE_RANKS.get(_classify(text), 3) <= \
+                MODE_RANKS[self.mode]
+
+        if not valid:
+            raise ValueError(f'Cannot encode {text} in {self.mode} mode.')
+
+    def _precompute(self, encoder) -> None:
+        """
+        Precomputes the template's constant bitstream, codewords and error
+        correction bytes, and the error correction bytes contributed by each
+        codeword overlapping a variable slot.
+
+        Parameters
+        ----------
+        encoder : QREncoder
+            Encoder for the template with every slot filled.
+        """
+        mode = self.mode
+        prefix = encoder.get_prefix()
+        encoded = prefix + encoder.encode()
+        self.bits = encoded + encoder.get_suffix(len(encoded))
+        self.message = encoder.message
+        self._symbol_mode = encoder.mode
+
+        corrector = ErrorCorrector(
+            BLOCK_INFORMATION[self.version][self.correction_level]
+        )
+        self._exp_store = corrector.exp_store
+        self._log_store = corrector.log_store
+
+        codewords = [
+            int(self.bits[i:i+8], 2) for i in range(0, len(self.bits), 8)
+        ]
+        blocks = corrector.split_blocks(codewords)
+        correction = corrector.generate_correction_bytes(codewords)
+        self.codewords = corrector.interleave(blocks, correction)
+
+        # Locations of each message codeword in its block and in the final
+        # codeword sequence.
+        block_of, data_positions = [], {}
+        for b, block in enumerate(blocks):
+            block_of.extend((b, i) for i in range(len(block)))
+        ec_positions = [[0]*len(block) for block in correction]
+        for pos, (kind, b, i) in enumerate(corrector.interleave(
+            [[('d', b, i) for i in range(len(block))]
+             for b, block in enumerate(blocks)],
+            [[('e', b, k) for k in range(len(block))]
+             for b, block in enumerate(correction)]
+        )):
+            if kind == 'd':
+                data_positions[(b, i)] = pos
+            else:
+                ec_positions[b][i] = pos
+
+        # Character and bit ranges of the encoding groups overlapping each
+        # slot, merged where slots share a group.
+        size, length = GROUP_SIZES[mode], GROUP_LENGTHS[mode]
+        self.groups = []
+        for start, width in self.slots:
+            first = (start // size)*size
+            last = min(-(-(start + width) // size)*size, len(self.message))
+            if self.groups and first < self.groups[-1][1]:
+                first = self.groups.pop()[0]
+            self.groups.append((
+                first,
+                last,
+                len(prefix) + (first // size)*length,
+                len(prefix) + _get_data_length(mode, last)
+            ))
+
+        generator = corrector.get_generator(corrector.block_info[0])
+        self._contributions = {}
+        for _, _, bit_start, bit_stop in self.groups:
+            for p in range(bit_start // 8, -(-bit_stop // 8)):
+                b, i = block_of[p]
+                unit = [0]*len(blocks[b])
+                unit[i] = 1
+                log_parity = [
+                    self._log_store.get(coef)
+                    for coef in corrector.get_correction_block(unit, generator)
+                ]
+                self._contributions[p] = (
+                    data_positions[(b, i)], b, log_parity
+                )
+
+        self._ec_positions = ec_positions
+        self._correction = correction
+
+    def fill(self, *values: str) -> str:
+        """
+        Substitutes values into the template's slots.
+
+        Parameters
+        ----------
+        *values : str
+            One value per slot.
+
+        Returns
+        -------
+        str
+            Complete message.
+
+        Raises
+        ------
+        ValueError
+            Wrong number of values, or a value has the wrong width or cannot
+            be encoded in the template's mode.
+        """
+        if len(values) != len(self.widths):
+            raise ValueError(
+                f'Expected {len(self.widths)} values, got {len(values)}.'
+            )
+
+        message = self.fixed_text[0]
+        slots = zip(values, self.widths, self.fixed_text[1:])
+        for value, width, text in slots:
+            if len(value) != width:
+                raise ValueError(
+                    f'Value {value} does not have width {width}.'
+                )
+            self._check_mode(value)
+            message += value + text
+
+        return message
+
+    def _get_changes(self, values) -> Dict[int, int]:
+        """
+        Computes the codewords which differ from the template's for the
+        message with values substituted into its slots.
+
+        Only the encoding groups overlapping a slot are encoded, and only the
+        error correction contributions of the codewords which changed are
+        computed.
+
+        Parameters
+        ----------
+        values : Tuple[str, ...]
+            One value per slot.
+
+        Returns
+        -------
+        Dict[int, int]
+            New codeword at each changed position of the interleaved
+            codeword sequence.
+        """
+        message = self.fill(*values)
+        bits = self.bits
+        exp_store, log_store = self._exp_store, self._log_store
+
+        pieces, offset = [], 0
+        for start, stop, bit_start, bit_stop in self.groups:
+            pieces.append(bits[offset:bit_start])
+            pieces.append(self._encoder_class(
+                message[start:stop], self.correction_level
+            ).encode())
+            offset = bit_stop
+        pieces.append(bits[offset:])
+        new_bits = ''.join(pieces)
+
+        changes = {}
+        correction = {}
+
+        for p, (position, b, log_parity) in self._contributions.items():
+            new = int(new_bits[8*p:8*p+8], 2)
+            delta = new ^ int(bits[8*p:8*p+8], 2)
+            if not delta:
+                continue
+
+            changes[position] = new
+            if b not in correction:
+                correction[b] = list(self._correction[b])
+            parity = correction[b]
+            log_delta = log_store[delta]
+            for k, log_coef in enumerate(log_parity):
+                if log_coef is not None:
+                    parity[k] ^= exp_store[(log_delta + log_coef) % 255]
+
+        for b, parity in correction.items():
+            for position, coef in zip(self._ec_positions[b], parity):
+                if coef != self.codewords[position]:
+                    changes[position] = coef
+
+        return changes
+
+    def encode(self, *values: str) -> List[int]:
+        """
+        Generates the final codeword sequence for the message with values
+        substituted into the template's slots.
+
+        Parameters
+        ----------
+        *values : str
+            One value per slot.
+
+        Returns
+        -------
+        List[int]
+            Interleaved message and error correction codewords, identical to
+            QREncoder.correct_error() for the complete message.
+
+        Raises
+        ------
+        ValueError
+            Wrong number of values, or a value has the wrong width or cannot
+            be encoded in the template's mode.
+        """
+        final = list(self.codewords)
+        for position, codeword in self._get_changes(values).items():
+            final[position] = codeword
+
+        return final
+
+    def get_symbol(self, *values: str) -> QRSymbol:
+        """
+        Builds the QR code for the message with values substituted into the
+        template's slots.
+
+        The template's masked matrix is copied, and the modules of each
+        changed codeword are flipped where its bits differ from the
+        template's. Masking is an XOR, so flipping a masked module flips
+        the data bit it holds.
+
+        Parameters
+        ----------
+        *values : str
+            One value per slot.
+
+        Returns
+        -------
+        QRSymbol
+            QR code, identical to QREncoder.get_symbol() for the complete
+            message with the template's mask.
+
+        Raises
+        ------
+        ValueError
+            Wrong number of values, or a value has the wrong width or cannot
+            be encoded in the template's mode.
+        """
+        order = get_placement_order(self.version)
+        codewords = bytearray(self.codewords)
+        matrix = bytearray(self.matrix)
+
+        for position, codeword in self._get_changes(values).items():
+            diff = codeword ^ codewords[position]
+            codewords[position] = codeword
+            modules = order[8*position:8*position + 8]
+            for bit, module in zip(_BYTE_BITS[diff], modules):
+                if bit:
+                    matrix[module] ^= 1
+
+        return QRSymbol(
+            matrix, self.version, self.correction_level, self.mask,
+            self._symbol_mode, bytes(codewords)
+        )
@@ -0,0 +1,469 @@
+import random
+import time
+from operator import itemgetter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from encode.common import (
+    _get_block_info, _get_capacity, _get_indicator_length,
+    _get_terminator_length, ALPHANUMERIC_CHARS, FORMAT_INFORMATION,
+    INDICATORS, MICRO_FORMAT_INFORMATION, MICRO_INDICATORS, MICRO_VERSIONS,
+    VERSION_INFORMATION
+)
+from encode.error_correction import _create_stores, get_interleave_order
+from encode.matrix import (
+    get_format_indices, get_mask_pattern, get_placement_order, get_size,
+    get_version_indices
+)
+from encode.symbol import QRSymbol
+
+MODE_INDICATORS = {
+    indicator: mode for mode, (indicator, _) in INDICATORS.items()
+}
+MICRO_MODE_INDICATORS = {
+    indicator: mode
+    for mode, (indicators, _) in MICRO_INDICATORS.items()
+    for indicator in indicators if indicator is not None
+}
+
+_ALPHANUMERIC_VALUES = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ' + ''.join(
+    sorted(ALPHANUMERIC_CHARS, key=ALPHANUMERIC_CHARS.get)
+)
+_BITS = bytes.maketrans(bytes((0, 1)), b'01')
+
+
+class VerificationError(ValueError):
+    """
+    Raised when an encoded QR code does not decode back to its message.
+    """
+
+
+def read_format(symbol: QRSymbol) -> Tuple[str, int]:
+    """
+    Reads the format information of a QR code.
+
+    Parameters
+    ----------
+    symbol : QRSymbol
+        QR code to read.
+
+    Returns
+    -------
+    str, int
+        Error correction level and mask pattern reference.
+
+    Raises
+    ------
+    VerificationError
+        The two copies of the format information (the only copy for Micro QR
+        codes) differ or are not valid format information.
+    """
+    indices = get_format_indices(symbol.version)
+    copies = [
+        sum(symbol.matrix[idx] << i for i, idx in enumerate(indices[j:j + 15]))
+        for j in range(0, len(indices), 15)
+    ]
+
+    if symbol.version < 1:
+        formats = MICRO_FORMAT_INFORMATION[symbol.version]
+    else:
+        formats = FORMAT_INFORMATION
+
+    for level, patterns in formats.items():
+        if copies[0] in patterns and all(c == copies[0] for c in copies):
+            return level, patterns.index(copies[0])
+
+    raise VerificationError('Invalid format information.')
+
+
+def read_codewords(symbol: QRSymbol, mask: int) -> List[int]:
+    """
+    Unmasks a QR code and reads its codewords in placement order.
+
+    Parameters
+    ----------
+    symbol : QRSymbol
+        QR code to read.
+    mask : int
+        Mask pattern reference.
+
+    Returns
+    -------
+    List[int]
+        Final (interleaved) codewords. Remainder bits are dropped. The 4-bit
+        final data codeword of M1 and M3 Micro QR codes is read into the
+        high bits of a byte.
+    """
+    version, matrix = symbol.version, symbol.matrix
+    unmasked = int.from_bytes(matrix, 'big') ^ \
+        get_mask_pattern(version, mask)
+    unmasked = unmasked.to_bytes(len(matrix), 'big')
+
+    order = get_placement_order(version)
+    bits = bytes(itemgetter(*order)(unmasked)).translate(_BITS)
+
+    if version in (MICRO_VERSIONS['M1'], MICRO_VERSIONS['M3']):
+        num_bits = _get_capacity(version, symbol.correction_level)
+        bits = bits[:num_bits] + b'0000' + bits[num_bits:]
+
+    num_bits = 8*(len(bits) // 8)
+
+    return list(int(bits[:num_bits], 2).to_bytes(num_bits // 8, 'big'))
+
+
+def check_syndromes(block: Sequence[int], num_ec: int) -> bool:
+    """
+    Checks a Reed-Solomon block (message followed by error correction
+    bytes).
+
+    The block polynomial is evaluated at the roots 2^0 to 2^(n-1) of the
+    generator polynomial, where n is the number of error correction bytes.
+    The block is valid if every evaluation (syndrome) is 0.
+
+    Parameters
+    ----------
+    block : Sequence[int]
+        Codewords of the block, highest degree first.
+    num_ec : int
+        Number of error correction bytes in the block.
+
+    Returns
+    -------
+    bool
+        True if every syndrome is 0.
+    """
+    exp_store, log_store = _create_stores()
+
+    for k in range(num_ec):
+        syndrome = 0
+        for coef in block:
+            if syndrome:
+                syndrome = exp_store[(log_store[syndrome] + k) % 255]
+            syndrome ^= coef
+        if syndrome:
+            return False
+
+    return True
+
+
+def _take(bits: str, pos: int, length: int) -> Tuple[int, int]:
+    """
+    Helper function: reads a big-endian integer from a bit string.
+    """
+    if pos + length > len(bits):
+        raise VerificationError('Bitstream ends inside a segment.')
+
+    return int(bits[pos:pos + length], 2), pos + length
+
+
+def parse_bitstream(codewords: Sequence[int], version: int) -> str:
+    """
+    Decodes the message codewords of a QR code.
+
+    Parameters
+    ----------
+    codewords : Sequence[int]
+        Message codewords.
+    version : int
+        QR code version (Micro QR versions M1 to M4 are -3 to 0).
+
+    Returns
+    -------
+    str
+        Decoded message, joining every segment.
+
+    Raises
+    ------
+    VerificationError
+        Unrecognized mode indicator or truncated segment.
+    """
+    bits = ''.join(f'{codeword:08b}' for codeword in codewords)
+    segments, pos = [], 0
+
+    if version < 1:
+        indicator_length, modes = version + 3, MICRO_MODE_INDICATORS
+    else:
+        indicator_length, modes = 4, MODE_INDICATORS
+    terminator_length = _get_terminator_length(version)
+
+    while len(bits) - pos >= terminator_length and \
+            '1' in bits[pos:pos + terminator_length]:
+        indicator = bits[pos:pos + indicator_length]
+        pos += indicator_length
+
+        if indicator == '0011' and version > 0:
+            # Structured append header: index, total and parity.
+            _, pos = _take(bits, pos, 16)
+            continue
+        if indicator not in modes:
+            raise VerificationError(f'Unrecognized mode: {indicator}.')
+
+        mode = modes[indicator]
+        count, pos = _take(bits, pos, _get_indicator_length(mode, version))
+
+        if mode == 'numeric':
+            for start in range(0, count, 3):
+                digits = min(3, count - start)
+                value, pos = _take(bits, pos, (0, 4, 7, 10)[digits])
+                segments.append(f'{value:0{digits}d}')
+        elif mode == 'alphanumeric':
+            for start in range(0, count, 2):
+                if count - start == 1:
+                    value, pos = _take(bits, pos, 6)
+                    segments.append(_ALPHANUMERIC_VALUES[value])
+                else:
+                    value, pos = _take(bits, pos, 11)
+                    first, second = divmod(value, 45)
+                    segments.append(
+                        _ALPHANUMERIC_VALUES[first] +
+                        _ALPHANUMERIC_VALUES[second]
+                    )
+        elif mode == 'bytes':
+            value, pos = _take(bits, pos, 8*count)
+            segments.append(value.to_bytes(count, 'big').decode('latin-1'))
+        else:
+            for _ in range(count):
+                value, pos = _take(bits, pos, 13)
+                value = (value // 0xC0 << 8) + value % 0xC0
+                value += 0x8140 if value + 0x8140 <= 0x9FFC else 0xC140
+                segments.append(
+                    value.to_bytes(2, 'big').decode('shift_jis')
+                )
+
+    return ''.join(segments)
+
+
+def verify_codewords(
+    codewords: Sequence[int],
+    version: int,
+    correction_level: str,
+    message: Optional[str] = None
+) -> str:
+    """
+    Checks the final codewords of a QR code and decodes them.
+
+    The codewords are de-interleaved into their blocks, the Reed-Solomon
+    syndromes of each block are checked, and the message codewords are
+    parsed.
+
+    Parameters
+    ----------
+    codewords : Sequence[int]
+        Final (interleaved) codewords.
+    version : int
+        QR code version.
+    correction_level : str
+        Error correction level.
+    message : str, optional
+        Expected message.
+
+    Returns
+    -------
+    str
+        Decoded message.
+
+    Raises
+    ------
+    VerificationError
+        Wrong number of codewords, a block fails its syndrome check, or the
+        decoded message is not the expected one.
+    """
+    block_info = _get_block_info(version, correction_level)
+    order = get_interleave_order(block_info)
+    if len(codewords) != len(order):
+        raise VerificationError(
+            f'Expected {len(order)} codewords, got {len(codewords)}.'
+        )
+
+    ordered = [0]*len(order)
+    for codeword, idx in zip(codewords, order):
+        ordered[idx] = codeword
+
+    num_ec, g1_count, g1_size, g2_count, g2_size = block_info
+    sizes = [g1_size]*g1_count + [g2_size]*(g2_count or 0)
+    num_message = sum(sizes)
+
+    start, ec_start = 0, num_message
+    for size in sizes:
+        block = ordered[start:start + size] + \
+            ordered[ec_start:ec_start + num_ec]
+        if not check_syndromes(block, num_ec):
+            raise VerificationError('Error correction block is corrupt.')
+        start, ec_start = start + size, ec_start + num_ec
+
+    decoded = parse_bitstream(ordered[:num_message], version)
+    if message is not None and decoded != message:
+        raise VerificationError(
+            f'Decoded {decoded!r} instead of {message!r}.'
+        )
+
+    return decoded
+
+
+def verify_symbol(symbol: QRSymbol, message: Optional[str] = None) -> str:
+    """
+    Reads a QR code back out of its module matrix and decodes it.
+
+    The format information, the version information (from version 7) and
+    the codewords are read from the matrix, and the codewords are checked
+    by verify_codewords().
+
+    Parameters
+    ----------
+    symbol : QRSymbol
+        QR code to verify.
+    message : str, optional
+        Expected message.
+
+    Returns
+    -------
+    str
+        Decoded message.
+
+    Raises
+    ------
+    VerificationError
+        The matrix does not decode to the expected message, or its format
+        information does not match the symbol.
+    """
+    version = symbol.version
+    if len(symbol.matrix) != get_size(version)**2:
+        raise VerificationError('Matrix size does not match version.')
+
+    level, mask = read_format(symbol)
+    if (level, mask) != (symbol.correction_level, symbol.mask):
+        raise VerificationError(
+            f'Format information reads {level}/{mask}, expected '
+            f'{symbol.correction_level}/{symbol.mask}.'
+        )
+
+    version_indices = get_version_indices(version)
+    if version_indices:
+        for copy in (version_indices[:18], version_indices[18:]):
+            value = sum(
+                symbol.matrix[idx] << i for i, idx in enumerate(copy)
+            )
+            if value != VERSION_INFORMATION[version]:
+                raise VerificationError('Invalid version information.')
+
+    block_info = _get_block_info(version, level)
+    num_codewords = len(get_interleave_order(block_info))
+
+    return verify_codewords(
+        read_codewords(symbol, mask)[:num_codewords], version, level, message
+    )
+
+
+class Verifier:
+    """
+    Verifies a random sample of encoded QR codes, keeping the time spent
+    verifying within a fraction of the elapsed time.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        max_overhead: float = 0.02,
+        seed: Optional[int] = None
+    ) -> None:
+        """
+        Constructor for the Verifier class.
+
+        Parameters
+        ----------
+        rate : float
+            Fraction of QR codes to verify.
+        max_overhead : float, optional
+            Largest fraction of the time since the verifier was created to
+            spend verifying. Sampled QR codes are skipped while verification
+            is over budget (defaults to 0.02).
+        seed : int, optional
+            Random seed for sampling (defaults to None).
+        """
+        self.rate = rate
+        self.max_overhead = max_overhead
+        self.random = random.Random(seed)
+
+        self.checked = 0
+        self.skipped = 0
+        self.failed = 0
+        self.seconds = 0.0
+        self.start = time.perf_counter()
+
+    def sample(self) -> bool:
+        """
+        Decides whether to verify the next QR code.
+
+        Returns
+        -------
+        bool
+            True if the QR code is sampled and verification is within
+            budget.
+        """
+        if not self.rate or self.random.random() >= self.rate:
+            return False
+
+        budget = self.max_overhead*(time.perf_counter() - self.start)
+        if self.seconds > budget:
+            self.skipped += 1
+            return False
+
+        return True
+
+    def _run(self, check, *args) -> str:
+        """
+        Helper function: runs a check, recording its time and outcome.
+        """
+        start = time.perf_counter()
+        try:
+            return check(*args)
+        except VerificationError:
+            self.failed += 1
+            raise
+        finally:
+            self.checked += 1
+            self.seconds += time.perf_counter() - start
+
+    def verify_symbol(
+        self,
+        symbol: QRSymbol,
+        message: Optional[str] = None
+    ) -> str:
+        """
+        Verifies a QR code with verify_symbol(), recording the result.
+        """
+        return self._run(verify_symbol, symbol, message)
+
+    def verify_codewords(
+        self,
+        codewords: Sequence[int],
+        version: int,
+        correction_level: str,
+        message: Optional[str] = None
+    ) -> str:
+        """
+        Verifies codewords with verify_codewords(), recording the result.
+        """
+        return self._run(
+            verify_codewords, codewords, version, correction_level, message
+        )
+
+    def as_dict(self) -> Dict:
+        """
+        Summarises the verification.
+
+        Returns
+        -------
+        Dict
+            Checked, skipped (over budget) and failed counts, and the time
+            spent verifying as seconds and as a fraction of the elapsed
+            time.
+        """
+        elapsed = time.perf_counter() - self.start
+
+        return {
+            'checked': self.checked,
+            'skipped': self.skipped,
+            'failed': self.failed,
+            'seconds': self.seconds,
+            'overhead': self.seconds / elapsed if elapsed else 0.0
+        }
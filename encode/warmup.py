@@ -0,0 +1,150 @@
+import gc
+from typing import Dict, Iterable, Optional
+
+from encode.backends import BACKENDS, load_profile
+from encode.common import (
+    _get_block_info, _get_mode_indicator, INDICATORS, MICRO_BLOCK_INFORMATION
+)
+from encode.error_correction import (
+    _create_stores, _get_delta_table, _get_generator, _get_numpy_table,
+    _get_product_table, get_interleave_order
+)
+from encode.matrix import (
+    get_format_indices, get_format_modules, get_function_patterns,
+    get_mask_pattern, get_placement_order, get_version_indices
+)
+from encode.plan import get_plan
+from encode.sequence import _get_codeword_modules
+
+LOOKUP_TABLES = (
+    _create_stores,
+    _get_codeword_modules,
+    _get_delta_table,
+    _get_generator,
+    _get_numpy_table,
+    _get_product_table,
+    get_format_indices,
+    get_format_modules,
+    get_function_patterns,
+    get_interleave_order,
+    get_mask_pattern,
+    get_placement_order,
+    get_plan,
+    get_version_indices,
+    load_profile
+)
+
+
+def get_table_misses() -> Dict[str, int]:
+    """
+    Fetches the number of times each lookup table has been built.
+
+    Returns
+    -------
+    Dict[str, int]
+        Cache misses of each lookup table, by function name.
+    """
+    return {
+        table.__name__: table.cache_info().misses for table in LOOKUP_TABLES
+    }
+
+
+def warmup(
+    versions: Optional[Iterable[int]] = None,
+    levels: Optional[Iterable[str]] = None,
+    sequences: bool = False,
+    freeze: bool = False
+) -> Dict[str, int]:
+    """
+    Builds every lookup table used to encode (and verify) QR codes of the
+    given versions and correction levels.
+
+    Calling this in a parent process before forking workers (such as a
+    process pool or a prefork server) means that the children share the
+    tables copy-on-write instead of each building its own on first use.
+
+    Parameters
+    ----------
+    versions : Iterable[int], optional
+        QR code versions to prepare (defaults to 1 to 40).
+    levels : Iterable[str], optional
+        Error correction levels to prepare (defaults to all four).
+    sequences : bool, optional
+        Also build the tables used by iter_sequence() (defaults to False).
+        They hold an error correction delta table for every message
+        codeword position, roughly doubling the memory used by warmup().
+    freeze : bool, optional
+        Move every object tracked by the garbage collector to the permanent
+        generation, so that collections in the children do not write to the
+        shared pages (defaults to False). Only the process which forks the
+        workers should freeze, just before forking: frozen objects are never
+        collected.
+
+    Returns
+    -------
+    Dict[str, int]
+        Cache misses of each lookup table after warming up.
+    """
+    versions = range(1, 41) if versions is None else list(versions)
+    levels = 'LMQH' if levels is None else [level.upper() for level in levels]
+
+    _create_stores()
+    load_profile()
+
+    for level in levels:
+        for mask in range(8):
+            get_format_modules(level, mask)
+
+    for version in versions:
+        num_masks = 4 if version < 1 else 8
+        version_levels = [
+            level for level in levels
+            if version > 0 or level in MICRO_BLOCK_INFORMATION[version]
+        ]
+
+        get_format_indices(version)
+        get_version_indices(version)
+        get_function_patterns(version)
+        get_placement_order(version)
+        for mask in range(num_masks):
+            get_mask_pattern(version, mask)
+        for level in version_levels:
+            _warmup_level(version, level, num_masks, sequences)
+
+    if freeze:
+        gc.collect()
+        gc.freeze()
+
+    return get_table_misses()
+
+
+def _warmup_level(
+    version: int,
+    level: str,
+    num_masks: int,
+    sequences: bool
+) -> None:
+    """
+    Helper function: builds the lookup tables of a version and correction
+    level.
+    """
+    block_info = _get_block_info(version, level)
+    generator = _get_generator(block_info[0])
+
+    if version < 1:
+        for mask in range(num_masks):
+            get_format_modules(level, mask, version)
+
+    _get_product_table(generator)
+    if 'numpy' in BACKENDS['rs']:
+        _get_numpy_table(generator)
+    if sequences:
+        # Building the furthest distance builds every nearer one.
+        _get_delta_table(
+            generator, max(block_info[2], block_info[4] or 0) - 1
+        )
+        _get_codeword_modules(version, level)
+    get_interleave_order(block_info)
+    for mode in INDICATORS:
+        if _get_mode_indicator(mode, version) is not None:
+            get_plan(mode, version, level)
@@ -0,0 +1,132 @@
+import json
+
+import pytest
+
+from encode.autotune import get_rules, time_backend
+from encode.backends import (
+    BACKENDS, DEFAULT_BACKEND, get_backend, load_profile, PROFILE_ENV,
+    register_backend, select_backend
+)
+
+
+@pytest.fixture(scope='function')
+def profile(tmp_path, monkeypatch):
+    path = tmp_path / 'profile.json'
+    monkeypatch.setenv(PROFILE_ENV, str(path))
+    load_profile.cache_clear()
+    yield path
+    load_profile.cache_clear()
+
+
+def _write_profile(path, rules):
+    """Helper function: writes an autotuning profile for the 'rs' stage."""
+    path.write_text(json.dumps({'stages': {'rs': rules}}))
+
+
+class TestSelectBackend:
+
+    def test_missing_profile(self, profile):
+        assert select_backend('rs', 1000) == DEFAULT_BACKEND
+
+    def test_unreadable_profile(self, profile):
+        profile.write_text('{')
+
+        assert select_backend('rs', 1000) == DEFAULT_BACKEND
+
+    @pytest.mark.parametrize(
+        'batch_size, expected',
+        [(1, 'python'), (15, 'python'), (16, 'table'), (4096, 'table')],
+        ids=['Single block', 'Below crossover', 'Crossover', 'Large batch']
+    )
+    def test_crossover(self, profile, batch_size, expected):
+        _write_profile(profile, [
+            {'backend': 'table', 'min_batch': 16},
+            {'backend': 'python', 'min_batch': 1}
+        ])
+
+        assert select_backend('rs', batch_size) == expected
+
+    def test_default(self, profile):
+        assert select_backend('rs', 1) == 'table'
+
+    def test_numpy_profile(self, profile):
+        pytest.importorskip('numpy')
+        _write_profile(profile, [{'backend': 'numpy', 'min_batch': 1}])
+
+        assert select_backend('rs', 1) == 'numpy'
+
+    @pytest.mark.parametrize(
+        'rules',
+        [
+            [{'backend': 'table'}],
+            [{'min_batch': 4}],
+            [{'backend': 'table', 'min_batch': '4'}],
+            ['table'],
+            {'backend': 'table', 'min_batch': 1}
+        ],
+        ids=[
+            'Missing min_batch',
+            'Missing backend',
+            'min_batch not an integer',
+            'Rule not an object',
+            'Rules not a list'
+        ]
+    )
+    def test_invalid_rule(self, profile, rules):
+        _write_profile(profile, rules)
+
+        with pytest.raises(ValueError) as error_msg:
+            select_backend('rs', 16)
+
+        assert str(profile) in str(error_msg.value)
+        assert 'rs' in str(error_msg.value)
+
+    def test_unregistered_backend(self, profile):
+        _write_profile(profile, [
+            {'backend': 'table', 'min_batch': 1},
+            {'backend': 'missing', 'min_batch': 8}
+        ])
+
+        assert select_backend('rs', 64) == 'table'
+
+
+class TestGetBackend:
+
+    def test_override(self, profile):
+        _write_profile(profile, [{'backend': 'table', 'min_batch': 1}])
+
+        assert get_backend('rs') is BACKENDS['rs']['table']
+        assert get_backend('rs', 'python') is BACKENDS['rs']['python']
+
+    @pytest.mark.parametrize(
+        'stage, name',
+        [('rs', 'missing'), ('render', 'python')],
+        ids=['Backend', 'Stage']
+    )
+    def test_unrecognized(self, stage, name):
+        with pytest.raises(ValueError):
+            get_backend(stage, name)
+
+    def test_register(self, monkeypatch):
+        monkeypatch.setitem(BACKENDS, 'rs', dict(BACKENDS['rs']))
+        register_backend('rs', 'custom', len)
+
+        assert get_backend('rs', 'custom') is len
+
+
+class TestAutotune:
+
+    def test_get_rules(self):
+        timings = {
+            1: {'python': 1.0, 'table': 2.0},
+            4: {'python': 1.0, 'table': 0.5},
+            16: {'python': 1.0, 'table': 0.2}
+        }
+
+        assert get_rules(timings) == [
+            {'backend': 'python', 'min_batch': 1},
+            {'backend': 'table', 'min_batch': 4}
+        ]
+
+    def test_time_backend(self):
+        assert time_backend('table', 2, repeat=1) > 0
@@ -0,0 +1,112 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from encode.batch import encode_many
+from encode.preliminary import select_encoder
+
+
+class TestEncodeMany:
+
+    def test_matches_single_encoding(self):
+        messages = ['HELLO WORLD', '0123', 'hello', 'HELLO WORLD']
+        symbols, _ = encode_many(messages, 'Q')
+
+        for message, symbol in zip(messages, symbols):
+            expected = select_encoder(message, 'Q').get_symbol()
+            assert symbol.matrix == expected.matrix
+
+    def test_deduplication(self):
+        messages = ['A', 'B', 'A', 'A', 'B', 'C']
+        symbols, stats = encode_many(messages, 'L')
+
+        assert symbols[0] is symbols[2] is symbols[3]
+        assert symbols[1] is symbols[4]
+        assert stats.total == 6
+        assert stats.unique == 3
+        assert stats.dedup_ratio == pytest.approx(0.5)
+
+    def test_levels_distinguish_duplicates(self):
+        symbols, stats = encode_many(['A', 'A'], ['L', 'h'])
+
+        assert stats.unique == 2
+        assert symbols[0].correction_level == 'L'
+        assert symbols[1].correction_level == 'H'
+
+    def test_buckets(self):
+        messages = ['0123', '4567', 'HELLO', 'a'*40]
+        _, stats = encode_many(messages, 'M')
+
+        assert stats.as_dict()['buckets'] == {
+            'alphanumeric/1/M': 1,
+            'bytes/3/M': 1,
+            'numeric/1/M': 2
+        }
+
+    @pytest.mark.parametrize('backend', ['python', 'table'])
+    def test_backend_override(self, backend):
+        messages = ['HELLO WORLD', '0123', 'HELLO AGAIN', 'a'*200]
+        symbols, _ = encode_many(messages, 'H', backend=backend)
+
+        for message, symbol in zip(messages, symbols):
+            expected = select_encoder(message, 'H').get_symbol()
+            assert symbol.matrix == expected.matrix
+
+    def test_level_count_mismatch(self):
+        with pytest.raises(ValueError):
+            encode_many(['A', 'B'], ['L'])
+
+
+class TestThreadedEncodeMany:
+
+    MESSAGES = [
+        'HELLO WORLD', '0123456789'*8, 'hello', 'HELLO WORLD',
+        'https://example.com/' + 'x'*60, '8675309', 'A'*120
+    ]
+
+    @pytest.mark.parametrize(
+        'max_workers',
+        [1, 3, 8],
+        ids=['One thread', 'Three threads', 'More threads than chunks']
+    )
+    def test_matches_serial(self, max_workers):
+        expected, expected_stats = encode_many(self.MESSAGES, 'M')
+        symbols, stats = encode_many(
+            self.MESSAGES, 'M', executor='thread', max_workers=max_workers
+        )
+
+        assert [s.matrix for s in symbols] == [s.matrix for s in expected]
+        assert symbols[0] is symbols[3]
+        assert stats.as_dict() == expected_stats.as_dict()
+
+    def test_existing_executor(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            symbols, _ = encode_many(self.MESSAGES, 'H', executor=executor)
+
+            assert executor.submit(len, 'open').result() == 4
+
+        expected, _ = encode_many(self.MESSAGES, 'H')
+        assert [s.matrix for s in symbols] == [s.matrix for s in expected]
+
+    def test_unrecognized_executor(self):
+        with pytest.raises(ValueError):
+            encode_many(self.MESSAGES, executor='process')
+
+    def test_concurrent_batches(self):
+        levels = 'LMQH'
+        expected = {
+            level: [s.matrix for s in encode_many(self.MESSAGES, level)[0]]
+            for level in levels
+        }
+
+        def encode(level):
+            symbols, _ = encode_many(
+                self.MESSAGES, level, executor='thread', max_workers=2
+            )
+            return level, [s.matrix for s in symbols]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(encode, levels*4))
+
+        for level, matrices in results:
+            assert matrices == expected[level]
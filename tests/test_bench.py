@@ -0,0 +1,153 @@
+import json
+
+import pytest
+
+from encode.backends import BACKENDS
+from encode.bench import (
+    _parse_weights, PayloadDistribution, run, run_pipeline, run_scaling,
+    STAGES
+)
+from encode.preliminary import select_encoder
+
+
+class TestPayloadDistribution:
+
+    @pytest.mark.parametrize(
+        'mode, expected',
+        [
+            ('numeric', 'numeric'),
+            ('alphanumeric', 'alphanumeric'),
+            ('byte', 'bytes'),
+            ('kanji', 'kanji')
+        ],
+        ids=['Numeric', 'Alphanumeric', 'Byte', 'Kanji']
+    )
+    def test_mode(self, mode, expected):
+        distribution = PayloadDistribution({12: 1}, {mode: 1}, {'Q': 1}, 7)
+
+        for _ in range(20):
+            message, level = distribution.sample()
+
+            assert len(message) == 12
+            assert level == 'Q'
+            assert select_encoder(message, level).mode == expected
+
+    def test_seeded(self):
+        samples = [
+            [
+                PayloadDistribution(
+                    {5: 1, 50: 2}, {'numeric': 1, 'byte': 1}, {'L': 1}, 3
+                ).sample()
+                for _ in range(5)
+            ]
+            for _ in range(2)
+        ]
+
+        assert samples[0] == samples[1]
+
+    def test_unrecognized_mode(self):
+        with pytest.raises(ValueError):
+            PayloadDistribution({5: 1}, {'binary': 1}, {'L': 1})
+
+
+class TestParseWeights:
+
+    @pytest.mark.parametrize(
+        'text, cast, expected',
+        [
+            ('16:4,64:1', int, {16: 4.0, 64: 1.0}),
+            ('l, m:2', str.upper, {'L': 1.0, 'M': 2.0})
+        ],
+        ids=['Lengths', 'Default weight']
+    )
+    def test_parse(self, text, cast, expected):
+        assert _parse_weights(text, cast) == expected
+
+
+class TestRunPipeline:
+
+    def test_stages(self):
+        mode, timings = run_pipeline('HELLO WORLD', 'M')
+
+        assert mode == 'alphanumeric'
+        assert tuple(timings) == STAGES
+        assert all(seconds >= 0 for seconds in timings.values())
+
+    @pytest.mark.parametrize('backend', sorted(BACKENDS['rs']))
+    def test_backend(self, backend):
+        mode, timings = run_pipeline('1'*300, 'Q', backend)
+
+        assert mode == 'numeric'
+        assert tuple(timings) == STAGES
+
+    def test_micro(self):
+        mode, timings = run_pipeline('12345', 'L', micro=True)
+
+        assert mode == 'numeric'
+        assert tuple(timings) == STAGES
+
+    @pytest.mark.parametrize(
+        'message, backend',
+        [
+            ('1'*8000, None),
+            ('HELLO', 'abacus')
+        ],
+        ids=['Too long', 'Unrecognized backend']
+    )
+    def test_invalid(self, message, backend):
+        with pytest.raises(ValueError):
+            run_pipeline(message, 'H', backend)
+
+
+class TestRun:
+
+    @pytest.mark.parametrize(
+        'use_processes',
+        [False, True],
+        ids=['Threads', 'Processes']
+    )
+    def test_report(self, use_processes):
+        distribution = PayloadDistribution(
+            {8: 1, 40: 1, 5000: 1}, {'numeric': 1, 'byte': 1},
+            {'L': 1, 'H': 1}
+        )
+        report = run(distribution, 2, 0.3, use_processes)
+
+        assert report['payloads'] > 0
+        assert report['errors'] > 0
+        assert sum(report['modes'].values()) == report['payloads']
+        assert report['latency_ms']['p50'] <= report['latency_ms']['p90'] \
+            <= report['latency_ms']['p99'] <= report['latency_ms']['max']
+        assert set(report['stages_ms']) == set(STAGES)
+        assert sum(report['stage_share'].values()) == pytest.approx(1)
+        assert report['peak_rss_kb'] > 0
+        assert json.loads(json.dumps(report))['config']['concurrency'] == 2
+
+    def test_micro(self):
+        distribution = PayloadDistribution({4: 1}, {'numeric': 1}, {'L': 1})
+        report = run(distribution, 1, 0.1, micro=True, backend='python')
+
+        assert report['payloads'] > 0
+        assert report['errors'] == 0
+        assert report['config']['micro'] is True
+
+    def test_unrecognized_backend(self):
+        distribution = PayloadDistribution({4: 1}, {'numeric': 1}, {'L': 1})
+
+        with pytest.raises(ValueError):
+            run(distribution, 1, 0.1, backend='abacus')
+
+
+class TestRunScaling:
+
+    def test_report(self):
+        distribution = PayloadDistribution(
+            {10: 1, 5000: 1}, {'alphanumeric': 1}, {'M': 1}, 5
+        )
+        report = run_scaling(distribution, 2, 40)
+
+        assert isinstance(report['gil_enabled'], bool)
+        assert 0 < report['payloads'] < 40
+        assert list(report['threads']) == [1, 2]
+        assert report['threads'][1]['speedup'] == 1.0
+        assert report['threads'][2]['payloads_per_second'] > 0
@@ -0,0 +1,316 @@
+import json
+import mmap
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from multiprocessing.shared_memory import SharedMemory
+
+from encode.bulk import (
+    AsyncWriter, encode_row, encode_rows_shared, format_row, OutputWriter,
+    read_manifest, run_job
+)
+from encode.service import encode_payload
+
+
+def _write_manifest(path, rows, delimiter=','):
+    """
+    Helper function: writes a manifest with id, payload and level columns.
+    """
+    with open(path, 'w') as file:
+        file.write(delimiter.join(('id', 'payload', 'level')) + '\n')
+        for row in rows:
+            file.write(delimiter.join(row) + '\n')
+
+
+@pytest.fixture(scope='function')
+def manifest(tmp_path):
+    path = str(tmp_path / 'manifest.csv')
+    rows = [(f'row{k}', f'ITEM {k}', 'LMQH'[k % 4]) for k in range(25)]
+    _write_manifest(path, rows)
+    return path, rows
+
+
+class TestReadManifest:
+
+    def test_tsv(self, tmp_path):
+        path = str(tmp_path / 'manifest.tsv')
+        _write_manifest(path, [('a', 'x,y', ''), ('b', 'z', 'H')], '\t')
+
+        with open(path, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            rows = [row for row, _ in read_manifest(m, 0, 'Q')]
+
+        assert rows == [('a', 'x,y', 'Q'), ('b', 'z', 'H')]
+
+    def test_ragged_rows(self, tmp_path):
+        path = str(tmp_path / 'manifest.csv')
+        with open(path, 'w') as file:
+            file.write('id,payload,level\na,X,M\nb\nc,X,L,extra\nd,Y\n')
+
+        with open(path, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            rows = [row for row, _ in read_manifest(m, 0, 'Q')]
+
+        assert rows == [
+            ('a', 'X', 'M'), ('b', None, 'Q'), ('c', None, 'Q'),
+            ('d', None, 'Q')
+        ]
+
+    def test_missing_columns(self, tmp_path):
+        path = str(tmp_path / 'manifest.csv')
+        with open(path, 'w') as file:
+            file.write('name,text\na,b\n')
+
+        with open(path, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            with pytest.raises(ValueError):
+                next(read_manifest(m, 0, 'L'))
+
+
+class TestEncodeRow:
+
+    def test_wire_form(self):
+        row_id, content, error = encode_row(('a', 'HELLO WORLD', 'M'))
+
+        assert (row_id, error) == ('a', '')
+        assert content[:2] == b'QR'
+        assert json.loads(format_row(content)) == encode_payload(
+            'HELLO WORLD', 'M'
+        )
+
+    def test_error(self):
+        assert encode_row(('a', 'HELLO', 'J'))[1:] == (
+            b'', 'Unrecognized correction level: J.'
+        )
+
+    def test_no_payload(self):
+        assert encode_row(('a', None, 'L')) == (
+            'a', b'', 'Row does not match the manifest header.'
+        )
+
+
+class TestEncodeRowsShared:
+
+    def test_slab_and_overflow(self):
+        rows = [('a', 'HELLO', 'L'), ('b', 'x'*200, 'H'), ('c', 'HI', 'J')]
+        expected = [encode_row(row) for row in rows]
+        slab = SharedMemory(create=True, size=len(expected[0][1]) + 10)
+
+        try:
+            results = encode_rows_shared(rows, slab.name)
+            first = bytes(slab.buf[:results[0][2]])
+        finally:
+            slab.close()
+            slab.unlink()
+
+        assert (results[0][1], first) == (0, expected[0][1])
+        assert results[1][1:4] == (-1, 0, expected[1][1])
+        assert results[2][4] == expected[2][2]
+
+
+class TestAsyncWriter:
+
+    @pytest.mark.parametrize(
+        'threads, preallocate, sync',
+        [(1, False, False), (4, True, False), (3, False, True)],
+        ids=['One thread', 'Preallocated', 'Synced']
+    )
+    def test_directory_output(self, tmp_path, threads, preallocate, sync):
+        output = str(tmp_path / 'out')
+        writer = AsyncWriter(
+            OutputWriter(output), threads, 4, preallocate, sync
+        )
+        for k in range(50):
+            writer.write(f'row{k}.json', b'x'*k)
+        writer.flush()
+
+        assert writer.unsynced == []
+        writer.close()
+
+        assert len(os.listdir(output)) == 256
+        sizes = {
+            name: os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(output) for name in names
+        }
+        assert sizes == {f'row{k}.json': k for k in range(50)}
+
+        stats = writer.get_stats()
+        assert (stats['written'], stats['bytes']) == (50, sum(range(50)))
+        assert stats['threads'] == threads
+        assert 0 <= stats['utilization'] <= 1
+        assert 1 <= stats['peak_queue'] <= 4
+
+    def test_archive_order(self, tmp_path):
+        output = str(tmp_path / 'out.tar')
+        writer = AsyncWriter(OutputWriter(output), threads=4, sync=True)
+        for k in range(20):
+            writer.write(f'row{k}.json', b'{}')
+        offset = writer.flush()
+        writer.close()
+
+        assert offset > 0
+        with tarfile.open(output) as archive:
+            assert archive.getnames() == [f'row{k}.json' for k in range(20)]
+        assert writer.get_stats()['threads'] == 1
+
+    def test_formatter(self, tmp_path):
+        output = str(tmp_path / 'out.zip')
+        writer = AsyncWriter(OutputWriter(output), formatter=bytes.upper)
+        writer.write('row.json', b'{"a": 1}')
+        writer.close()
+
+        with zipfile.ZipFile(output) as archive:
+            assert archive.read('row.json') == b'{"A": 1}'
+
+    def test_write_error(self, tmp_path):
+        writer = AsyncWriter(OutputWriter(str(tmp_path / 'out')))
+        writer.write('missing/row.json', b'{}')
+
+        with pytest.raises(OSError):
+            writer.flush()
+        with pytest.raises(OSError):
+            writer.close()
+
+
+class TestRunJob:
+
+    def test_directory_output(self, manifest, tmp_path):
+        path, rows = manifest
+        output = str(tmp_path / 'out')
+        checkpoint = run_job(path, output, workers=2, interval=10, log=None)
+
+        assert checkpoint['rows'] == 25
+        written = {
+            name: os.path.join(root, name)
+            for root, _, names in os.walk(output) for name in names
+        }
+        assert len(written) == 25
+        with open(written['row3.json']) as file:
+            assert json.load(file) == encode_payload('ITEM 3', 'H')
+
+    def test_resume_skips_completed_rows(self, manifest, tmp_path):
+        path, rows = manifest
+        output = str(tmp_path / 'out.tar')
+        first_half = str(tmp_path / 'first.csv')
+        _write_manifest(first_half, rows[:10])
+
+        run_job(first_half, output, workers=1, interval=10, log=None)
+
+        # The first manifest's rows (and byte offsets) are a prefix of the
+        # full manifest, so the job resumes from its checkpoint.
+        checkpoint = run_job(path, output, workers=1, interval=10, log=None)
+
+        assert checkpoint['rows'] == 25
+        with tarfile.open(output) as archive:
+            names = archive.getnames()
+        assert sorted(names) == sorted(f'{row[0]}.json' for row in rows)
+
+    def test_zip_output_and_errors(self, tmp_path):
+        path = str(tmp_path / 'manifest.csv')
+        _write_manifest(path, [('ok', 'HELLO', 'M'), ('bad', 'HELLO', 'J')])
+        output = str(tmp_path / 'out.zip')
+
+        checkpoint = run_job(path, output, workers=1, log=None)
+
+        assert checkpoint['errors'] == 1
+        with zipfile.ZipFile(output) as archive:
+            assert archive.namelist() == ['ok.json']
+
+    def test_ragged_rows(self, tmp_path):
+        path = str(tmp_path / 'manifest.csv')
+        with open(path, 'w') as file:
+            file.write('id,payload,level\nok,HELLO,M\nshort\nlong,A,L,B\n')
+        output = str(tmp_path / 'out.zip')
+
+        checkpoint = run_job(path, output, workers=1, log=None)
+
+        assert checkpoint['rows'] == 3
+        assert checkpoint['errors'] == 2
+        with zipfile.ZipFile(output) as archive:
+            assert archive.namelist() == ['ok.json']
+
+    def test_zip_resume_appends(self, manifest, tmp_path):
+        path, rows = manifest
+        output = str(tmp_path / 'out.zip')
+        first_half = str(tmp_path / 'first.csv')
+        _write_manifest(first_half, rows[:10])
+
+        run_job(first_half, output, workers=1, log=None)
+        checkpoint = run_job(path, output, workers=1, log=None)
+
+        assert checkpoint['rows'] == 25
+        with zipfile.ZipFile(output) as archive:
+            assert sorted(archive.namelist()) == sorted(
+                f'{row[0]}.json' for row in rows
+            )
+
+    @pytest.mark.parametrize(
+        'output', ['out', 'out.zip'], ids=['Directory', 'Zip']
+    )
+    def test_unsafe_ids(self, tmp_path, output):
+        path = str(tmp_path / 'manifest.csv')
+        _write_manifest(path, [
+            ('a/b', 'A', 'L'), ('../escape', 'B', 'L'), ('..', 'C', 'L')
+        ])
+        output = str(tmp_path / output)
+
+        checkpoint = run_job(path, output, workers=1, log=None)
+
+        assert checkpoint['errors'] == 0
+        assert sorted(os.listdir(tmp_path)) == sorted([
+            'manifest.csv', os.path.basename(output),
+            os.path.basename(output) + '.checkpoint'
+        ])
+        if output.endswith('.zip'):
+            with zipfile.ZipFile(output) as archive:
+                names = archive.namelist()
+        else:
+            names = [name for _, _, files in os.walk(output) for name in files]
+        assert sorted(names) == ['..%2Fescape.json', '...json', 'a%2Fb.json']
+
+    def test_unfinished_zip(self, manifest, tmp_path):
+        output = str(tmp_path / 'out.zip')
+        writer = OutputWriter(output)
+        writer.write('row0.json', b'{}')
+        writer.close(finish=False)
+
+        assert not os.path.exists(output)
+        with pytest.raises(ValueError):
+            OutputWriter(output, resume=True)
+
+    def test_writer_options(self, manifest, tmp_path):
+        path, rows = manifest
+        output = str(tmp_path / 'out')
+        checkpoint = run_job(
+            path, output, workers=1, interval=10, log=None,
+            writer_threads=2, queue_size=3, preallocate=True, sync=True
+        )
+
+        assert checkpoint['rows'] == 25
+        assert sum(len(names) for _, _, names in os.walk(output)) == 25
+
+    def test_shared_memory(self, manifest, tmp_path):
+        path, rows = manifest
+        output = str(tmp_path / 'out.zip')
+        checkpoint = run_job(
+            path, output, workers=2, interval=10, log=None,
+            shared_memory=True
+        )
+
+        assert checkpoint['rows'] == 25
+        with zipfile.ZipFile(output) as archive:
+            assert json.loads(archive.read('row6.json')) == encode_payload(
+                'ITEM 6', 'Q'
+            )
+            assert len(archive.namelist()) == 25
+
+    def test_verification(self, manifest, tmp_path):
+        path, rows = manifest
+        output = str(tmp_path / 'out')
+        checkpoint = run_job(path, output, workers=1, log=None, verify_rate=1)
+
+        assert checkpoint['errors'] == 0
+        assert 1 <= checkpoint['verified'] <= len(rows)
@@ -0,0 +1,119 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from encode.coalesce import (
+    AsyncCoalescer, Coalescer, CoalescerStats, encode_batch
+)
+from encode.preliminary import select_encoder
+
+
+class TestEncodeBatch:
+
+    def test_groups_and_errors(self):
+        requests = [
+            ('HELLO', 'L'), ('0123', 'L'), ('WORLD', 'L'), ('HELLO', 'J'),
+            ('HELLO', 'L')
+        ]
+        results, groups = encode_batch(requests)
+
+        assert groups == 2
+        assert results[0][0] is results[4][0]
+        assert isinstance(results[3][1], ValueError)
+        for (message, level), (symbol, error) in zip(requests, results):
+            if error is None:
+                expected = select_encoder(message, level).get_symbol()
+                assert symbol.matrix == expected.matrix
+
+
+class TestCoalescer:
+
+    def test_matches_single_encoding(self):
+        messages = [f'ITEM {k}' for k in range(40)]
+
+        with Coalescer(max_batch=8, max_delay_us=20000) as coalescer:
+            with ThreadPoolExecutor(16) as executor:
+                symbols = list(executor.map(coalescer.encode, messages))
+
+        for message, symbol in zip(messages, symbols):
+            expected = select_encoder(message, 'L').get_symbol()
+            assert symbol.matrix == expected.matrix
+
+        stats = coalescer.stats.as_dict()
+        assert stats['requests'] == 40
+        assert max(stats['batch_sizes']) <= 8
+        assert stats['mean_batch_size'] > 1
+
+    def test_delay(self):
+        with Coalescer(max_batch=100, max_delay_us=20000) as coalescer:
+            futures = [coalescer.submit('A'), coalescer.submit('B')]
+            for future in futures:
+                future.result()
+
+        assert coalescer.stats.batch_sizes == {2: 1}
+        assert coalescer.stats.max_queue_seconds >= 0.015
+
+    def test_errors(self):
+        with Coalescer() as coalescer:
+            future = coalescer.submit('HELLO', 'J')
+            with pytest.raises(ValueError):
+                future.result()
+            with pytest.raises(TypeError):
+                coalescer.submit(b'HELLO')
+
+    def test_closed(self):
+        coalescer = Coalescer(max_delay_us=10**6)
+        future = coalescer.submit('HELLO')
+        coalescer.close()
+
+        assert future.result().version == 1
+        with pytest.raises(RuntimeError):
+            coalescer.submit('HELLO')
+
+
+class TestAsyncCoalescer:
+
+    def test_batches(self):
+        async def encode_all():
+            coalescer = AsyncCoalescer(max_batch=4, max_delay_us=10**6)
+            results = await asyncio.gather(
+                *(coalescer.encode(f'{k}') for k in range(10)),
+                coalescer.encode('HELLO', 'J'),
+                return_exceptions=True
+            )
+            await coalescer.aclose()
+            return results, coalescer.stats
+
+        results, stats = asyncio.run(encode_all())
+
+        for k, symbol in enumerate(results[:10]):
+            assert symbol.matrix == select_encoder(f'{k}', 'L').get_symbol(
+            ).matrix
+        assert isinstance(results[10], ValueError)
+        assert stats.batch_sizes == {4: 2, 3: 1}
+
+    def test_timer(self):
+        async def encode_one():
+            coalescer = AsyncCoalescer(max_batch=100, max_delay_us=1000)
+            symbol = await coalescer.encode('HELLO')
+            return symbol, coalescer.stats
+
+        symbol, stats = asyncio.run(encode_one())
+
+        assert symbol.version == 1
+        assert stats.batches == 1
+
+
+class TestCoalescerStats:
+
+    def test_as_dict(self):
+        stats = CoalescerStats()
+        stats.record([0.001, 0.003], 1)
+        stats.record([0.002], 1)
+
+        summary = stats.as_dict()
+        assert summary['batch_sizes'] == {1: 1, 2: 1}
+        assert summary['mean_batch_size'] == pytest.approx(1.5)
+        assert summary['mean_queue_seconds'] == pytest.approx(0.002)
+        assert summary['max_queue_seconds'] == pytest.approx(0.003)
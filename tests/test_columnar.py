@@ -0,0 +1,138 @@
+import pytest
+
+from encode.columnar import MODES, NO_VERSION, plan_column, select_encodings
+from encode.common import _get_char_cap, _get_data_length, MICRO_VERSIONS
+from encode.preliminary import select_encoder
+
+ROWS = [
+    '', '0123', 'HELLO WORLD', 'hello', 'é', '漢字',
+    '１２３', 'ÉCOLE', 'A'*30, '1'*8000
+]
+
+
+def _to_offsets(rows):
+    offsets = [0]
+    for row in rows:
+        offsets.append(offsets[-1] + len(row.encode()))
+
+    return offsets, ''.join(rows).encode()
+
+
+def _expected(row, level, micro):
+    try:
+        encoder = select_encoder(row, level, micro)
+    except ValueError:
+        return None
+
+    return (
+        encoder.mode, encoder.version,
+        len(encoder.get_prefix()) + encoder.encode_value()[1]
+    )
+
+
+def _planned(plan, row):
+    if plan.versions[row] == NO_VERSION:
+        return None
+
+    return (
+        MODES[plan.modes[row]], int(plan.versions[row]),
+        int(plan.bit_lengths[row])
+    )
+
+
+class TestPlanColumn:
+
+    @pytest.mark.parametrize(
+        'level, micro',
+        [('L', False), ('H', False), ('M', True)],
+        ids=['Level L', 'Level H', 'Micro QR']
+    )
+    def test_matches_select_encoder(self, level, micro):
+        plan = plan_column(_to_offsets(ROWS), level, micro)
+
+        for idx, row in enumerate(ROWS):
+            assert _planned(plan, idx) == _expected(row, level, micro)
+        assert list(plan.rejected) == [9]
+        assert list(plan.char_counts) == [len(row) for row in ROWS]
+
+    def test_numpy(self):
+        numpy = pytest.importorskip('numpy')
+        column = numpy.array([row.encode() for row in ROWS])
+
+        plan = plan_column(column, 'q')
+
+        assert isinstance(plan.versions, numpy.ndarray)
+        for idx, row in enumerate(ROWS):
+            assert _planned(plan, idx) == _expected(row, 'Q', False)
+        assert list(plan.rejected) == [9]
+
+    @pytest.mark.parametrize(
+        'char, mode',
+        [('1', 'numeric'), ('A', 'alphanumeric'), ('a', 'bytes'),
+         ('漢', 'kanji')],
+        ids=['Numeric', 'Alphanumeric', 'Bytes', 'Kanji']
+    )
+    @pytest.mark.parametrize('micro', [False, True], ids=['QR', 'Micro QR'])
+    def test_capacity_edges(self, char, mode, micro):
+        versions = list(MICRO_VERSIONS.values()) + list(range(1, 41))
+        counts = sorted({
+            count
+            for version in versions for level in 'LMQH'
+            for cap in [_get_char_cap(mode, level, version)] if cap
+            for count in (cap, cap + 1)
+        })
+        rows = [char*count for count in counts]
+
+        for level in 'LMQH':
+            plan = plan_column(_to_offsets(rows), level, micro)
+
+            for idx, row in enumerate(rows):
+                try:
+                    encoder = select_encoder(row, level, micro)
+                except ValueError:
+                    assert plan.versions[idx] == NO_VERSION
+                    continue
+
+                assert MODES[plan.modes[idx]] == encoder.mode
+                assert plan.versions[idx] == encoder.version
+                assert plan.bit_lengths[idx] == len(encoder.get_prefix()) + \
+                    _get_data_length(mode, len(row))
+
+    def test_invalid_utf8(self):
+        plan = plan_column(([0, 2, 3], b'\xff\xfeA'), 'L')
+
+        assert list(plan.versions) == [NO_VERSION, 1]
+        assert list(plan.rejected) == [0]
+
+    @pytest.mark.parametrize(
+        'column, level, error',
+        [
+            (([0, 1], b'A'), 'J', ValueError),
+            ('HELLO', 'L', TypeError),
+            (None, 'L', TypeError)
+        ],
+        ids=['Correction level', 'String', 'None']
+    )
+    def test_errors(self, column, level, error):
+        with pytest.raises(error):
+            plan_column(column, level)
+
+
+class TestSelectEncodings:
+
+    def test_offsets(self):
+        modes, char_counts, invalid = select_encodings(
+            _to_offsets(['12', 'AB', 'ab', '漢'])
+        )
+
+        assert [MODES[code] for code in modes] == [
+            'numeric', 'alphanumeric', 'bytes', 'kanji'
+        ]
+        assert list(char_counts) == [2, 2, 2, 1]
+        assert not invalid
+
+    def test_numpy_rejects_unicode(self):
+        numpy = pytest.importorskip('numpy')
+
+        with pytest.raises(TypeError):
+            select_encodings(numpy.array(['HELLO']))
@@ -1,10 +1,18 @@
 import pytest
 
+from encode.common import (
+    _get_capacity, _get_char_cap, _get_data_length, _get_indicator_length,
+    _get_mode_indicator, CHAR_CAP, MICRO_VERSIONS
+)
 from encode.data_encoder import (
     AlphanumericEncoder,
     BytesEncoder,
+    KanjiEncoder,
+    MixedEncoder,
     NumericEncoder,
 )
+from encode.preliminary import select_encoder
+from encode.verify import verify_symbol
 
 
 class TestConstructor:
@@ -87,6 +95,12 @@ class TestConstructor:
         assert bytes_zeros.version == version
         assert bytes_zeros.bit_cap == cap
 
+    def test_kanji_valid_msg(self):
+        test_encoder = KanjiEncoder('点'*141, 'L')
+
+        assert test_encoder.version == 9
+        assert test_encoder.bit_cap == 141
+
     def test_bytes_invalid_msg(self):
         test_msg, test_ec = ''.join('4' for _ in range(1499)), 'H'
         error_msg = 'Message too long for correction level H.'
@@ -96,6 +110,33 @@ class TestConstructor:
 
         assert str(error_info.value) == error_msg
 
+    @pytest.mark.parametrize(
+        'encoder_class, message, level, version, cap',
+        [
+            (NumericEncoder, '12345', 'L', -3, 5),
+            (NumericEncoder, '123456', 'L', -2, 10),
+            (AlphanumericEncoder, 'HELLO', 'M', -2, 5),
+            (BytesEncoder, 'hello', 'L', -1, 9),
+            (KanjiEncoder, '点'*5, 'Q', 0, 5),
+            (NumericEncoder, '1'*36, 'L', 1, 41),
+            (NumericEncoder, '12345', 'H', 1, 17)
+        ],
+        ids=[
+            'M1',
+            'M2',
+            'M2 - EC level M',
+            'M3 - bytes',
+            'M4 - EC level Q',
+            'Too long for Micro QR',
+            'EC level H'
+        ]
+    )
+    def test_micro(self, encoder_class, message, level, version, cap):
+        test_encoder = encoder_class(message, level, micro=True)
+
+        assert test_encoder.version == version
+        assert test_encoder.bit_cap == cap
+
 
 class TestGetPrefix:
 
@@ -166,16 +207,16 @@ class TestEncode:
             ('56267783', '100011001010101001011010011'),
             ('5626779', '100011001010101001011001'),
             ('562121', '10001100100001111001'),
-            ('562063', '10001100100111111'),
-            ('562003', '10001100100011')
+            ('562063', '10001100100000111111'),
+            ('562003', '10001100100000000011')
         ],
         ids=[
             'No padding necessary - all groups 3 digits',
             'No padding necessary - 2 digit group',
             'No padding necessary - 1 digit group',
             'Pad required for 3 digit group',
-            'Pad required for 2 digit group',
-            'Pad required for 1 digit group'
+            'Pad required for 3 digit group with leading zero',
+            'Pad required for 3 digit group with two leading zeros'
         ]
     )
     def test_numeric_message(self, message, expected):
@@ -216,6 +257,23 @@ class TestEncode:
         test_encoder = BytesEncoder(message, 'L')
         assert test_encoder.encode() == expected
 
+    @pytest.mark.parametrize(
+        'message, expected',
+        [
+            ('点', '0110110011111'),
+            ('茗', '1101010101010'),
+            ('茗荷', '11010101010100011010010111')
+        ],
+        ids=[
+            'Lower Shift JIS range',
+            'Upper Shift JIS range',
+            'Multiple characters'
+        ]
+    )
+    def test_kanji_message(self, message, expected):
+        test_encoder = KanjiEncoder(message, 'L')
+        assert test_encoder.encode() == expected
+
 
 class TestGetNumBits:
 
@@ -322,3 +380,167 @@ class TestGetSuffix:
     def test_bytes_suffix(self, bytes_zeros, expected):
         test_len = len(bytes_zeros.get_prefix() + bytes_zeros.message)
         assert bytes_zeros.get_suffix(test_len) == expected
+
+
+class TestGetCodewords:
+
+    @pytest.mark.parametrize(
+        'encoder_class, message, level',
+        [
+            (BytesEncoder, '', 'L'),
+            (BytesEncoder, 'Ghosst', 'L'),
+            (BytesEncoder, 'a'*17, 'H'),
+            (BytesEncoder, 'https://example.com/' + 'x'*300, 'M'),
+            (BytesEncoder, '1\n2'*900, 'L'),
+            (NumericEncoder, '8'*41, 'L'),
+            (NumericEncoder, '8'*40, 'L'),
+            (AlphanumericEncoder, 'A'*25, 'L'),
+            (AlphanumericEncoder, 'HELLO WORLD', 'Q'),
+            (KanjiEncoder, '漢'*10, 'L'),
+            (KanjiEncoder, '茗荷', 'H')
+        ],
+        ids=[
+            'Empty',
+            'Pad bytes',
+            'Full capacity',
+            '16-bit character count',
+            'Version 40',
+            'Numeric, 1 bit left',
+            'Numeric, 4 bits left',
+            'Alphanumeric, 1 bit left',
+            'Alphanumeric, pad bytes',
+            'Kanji, 10 bits left',
+            'Kanji, pad bytes'
+        ]
+    )
+    def test_matches_bit_string(self, encoder_class, message, level):
+        test_encoder = encoder_class(message, level)
+        encoded = test_encoder.get_prefix() + test_encoder.encode()
+        encoded += test_encoder.get_suffix(len(encoded))
+        expected = [
+            int(encoded[i:i+8], 2) for i in range(0, len(encoded), 8)
+        ]
+
+        assert test_encoder.get_codewords() == expected
+        assert len(expected) == test_encoder.get_num_bits() // 8
+
+    @pytest.mark.parametrize(
+        'message, expected',
+        [
+            ('01234567', [0x40, 0x18, 0xAC, 0xC3, 0x00]),
+            ('123456', [0x30, 0xF6, 0xE4, 0x00, 0xEC]),
+            ('12', [0x43, 0x00, 0x00])
+        ],
+        ids=['M2', 'M2 - pad bytes', 'M1 - 4-bit final codeword']
+    )
+    def test_micro(self, message, expected):
+        test_encoder = NumericEncoder(message, 'L', micro=True)
+        encoded = test_encoder.get_prefix() + test_encoder.encode()
+        encoded += test_encoder.get_suffix(len(encoded))
+
+        assert test_encoder.get_codewords() == expected
+        assert len(encoded) == test_encoder.get_num_bits()
+
+    def test_write_codewords(self):
+        test_encoder = NumericEncoder('01234567', 'M')
+        buffer = bytearray(b'\xff'*20)
+
+        assert test_encoder.write_codewords(buffer) == 16
+        assert buffer[:16] == bytes([
+            0x10, 0x20, 0x0C, 0x56, 0x61, 0x80, 0xEC, 0x11,
+            0xEC, 0x11, 0xEC, 0x11, 0xEC, 0x11, 0xEC, 0x11
+        ])
+        assert buffer[16:] == b'\xff'*4
+
+    def test_non_ascii(self):
+        test_encoder = BytesEncoder('café', 'L')
+
+        assert test_encoder.get_codewords()[:6] == [
+            0x40, 0x46, 0x36, 0x16, 0x6E, 0x90
+        ]
+
+
+class TestMixedEncoder:
+
+    def test_codewords(self):
+        test_encoder = MixedEncoder(
+            [('kanji', '点茗'), ('numeric', '12')], 'L'
+        )
+        encoded = '1000' + '00000010' + '0110110011111' + '1101010101010'
+        encoded += '0001' + '0000000010' + '0001100'
+        encoded += test_encoder.get_suffix(len(encoded))
+
+        assert test_encoder.get_prefix() + test_encoder.encode() == \
+            encoded[:59]
+        assert test_encoder.get_codewords() == [
+            int(encoded[i:i+8], 2) for i in range(0, len(encoded), 8)
+        ]
+
+    def test_shares_kanji_plan(self):
+        test_encoder = MixedEncoder(
+            [('kanji', '茗荷'), ('bytes', 'abc')], 'M'
+        )
+        kanji_encoder = KanjiEncoder('茗荷', 'M')
+
+        assert test_encoder.mode == 'kanji'
+        assert test_encoder.plan is kanji_encoder.plan
+        assert MixedEncoder(
+            [('kanji', '茗荷'), ('bytes', 'abc')], 'M', kanji_encoder.plan
+        ).version == 1
+
+    @pytest.mark.parametrize(
+        'segments, level, plan_encoder',
+        [
+            ([('kanji', '漢'*900), ('bytes', 'x')], 'H', None),
+            (
+                [('kanji', '漢'*20), ('bytes', 'x')], 'L',
+                KanjiEncoder('漢', 'L')
+            ),
+            (
+                [('kanji', '漢'), ('bytes', 'x')], 'L',
+                NumericEncoder('1', 'L')
+            ),
+            ([('kanji', '漢'), ('bytes', '字')], 'L', None)
+        ],
+        ids=[
+            'Too long',
+            'Too long for plan',
+            'Plan for another mode',
+            'Byte segment not Latin-1'
+        ]
+    )
+    def test_invalid(self, segments, level, plan_encoder):
+        plan = None if plan_encoder is None else plan_encoder.plan
+
+        with pytest.raises(ValueError):
+            MixedEncoder(segments, level, plan)
+
+
+class TestCharCap:
+
+    @pytest.mark.parametrize('mode', list(CHAR_CAP))
+    def test_matches_capacity(self, mode):
+        versions = list(MICRO_VERSIONS.values()) + list(range(1, 41))
+
+        for level in CHAR_CAP[mode]:
+            for version in versions:
+                cap = _get_char_cap(mode, level, version)
+                if not cap:
+                    continue
+
+                header = len(_get_mode_indicator(mode, version)) + \
+                    _get_indicator_length(mode, version)
+                capacity = _get_capacity(version, level)
+                assert header + _get_data_length(mode, cap) <= capacity
+                assert header + _get_data_length(mode, cap + 1) > capacity
+
+    @pytest.mark.parametrize(
+        'msg, level, version',
+        [('1'*2100, 'L', 21), ('A'*1452, 'M', 26)],
+        ids=['Numeric L', 'Alphanumeric M']
+    )
+    def test_over_previous_cap(self, msg, level, version):
+        symbol = select_encoder(msg, level).get_symbol()
+
+        assert symbol.version == version
+        assert verify_symbol(symbol, msg)
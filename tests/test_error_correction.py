@@ -3,7 +3,11 @@ from unittest.mock import patch, Mock
 
 import pytest
 
-from encode.error_correction import _create_stores, ErrorCorrector
+from encode.common import BLOCK_INFORMATION
+from encode.error_correction import (
+    _correct_python, _correct_table, _create_stores, _get_delta_table,
+    _get_generator, ErrorCorrector, get_interleave_order
+)
 
 
 class TestCreateStores:
@@ -73,3 +77,138 @@ class TestConstructor:
 
         assert test_corrector.num_correction_bytes == expected_ec
         assert test_corrector.num_message_bytes == expected_msg
+
+
+class TestGetGenerator:
+
+    @pytest.mark.parametrize(
+        'n, expected',
+        [
+            (2, [1, 3, 2]),
+            (7, [1, 127, 122, 154, 164, 11, 68, 117])
+        ],
+        ids=[
+            'Degree 2',
+            'Degree 7'
+        ]
+    )
+    def test_generator(self, n, expected):
+        test_corrector = ErrorCorrector((7, 1, 19, None, None))
+
+        assert test_corrector.get_generator(n) == expected
+
+
+class TestGenerateCorrectionBytes:
+
+    def test_single_block(self):
+        test_corrector = ErrorCorrector((10, 1, 16, None, None))
+        codewords = [
+            32, 91, 11, 120, 209, 114, 220, 77, 67, 64, 236, 17, 236, 17,
+            236, 17
+        ]
+
+        assert test_corrector.generate_correction_bytes(codewords) == [
+            [196, 35, 39, 119, 235, 215, 231, 226, 93, 23]
+        ]
+
+    def test_split_blocks(self):
+        test_corrector = ErrorCorrector((18, 2, 15, 2, 16))
+        blocks = test_corrector.split_blocks(list(range(62)))
+
+        assert [len(block) for block in blocks] == [15, 15, 16, 16]
+        assert sum(blocks, []) == list(range(62))
+
+
+class TestBackends:
+
+    @pytest.mark.parametrize(
+        'num_ec, sizes',
+        [(10, [16]), (18, [15, 15, 16, 16]), (30, [118]*3)],
+        ids=['One block', 'Two groups', 'Large blocks']
+    )
+    def test_table_matches_python(self, num_ec, sizes):
+        generator = _get_generator(num_ec)
+        blocks = [
+            [(31*k + 7*size) % 256 for k in range(size)] for size in sizes
+        ]
+
+        assert _correct_table(blocks, generator) == _correct_python(
+            blocks, generator
+        )
+
+    def test_numpy_matches_python(self):
+        pytest.importorskip('numpy')
+        from encode.error_correction import _correct_numpy
+
+        generator = _get_generator(18)
+        blocks = [[k % 256 for k in range(size)] for size in (15, 16, 16)]
+
+        assert _correct_numpy(blocks, generator) == _correct_python(
+            blocks, generator
+        )
+
+    @pytest.mark.parametrize('backend', ['python', 'table'])
+    def test_override(self, backend):
+        test_corrector = ErrorCorrector((18, 2, 15, 2, 16))
+        codewords = list(range(62))
+
+        assert test_corrector.generate_correction_bytes(
+            codewords, backend
+        ) == test_corrector.generate_correction_bytes(codewords)
+
+    def test_unrecognized_backend(self):
+        test_corrector = ErrorCorrector((10, 1, 16, None, None))
+
+        with pytest.raises(ValueError):
+            test_corrector.generate_correction_bytes(list(range(16)), 'gpu')
+
+
+class TestGetDeltaTable:
+
+    @pytest.mark.parametrize('distance', [0, 1, 15])
+    def test_linearity(self, distance):
+        generator = _get_generator(10)
+        table = _get_delta_table(tuple(generator), distance)
+        block = [k*k % 256 for k in range(16)]
+        changed = list(block)
+        changed[15 - distance] ^= 0x5a
+
+        before, after = _correct_python([block, changed], generator)
+        diff = int.from_bytes(bytes(before), 'big') ^ \
+            int.from_bytes(bytes(after), 'big')
+
+        assert diff == table[0x5a]
+
+
+class TestInterleave:
+
+    def test_interleave(self):
+        test_corrector = ErrorCorrector((2, 1, 2, 1, 3))
+        message_blocks = [[1, 2], [3, 4, 5]]
+        correction_blocks = [[6, 7], [8, 9]]
+
+        assert test_corrector.interleave(
+            message_blocks, correction_blocks
+        ) == [1, 3, 2, 4, 5, 6, 8, 7, 9]
+
+
+class TestGetInterleaveOrder:
+
+    @pytest.mark.parametrize(
+        'version, level',
+        [(1, 'L'), (5, 'Q'), (40, 'H')],
+        ids=['One block', 'Two groups', 'Version 40']
+    )
+    def test_matches_interleave(self, version, level):
+        block_info = BLOCK_INFORMATION[version][level]
+        test_corrector = ErrorCorrector(block_info)
+        codewords = [k % 256 for k in range(test_corrector.num_message_bytes)]
+        correction = test_corrector.generate_correction_bytes(codewords)
+        ordered = codewords + sum(correction, [])
+
+        order = get_interleave_order(block_info)
+
+        assert sorted(order) == list(range(len(ordered)))
+        assert [ordered[idx] for idx in order] == test_corrector.interleave(
+            test_corrector.split_blocks(codewords), correction
+        )
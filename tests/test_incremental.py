@@ -0,0 +1,226 @@
+import pytest
+
+from encode.incremental import IncrementalEncoder
+from encode.preliminary import select_encoder
+from encode.verify import verify_symbol
+
+
+def _feed(message, level, size, micro=False):
+    """
+    Helper function: feeds a message to an incremental encoder in chunks.
+    """
+    encoder = IncrementalEncoder(level, micro)
+    for start in range(0, len(message), size):
+        encoder.update(message[start:start + size])
+
+    return encoder
+
+
+class TestIncrementalEncoder:
+
+    @pytest.mark.parametrize(
+        'message, level',
+        [
+            ('0123456789012', 'H'),
+            ('HELLO WORLD', 'M'),
+            ('0123HELLO', 'Q'),
+            ('0123 HELLO world', 'L'),
+            ('漢字日本語', 'M'),
+            ('０１２漢字', 'L'),
+            ('', 'L'),
+            ('9'*5000, 'L')
+        ],
+        ids=[
+            'Numeric',
+            'Alphanumeric',
+            'Numeric to alphanumeric',
+            'Alphanumeric to bytes',
+            'Kanji',
+            'Full width digits to kanji',
+            'Empty',
+            'Large version'
+        ]
+    )
+    @pytest.mark.parametrize('size', [1, 2, 5, 10000])
+    def test_matches_select_encoder(self, message, level, size):
+        symbol = _feed(message, level, size).finalize()
+        expected = select_encoder(message, level).get_symbol()
+
+        assert (symbol.version, symbol.mode, symbol.mask) == (
+            expected.version, expected.mode, expected.mask
+        )
+        assert symbol.matrix == expected.matrix
+
+    @pytest.mark.parametrize(
+        'chunks',
+        [
+            ['ÉÉ', 'x'],
+            ['ÉCOLE'],
+            ['12', 'ÉA'],
+            ['AB', 'é'],
+            ['À', '1'],
+            ['茗', '荷'],
+            ['１２', '茗'],
+            ['１２', '３']
+        ],
+        ids=[
+            'Latin-1 then lowercase',
+            'Latin-1 uppercase',
+            'Numeric to Latin-1',
+            'Alphanumeric to Latin-1',
+            'Latin-1 then digit',
+            'Kanji chunks',
+            'Full width digits then kanji',
+            'Full width digits'
+        ]
+    )
+    @pytest.mark.parametrize('micro', [False, True], ids=['QR', 'Micro QR'])
+    def test_non_ascii_chunks(self, chunks, micro):
+        encoder = IncrementalEncoder('L', micro)
+        for chunk in chunks:
+            encoder.update(chunk)
+
+        expected = select_encoder(''.join(chunks), 'L', micro).get_symbol()
+        assert encoder.finalize().matrix == expected.matrix
+
+    def test_micro(self):
+        symbol = _feed('1234567', 'L', 2, micro=True).finalize()
+
+        assert symbol.version == -2
+        assert symbol.matrix == select_encoder(
+            '1234567', 'L', micro=True
+        ).get_symbol().matrix
+
+    def test_demotion(self):
+        encoder = _feed('123', 'L', 3)
+        assert (encoder.mode, encoder.encode_value()) == ('numeric', (123, 10))
+
+        encoder.update('45A')
+        assert encoder.mode == 'alphanumeric'
+        assert encoder.pending == ''
+        assert encoder.char_count == 6
+
+        encoder.update('b')
+        assert encoder.mode == 'bytes'
+        assert encoder.encode_value()[1] == 8*7
+
+    def test_version_fixed_at_finalize(self):
+        encoder = _feed('1'*50, 'L', 7)
+        assert encoder.version is None
+
+        encoder.finalize()
+        assert encoder.version == 2
+        assert encoder.plan.indicator_length == 10
+
+    def test_update_after_finalize(self):
+        encoder = _feed('HELLO', 'L', 2)
+        encoder.finalize()
+
+        with pytest.raises(ValueError):
+            encoder.update('WORLD')
+
+    @pytest.mark.parametrize(
+        'chunks',
+        [['a'*2953, 'a'], ['漢字', '😀'], ['漢字', 'ab', '😀']],
+        ids=['Too long', 'Not Latin-1', 'Not Latin-1 after segments']
+    )
+    def test_rejected_chunk(self, chunks):
+        encoder = IncrementalEncoder('L')
+        for chunk in chunks[:-1]:
+            encoder.update(chunk)
+        state = encoder.encode_value(), encoder.mode, encoder.segments
+
+        with pytest.raises(ValueError):
+            encoder.update(chunks[-1])
+        assert (
+            encoder.encode_value(), encoder.mode, encoder.segments
+        ) == state
+
+        message = ''.join(chunks[:-1])
+        assert encoder.finalize().matrix == \
+            select_encoder(message, 'L').get_symbol().matrix
+
+    @pytest.mark.parametrize(
+        'chunks',
+        [['١٢٣', 'a'], ['漢', '١٢a'], ['漢１', '٢', 'a']],
+        ids=['Arabic-Indic', 'After kanji', 'Arabic-Indic run after kanji']
+    )
+    def test_non_ascii_digits_not_latin1(self, chunks):
+        with pytest.raises(ValueError):
+            select_encoder(''.join(chunks), 'L')
+
+        encoder = IncrementalEncoder('L')
+        for chunk in chunks[:-1]:
+            encoder.update(chunk)
+        with pytest.raises(ValueError):
+            encoder.update(chunks[-1])
+
+    @pytest.mark.parametrize(
+        'chunks',
+        [
+            ['١٢٣', '٤'], ['１２３４', '漢'], ['１２', '3'], ['１２３', 'a'],
+            ['１２３４', 'A'], ['1', '２３', '字']
+        ],
+        ids=[
+            'Arabic-Indic', 'Full width then kanji', 'Mixed digits',
+            'Full width then bytes', 'Full width then alphanumeric',
+            'Mixed digits then kanji'
+        ]
+    )
+    def test_non_ascii_digits(self, chunks):
+        encoder = IncrementalEncoder('L')
+        for chunk in chunks:
+            encoder.update(chunk)
+
+        message = ''.join(chunks)
+        symbol = encoder.finalize()
+        expected = select_encoder(message, 'L').get_symbol()
+        assert symbol.matrix == expected.matrix
+
+    @pytest.mark.parametrize(
+        'chunks, level, micro',
+        [
+            (['注文', '123'], 'M', False),
+            (['注', '文1', '23'], 'M', False),
+            (['123', '注文'], 'L', False),
+            (['東京 ', 'Tokyo 20', '26年', '品質', 'abc'], 'H', False),
+            (['ABC', '-1', '注文', 'x'*300, '字'*20], 'Q', False),
+            (['注文', '1'], 'L', True)
+        ],
+        ids=[
+            'Kanji then numeric',
+            'Runs across chunks',
+            'Numeric then kanji',
+            'Several runs',
+            'Long runs',
+            'Micro QR'
+        ]
+    )
+    def test_mixed_kanji(self, chunks, level, micro):
+        encoder = IncrementalEncoder(level, micro)
+        for chunk in chunks:
+            encoder.update(chunk)
+
+        message = ''.join(chunks)
+        symbol = encoder.finalize()
+        expected = select_encoder(message, level, micro).get_symbol()
+
+        assert encoder.mode == 'kanji'
+        assert symbol.version == expected.version
+        assert symbol.matrix == expected.matrix
+        assert verify_symbol(symbol, message)
+
+    def test_mixed_kanji_too_long(self):
+        encoder = IncrementalEncoder('H')
+        encoder.update('注文a')
+
+        with pytest.raises(ValueError):
+            encoder.update('漢'*800)
+        with pytest.raises(ValueError):
+            select_encoder('注文a' + '漢'*800, 'H')
+
+    def test_bad_input(self):
+        with pytest.raises(ValueError):
+            IncrementalEncoder('J')
+        with pytest.raises(TypeError):
+            IncrementalEncoder('L').update(b'bytes')
@@ -0,0 +1,280 @@
+import pytest
+
+from encode.common import (
+    BLOCK_INFORMATION,
+    FORMAT_INFORMATION,
+    MICRO_BLOCK_INFORMATION,
+    MICRO_FORMAT_INFORMATION,
+    VERSION_INFORMATION
+)
+from encode.matrix import (
+    apply_mask,
+    build_matrix,
+    get_format_indices,
+    get_function_patterns,
+    get_micro_score,
+    get_penalty,
+    get_placement_order,
+    get_size,
+    get_version_indices,
+    place_data,
+    write_format_information
+)
+from encode.preliminary import select_encoder
+
+HELLO_WORLD_M2 = [
+    '111111100100101111111',
+    '100000100111101000001',
+    '101110101100101011101',
+    '101110101011001011101',
+    '101110101101101011101',
+    '100000101110101000001',
+    '111111101010101111111',
+    '000000001001100000000',
+    '101111100010101111100',
+    '101111011000110011111',
+    '001001110011000101001',
+    '001100001000000100000',
+    '011101111011000000100',
+    '000000001011111001011',
+    '111111100110101011101',
+    '100000101111111100110',
+    '101110101010100001110',
+    '101110101010100101100',
+    '101110101001010011000',
+    '100000100000000000101',
+    '111111101011010010000'
+]
+
+MICRO_01234567_L1 = [
+    '1111111010101',
+    '1000001011101',
+    '1011101001101',
+    '1011101001111',
+    '1011101011100',
+    '1000001010001',
+    '1111111001111',
+    '0000000001100',
+    '1101000010001',
+    '0110101010101',
+    '1110011111110',
+    '0001010000110',
+    '1110100110111'
+]
+
+
+def _bch_remainder(value: int, generator: int, degree: int) -> int:
+    """
+    Helper function: computes the remainder of value * x^degree divided by
+    generator over GF(2).
+    """
+    remainder = value << degree
+    for shift in range(remainder.bit_length() - degree - 1, -1, -1):
+        if remainder >> (shift + degree) & 1:
+            remainder ^= generator << shift
+
+    return remainder
+
+
+class TestInformationTables:
+
+    @pytest.mark.parametrize(
+        'correction_level, level_bits',
+        [('L', 1), ('M', 0), ('Q', 3), ('H', 2)]
+    )
+    def test_format_information(self, correction_level, level_bits):
+        for mask, bits in enumerate(FORMAT_INFORMATION[correction_level]):
+            data = (level_bits << 3) | mask
+            expected = ((data << 10) | _bch_remainder(data, 0x537, 10)) ^ \
+                0x5412
+
+            assert bits == expected
+
+    def test_micro_format_information(self):
+        symbol_numbers = iter(range(8))
+
+        for version in range(-3, 1):
+            for patterns in MICRO_FORMAT_INFORMATION[version].values():
+                symbol_number = next(symbol_numbers)
+                for mask, bits in enumerate(patterns):
+                    data = (symbol_number << 2) | mask
+                    expected = (data << 10) | \
+                        _bch_remainder(data, 0x537, 10)
+
+                    assert bits == expected ^ 0x4445
+
+    def test_version_information(self):
+        assert set(VERSION_INFORMATION) == set(range(7, 41))
+
+        for version, bits in VERSION_INFORMATION.items():
+            expected = (version << 12) | _bch_remainder(version, 0x1F25, 12)
+
+            assert bits == expected
+
+
+class TestFunctionPatterns:
+
+    @pytest.mark.parametrize('version', range(1, 41))
+    def test_data_module_count(self, version):
+        block_info = BLOCK_INFORMATION[version]['L']
+        codewords = block_info[1]*(block_info[0] + block_info[2])
+        if block_info[3]:
+            codewords += block_info[3]*(block_info[0] + block_info[4])
+
+        _, reserved = get_function_patterns(version)
+        data_modules = get_size(version)**2 - sum(reserved)
+        if 2 <= version <= 6:
+            expected_remainder = 7
+        elif 14 <= version <= 20 or 28 <= version <= 34:
+            expected_remainder = 3
+        elif 21 <= version <= 27:
+            expected_remainder = 4
+        else:
+            expected_remainder = 0
+
+        assert data_modules == 8*codewords + expected_remainder
+
+    @pytest.mark.parametrize(
+        'version, size, expected',
+        [(-3, 11, 36), (-2, 13, 80), (-1, 15, 132), (0, 17, 192)],
+        ids=['M1', 'M2', 'M3', 'M4']
+    )
+    def test_micro_data_module_count(self, version, size, expected):
+        block_info = MICRO_BLOCK_INFORMATION[version]['L']
+        _, reserved = get_function_patterns(version)
+
+        assert get_size(version) == size
+        assert size*size - sum(reserved) == expected
+        assert (expected + 4) // 8 == block_info[0] + block_info[2]
+
+    def test_finder_pattern(self):
+        modules, _ = get_function_patterns(1)
+
+        assert modules[:8] == bytes([1, 1, 1, 1, 1, 1, 1, 0])
+        assert modules[21:29] == bytes([1, 0, 0, 0, 0, 0, 1, 0])
+        assert modules[2*21:2*21 + 8] == bytes([1, 0, 1, 1, 1, 0, 1, 0])
+
+    def test_version_information_written(self):
+        modules, reserved = get_function_patterns(7)
+        bits = [modules[idx] for idx in get_version_indices(7)]
+
+        assert bits[:18] == bits[18:]
+        assert sum(b << i for i, b in enumerate(bits[:18])) == \
+            VERSION_INFORMATION[7]
+        assert all(reserved[idx] for idx in get_version_indices(7))
+
+    def test_no_version_information(self):
+        assert get_version_indices(6) == ()
+
+
+class TestWriteFormatInformation:
+
+    def test_table_copy(self):
+        modules, _ = get_function_patterns(2)
+        matrix = bytearray(modules)
+        write_format_information(matrix, 2, 'M', 5)
+        bits = [matrix[idx] for idx in get_format_indices(2)]
+
+        assert bits[:15] == bits[15:]
+        assert sum(b << i for i, b in enumerate(bits[:15])) == \
+            FORMAT_INFORMATION['M'][5]
+
+    def test_indices_distinct(self):
+        assert len(set(get_format_indices(10))) == 30
+
+    def test_micro_single_copy(self):
+        modules, _ = get_function_patterns(0)
+        matrix = bytearray(modules)
+        write_format_information(matrix, 0, 'Q', 3)
+        bits = [matrix[idx] for idx in get_format_indices(0)]
+
+        assert len(bits) == 15
+        assert sum(b << i for i, b in enumerate(bits)) == \
+            MICRO_FORMAT_INFORMATION[0]['Q'][3]
+
+
+class TestPlacement:
+
+    @pytest.mark.parametrize('version', [-3, 0, 1, 7, 40])
+    def test_order_covers_data_modules(self, version):
+        _, reserved = get_function_patterns(version)
+        order = get_placement_order(version)
+
+        assert len(set(order)) == len(order)
+        assert set(order) == {
+            idx for idx, flag in enumerate(reserved) if not flag
+        }
+
+    def test_first_codeword(self):
+        matrix = place_data(1, [0b10110000])
+        corner = [matrix[20*21 + 20], matrix[20*21 + 19],
+                  matrix[19*21 + 20], matrix[19*21 + 19]]
+
+        assert corner == [1, 0, 1, 1]
+
+
+class TestBuildMatrix:
+
+    def test_reference_matrix(self):
+        codewords = select_encoder('HELLO WORLD', 'M').correct_error()
+        matrix, mask = build_matrix(1, 'M', codewords, 2)
+
+        assert mask == 2
+        assert bytes(matrix) == ''.join(HELLO_WORLD_M2).encode().translate(
+            bytes.maketrans(b'01', bytes((0, 1)))
+        )
+
+    def test_micro_reference_matrix(self):
+        codewords = select_encoder('01234567', 'L', micro=True).correct_error()
+        matrix, mask = build_matrix(-2, 'L', codewords)
+
+        assert mask == 1
+        assert bytes(matrix) == ''.join(MICRO_01234567_L1).encode().translate(
+            bytes.maketrans(b'01', bytes((0, 1)))
+        )
+
+    def test_highest_micro_score_mask(self):
+        codewords = select_encoder('HELLO', 'M', micro=True).correct_error()
+        matrix, mask = build_matrix(-2, 'M', codewords)
+        scores = [
+            get_micro_score(build_matrix(-2, 'M', codewords, k)[0], 13)
+            for k in range(4)
+        ]
+
+        assert get_micro_score(matrix, 13) == max(scores)
+        assert scores.index(max(scores)) == mask
+
+    def test_mask_involution(self):
+        matrix = place_data(5, list(range(134)))
+
+        assert apply_mask(apply_mask(matrix, 5, 4), 5, 4) == matrix
+
+    def test_lowest_penalty_mask(self):
+        codewords = select_encoder('HELLO WORLD', 'Q').correct_error()
+        matrix, mask = build_matrix(1, 'Q', codewords)
+        penalties = [
+            get_penalty(build_matrix(1, 'Q', codewords, k)[0], 21)
+            for k in range(8)
+        ]
+
+        assert get_penalty(matrix, 21) == min(penalties)
+        assert penalties.index(min(penalties)) == mask
+
+
+class TestGetPenalty:
+
+    def test_all_light(self):
+        # Rule 1: 21 rows and 21 columns of 21 light modules
+        # Rule 2: 20x20 2x2 blocks
+        # Rule 3: pattern absent
+        # Rule 4: 0% dark
+        assert get_penalty(bytearray(441), 21) == 42*19 + 3*400 + 100
+
+    def test_reference_penalties(self):
+        codewords = select_encoder('HELLO WORLD', 'M').correct_error()
+        penalties = [
+            get_penalty(build_matrix(1, 'M', codewords, k)[0], 21)
+            for k in range(8)
+        ]
+
+        assert penalties == [1031, 1086, 1162, 1103, 1087, 1208, 1115, 1085]
@@ -0,0 +1,117 @@
+import pytest
+
+from encode.data_encoder import AlphanumericEncoder, BytesEncoder
+from encode.error_correction import ErrorCorrector
+from encode.matrix import get_placement_order
+from encode.plan import get_plan
+from encode.preliminary import select_encoder
+
+
+class TestGetPlan:
+
+    @pytest.mark.parametrize(
+        'mode, version, level, expected',
+        [
+            ('numeric', 1, 'M', ('0001', 10, 128, ((0, 16),), 10)),
+            (
+                'bytes', 10, 'L',
+                (
+                    '0100', 16, 2192,
+                    ((0, 68), (68, 136), (136, 205), (205, 274)), 18
+                )
+            ),
+            (
+                'alphanumeric', 5, 'Q',
+                ('0010', 9, 496, ((0, 15), (15, 30), (30, 46), (46, 62)), 18)
+            ),
+            ('kanji', 27, 'H', ('1000', 12, 5024, None, 30))
+        ],
+        ids=[
+            'Numeric, one block',
+            'Bytes, 16-bit count',
+            'Alphanumeric, two groups',
+            'Kanji, large version'
+        ]
+    )
+    def test_fields(self, mode, version, level, expected):
+        plan = get_plan(mode, version, level)
+        indicator, indicator_length, num_bits, bounds, num_ec = expected
+
+        assert plan.mode_indicator == indicator
+        assert plan.indicator_length == indicator_length
+        assert plan.num_bits == num_bits
+        if bounds is not None:
+            assert plan.block_bounds == bounds
+        assert plan.block_bounds[-1][1] == num_bits // 8
+        assert plan.num_ec == num_ec
+        assert len(plan.generator) == num_ec + 1
+        assert plan.placement_order is get_placement_order(version)
+
+    def test_generator(self):
+        plan = get_plan('bytes', 3, 'M')
+        test_corrector = ErrorCorrector(plan.block_info)
+
+        assert list(plan.generator) == test_corrector.get_generator(26)
+
+    def test_micro(self):
+        plan = get_plan('numeric', -3, 'L')
+
+        assert (plan.mode_indicator, plan.indicator_length) == ('', 3)
+        assert (plan.terminator_length, plan.num_bits) == (3, 20)
+
+    def test_mode_not_in_version(self):
+        with pytest.raises(ValueError):
+            get_plan('bytes', -2, 'L')
+
+    def test_memoized(self):
+        assert get_plan('numeric', 2, 'L') is get_plan('numeric', 2, 'L')
+
+    def test_immutable(self):
+        plan = get_plan('numeric', 2, 'L')
+
+        with pytest.raises(AttributeError):
+            plan.version = 3
+
+
+class TestEncoderPlan:
+
+    def test_default_plan(self):
+        encoder = select_encoder('HELLO WORLD', 'Q')
+
+        assert encoder.plan is get_plan('alphanumeric', 1, 'Q')
+
+    def test_version_override(self):
+        encoder = select_encoder('HELLO WORLD', 'Q')
+        encoder.version = 4
+
+        assert encoder.plan.version == 4
+        assert len(encoder.correct_error()) == 100
+
+    def test_given_plan(self):
+        plan = get_plan('bytes', 6, 'M')
+        encoder = BytesEncoder('hello', 'M', plan)
+
+        assert encoder.version == 6
+        assert encoder.plan is plan
+        assert encoder.get_codewords()[:3] == [0x40, 0x56, 0x86]
+
+    @pytest.mark.parametrize(
+        'message, plan',
+        [
+            ('hello', get_plan('bytes', 6, 'L')),
+            ('hello', get_plan('alphanumeric', 6, 'M')),
+            ('hello'*10, get_plan('bytes', 1, 'M'))
+        ],
+        ids=['Other level', 'Other mode', 'Message too long']
+    )
+    def test_bad_plan(self, message, plan):
+        with pytest.raises(ValueError):
+            BytesEncoder(message, 'M', plan)
+
+    def test_matches_unplanned_symbol(self):
+        plan = get_plan('alphanumeric', 2, 'H')
+        encoder = AlphanumericEncoder('HELLO', 'H', plan)
+        reference = select_encoder('HELLO', 'H')
+        reference.version = 2
+
+        assert encoder.get_symbol().matrix == reference.get_symbol().matrix
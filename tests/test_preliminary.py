@@ -5,10 +5,12 @@ from encode.preliminary import (
     select_encoder
 )
 from encode.data_encoder import (
-    alphanumeric_encoder,
-    bytes_encoder,
-    numeric_encoder
+    AlphanumericEncoder,
+    BytesEncoder,
+    MixedEncoder,
+    NumericEncoder
 )
+from encode.verify import verify_symbol
 from tests.conftest import _get_test_msg
 
 
@@ -24,6 +26,10 @@ class TestSelectEncoding:
             ('GOOD AFTERNOON AGENT 47.', 'alphanumeric'),
             ('Good afternoon Agent 47.', 'byte'),
             ('NEW\nLINE', 'byte'),
+            ('NEW~LINE', 'byte'),
+            ('茗荷', 'kanji'),
+            ('茗荷 ', 'byte'),
+            ('ÉCOLE', 'byte'),
             (''.join('a' for _ in range(7089)), 'byte')
         ],
         ids=[
@@ -31,6 +37,10 @@ class TestSelectEncoding:
             'Alphanumeric',
             'Byte - lowercase chars',
             'Byte - char not allowed for alphanumeric',
+            'Byte - ASCII punctuation not allowed for alphanumeric',
+            'Kanji',
+            'Byte - mixed kanji and single-byte chars',
+            'Byte - non-ASCII uppercase chars',
             'Byte - length just under threshold'
         ]
     )
@@ -52,9 +62,9 @@ class TestSelectEncoder:
     @pytest.mark.parametrize(
         'test_msg, corr_lvl, encoder_type',
         [
-            ('00111', 'M', numeric_encoder),
-            ('GOOD AFTERNOON AGENT 47.', 'l', alphanumeric_encoder),
-            ('Good afternoon Agent 47.', 'q', bytes_encoder)
+            ('00111', 'M', NumericEncoder),
+            ('GOOD AFTERNOON AGENT 47.', 'l', AlphanumericEncoder),
+            ('Good afternoon Agent 47.', 'q', BytesEncoder)
         ],
         ids=[
             'Numeric',
@@ -86,6 +96,66 @@ class TestSelectEncoder:
 
         assert str(error_msg.value) == f'Message is not a string: {bad_msg}.'
 
+    @pytest.mark.parametrize(
+        'test_msg, corr_lvl, micro, version',
+        [
+            ('00111', 'L', True, -3),
+            ('00111', 'L', False, 1),
+            ('GOOD AFTERNOON', 'm', True, 0)
+        ],
+        ids=['Micro QR', 'Micro QR not requested', 'Micro QR - M4']
+    )
+    def test_micro(self, test_msg, corr_lvl, micro, version):
+        test_encoder = select_encoder(test_msg, corr_lvl, micro)
+
+        assert test_encoder.version == version
+
+    @pytest.mark.parametrize('test_msg', ['ÉCOLE', 'À1'])
+    def test_non_ascii_uppercase_round_trip(self, test_msg):
+        symbol = select_encoder(test_msg, 'L').get_symbol()
+
+        assert verify_symbol(symbol, test_msg)
+
+    @pytest.mark.parametrize(
+        'test_msg, corr_lvl, micro, segments, version',
+        [
+            (
+                '注文123', 'M', False,
+                (('kanji', '注文'), ('numeric', '123')), 1
+            ),
+            (
+                '東京 Tokyo 2026年', 'H', False,
+                (('kanji', '東京'), ('bytes', ' Tokyo 2026'), ('kanji', '年')),
+                3
+            ),
+            (
+                '品質ABC-1', 'q', False,
+                (('kanji', '品質'), ('alphanumeric', 'ABC-1')), 1
+            ),
+            ('注文1', 'L', True, (('kanji', '注文'), ('numeric', '1')), -1)
+        ],
+        ids=[
+            'Kanji then numeric',
+            'Kanji runs around bytes',
+            'Kanji then alphanumeric',
+            'Micro QR - M3'
+        ]
+    )
+    def test_mixed_kanji(self, test_msg, corr_lvl, micro, segments, version):
+        test_encoder = select_encoder(test_msg, corr_lvl, micro)
+
+        assert isinstance(test_encoder, MixedEncoder)
+        assert test_encoder.segments == segments
+        assert test_encoder.version == version
+        assert verify_symbol(test_encoder.get_symbol(), test_msg)
+
+    def test_not_kanji_or_latin1(self):
+        with pytest.raises(ValueError) as error_msg:
+            select_encoder('注文😀', 'L')
+
+        assert str(error_msg.value) == \
+            'Byte mode characters must be in Latin-1.'
+
     def test_bad_corr_lvl(self):
         with pytest.raises(ValueError) as error_msg:
             select_encoder('r', 'J')
@@ -0,0 +1,166 @@
+import io
+import struct
+import zlib
+
+import pytest
+
+from encode.preliminary import select_encoder
+from encode.render import (
+    iter_scanlines, PNG_SIGNATURE, save, write_pbm, write_png
+)
+
+
+def _get_pixels(symbol, scale, border):
+    """Unpacked pixel rows (1 for dark) built from the whole matrix."""
+    size = symbol.size
+    width = (size + 2*border)*scale
+    pixels = []
+
+    for r in range(-border, size + border):
+        row = []
+        for c in range(-border, size + border):
+            dark = 0 <= r < size and 0 <= c < size and \
+                symbol.matrix[r*size + c]
+            row.extend([int(bool(dark))]*scale)
+        pixels.extend([row]*scale)
+
+    assert len(pixels) == width
+
+    return pixels
+
+
+def _unpack(scanline, width, dark_bit=1):
+    bits = ''.join(f'{byte:08b}' for byte in scanline)[:width]
+
+    return [int(bit == str(dark_bit)) for bit in bits]
+
+
+def _read_png(data):
+    assert data[:8] == PNG_SIGNATURE
+
+    chunks, pos = [], 8
+    while pos < len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        (crc,) = struct.unpack('>I', data[pos + 8 + length:pos + 12 + length])
+        assert crc == zlib.crc32(kind + body)
+        chunks.append((kind, body))
+        pos += 12 + length
+
+    return chunks
+
+
+@pytest.fixture
+def symbol():
+    return select_encoder('HELLO WORLD', 'M').get_symbol()
+
+
+class TestIterScanlines:
+
+    @pytest.mark.parametrize(
+        'scale, border',
+        [(1, 4), (3, 2), (8, 0)],
+        ids=['Unscaled', 'Padded rows', 'No border']
+    )
+    def test_pixels(self, symbol, scale, border):
+        width = (symbol.size + 2*border)*scale
+        scanlines = list(
+            iter_scanlines(symbol.rows(), symbol.size, scale, border)
+        )
+
+        assert len(scanlines) == width
+        assert all(len(line) == (width + 7) // 8 for line in scanlines)
+        assert [_unpack(line, width) for line in scanlines] == \
+            _get_pixels(symbol, scale, border)
+
+    def test_padding_is_light(self, symbol):
+        for line in iter_scanlines(symbol.rows(), symbol.size, 1, 4, 0):
+            assert line[-1] & 0b111 == 0b111
+
+    def test_rows_consumed_lazily(self, symbol):
+        rows = symbol.rows()
+        scanlines = iter_scanlines(rows, symbol.size, 2, 1)
+
+        for _ in range(4):
+            next(scanlines)
+
+        assert len(list(rows)) == symbol.size - 1
+
+
+class TestWritePbm:
+
+    def test_image(self, symbol):
+        file = io.BytesIO()
+        write_pbm(symbol, file, 2, 4)
+        magic, dimensions, data = file.getvalue().split(b'\n', 2)
+        width = (symbol.size + 8)*2
+
+        assert magic == b'P4'
+        assert dimensions == f'{width} {width}'.encode()
+        assert len(data) == width*((width + 7) // 8)
+
+    def test_matches_symbol_pack(self, symbol):
+        file = io.BytesIO()
+        write_pbm(symbol, file, 1, 0)
+
+        assert file.getvalue().split(b'\n', 2)[2] == symbol.pack()
+
+
+class TestWritePng:
+
+    @pytest.mark.parametrize(
+        'scale, border',
+        [(1, 4), (5, 4)],
+        ids=['Unscaled', 'Scaled']
+    )
+    def test_image(self, symbol, scale, border):
+        file = io.BytesIO()
+        write_png(symbol, file, scale, border)
+        chunks = _read_png(file.getvalue())
+        width = (symbol.size + 2*border)*scale
+        row_bytes = (width + 7) // 8
+
+        assert chunks[0] == (
+            b'IHDR', struct.pack('>IIBBBBB', width, width, 1, 0, 0, 0, 0)
+        )
+        assert chunks[-1] == (b'IEND', b'')
+
+        raw = zlib.decompress(b''.join(
+            body for kind, body in chunks if kind == b'IDAT'
+        ))
+        lines = [
+            raw[i:i + row_bytes + 1]
+            for i in range(0, len(raw), row_bytes + 1)
+        ]
+
+        assert all(line[0] == 0 for line in lines)
+        assert [_unpack(line[1:], width, 0) for line in lines] == \
+            _get_pixels(symbol, scale, border)
+
+    def test_chunked(self, symbol, monkeypatch):
+        monkeypatch.setattr('encode.render.PNG_CHUNK_SIZE', 64)
+        file = io.BytesIO()
+        write_png(symbol, file, 10, 4, compression=0)
+        chunks = _read_png(file.getvalue())
+        idat = [body for kind, body in chunks if kind == b'IDAT']
+
+        assert len(idat) > 1
+        assert all(len(body) == 64 for body in idat[:-1])
+
+
+class TestSave:
+
+    @pytest.mark.parametrize(
+        'name, start',
+        [('code.png', PNG_SIGNATURE), ('code.PBM', b'P4\n')],
+        ids=['PNG', 'PBM']
+    )
+    def test_format(self, symbol, tmp_path, name, start):
+        path = tmp_path / name
+        save(symbol, str(path), 2)
+
+        assert path.read_bytes().startswith(start)
+
+    def test_unrecognized_format(self, symbol, tmp_path):
+        with pytest.raises(ValueError):
+            save(symbol, str(tmp_path / 'code.gif'))
@@ -0,0 +1,65 @@
+import pytest
+
+from encode.preliminary import select_encoder
+from encode.sequence import iter_sequence
+from encode.verify import verify_symbol
+
+
+class TestIterSequence:
+
+    @pytest.mark.parametrize(
+        'start, width, level',
+        [
+            (123456, 9, 'M'),
+            (999990, 9, 'H'),
+            (10**29 - 5, 30, 'L'),
+            (123*10**190, 200, 'Q')
+        ],
+        ids=['Serial numbers', 'Carries', 'Short final group', 'Two groups']
+    )
+    def test_matches_single_encoding(self, start, width, level):
+        symbols = list(iter_sequence(start, 40, width, level, mask=3))
+
+        assert len(symbols) == 40
+        for number, symbol in enumerate(symbols, start):
+            expected = select_encoder(f'{number:0{width}d}', level)
+            assert symbol.matrix == expected.get_symbol(3).matrix
+
+    @pytest.mark.parametrize('mask_slack', [0, 120])
+    def test_chosen_masks(self, mask_slack):
+        symbols = iter_sequence(1990, 60, 6, 'Q', mask_slack=mask_slack)
+
+        for number, symbol in enumerate(symbols, 1990):
+            assert verify_symbol(symbol, f'{number:06d}')
+
+    def test_symbols_are_independent(self):
+        first, second = iter_sequence(0, 2, 4, 'L')
+
+        assert first.matrix is not second.matrix
+        assert verify_symbol(first, '0000')
+
+    def test_empty(self):
+        assert list(iter_sequence(5, 0, 3, 'L')) == []
+
+    @pytest.mark.parametrize(
+        'start, count, width',
+        [(998, 3, 3), (-1, 2, 3), (0, 1, 0)],
+        ids=['Overflow', 'Negative', 'No digits']
+    )
+    def test_bad_range(self, start, count, width):
+        with pytest.raises(ValueError):
+            next(iter_sequence(start, count, width, 'L'))
+
+    def test_lowercase_level(self):
+        symbols = list(iter_sequence(41, 3, 4, 'q', mask=1))
+
+        assert [symbol.correction_level for symbol in symbols] == ['Q']*3
+        assert symbols[-1].matrix == select_encoder('0043', 'Q').get_symbol(
+            1
+        ).matrix
+
+    def test_bad_level(self):
+        with pytest.raises(ValueError) as error_msg:
+            next(iter_sequence(0, 2, 3, 'X'))
+
+        assert str(error_msg.value) == 'Unrecognized correction level: X.'
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from encode.preliminary import select_encoder
+from encode import service
+from encode.service import EncodingServer, encode_async, encode_payload
+
+
+async def _request(port: int, body: bytes, requests: int = 1) -> list:
+    """
+    Helper function: sends POST /encode requests over one connection and
+    returns the raw responses.
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    responses = []
+
+    for _ in range(requests):
+        writer.write(
+            b'POST /encode HTTP/1.1\r\nHost: test\r\n'
+            b'Content-Length: %d\r\n\r\n%s' % (len(body), body)
+        )
+        await writer.drain()
+
+        head = await reader.readuntil(b'\r\n\r\n')
+        headers = dict(
+            line.split(': ', 1) for line in head.decode().split('\r\n')[1:-2]
+        )
+        if 'Content-Length' in headers:
+            content = await reader.readexactly(
+                int(headers['Content-Length'])
+            )
+        else:
+            content = b''
+            while True:
+                size = int(await reader.readuntil(b'\r\n'), 16)
+                chunk = await reader.readexactly(size + 2)
+                if not size:
+                    break
+                content += chunk[:-2]
+        responses.append((head.split(b' ')[1], content))
+
+    writer.close()
+
+    return responses
+
+
+async def _serve(queue_depth: int, body: bytes, requests: int = 1) -> list:
+    """
+    Helper function: starts a server and sends it requests.
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        server = await EncodingServer(executor, queue_depth).start(port=0)
+        port = server.sockets[0].getsockname()[1]
+
+        async with server:
+            return await _request(port, body, requests)
+
+
+class TestEncodePayload:
+
+    def test_payload(self):
+        result = encode_payload('HELLO WORLD', 'M')
+
+        assert result['version'] == 1
+        assert result['mode'] == 'alphanumeric'
+        assert bytes.fromhex(result['codewords']) == bytes(
+            select_encoder('HELLO WORLD', 'M').correct_error()
+        )
+
+    def test_encode_async(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            result = asyncio.run(encode_async('0123', 'L', executor))
+
+        assert result == encode_payload('0123', 'L')
+
+    def test_default_executor_created_once(self, monkeypatch):
+        def create():
+            time.sleep(0.05)
+            return object()
+
+        monkeypatch.setattr(service, '_executor', None)
+        monkeypatch.setattr(service, 'warmup', lambda: None)
+        monkeypatch.setattr(service, 'ProcessPoolExecutor', create)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            pools = list(executor.map(
+                lambda _: service._get_executor(), range(8)
+            ))
+
+        assert all(pool is pools[0] for pool in pools)
+
+
+class TestEncodingServer:
+
+    def test_single_keep_alive(self):
+        body = json.dumps({'text': 'HELLO WORLD', 'correction_level': 'M'})
+        responses = asyncio.run(_serve(4, body.encode(), requests=2))
+
+        assert len(responses) == 2
+        for status, content in responses:
+            assert status == b'200'
+            assert json.loads(content) == encode_payload('HELLO WORLD', 'M')
+
+    def test_batch_streamed(self):
+        body = json.dumps({'batch': [
+            {'text': 'HELLO WORLD'}, {'text': '0123', 'correction_level': 'H'}
+        ]})
+        [(status, content)] = asyncio.run(_serve(4, body.encode()))
+        lines = content.decode().splitlines()
+
+        assert status == b'200'
+        assert [json.loads(line) for line in lines] == [
+            encode_payload('HELLO WORLD', 'L'), encode_payload('0123', 'H')
+        ]
+
+    def test_backpressure(self):
+        body = json.dumps({'batch': [{'text': 'A'}]*3})
+        [(status, _)] = asyncio.run(_serve(2, body.encode()))
+
+        assert status == b'503'
+
+    @pytest.mark.parametrize(
+        'body',
+        [
+            b'not json',
+            b'{"text": 4}',
+            b'{"text": "A", "correction_level": "J"}'
+        ],
+        ids=['Invalid JSON', 'Text not a string', 'Bad correction level']
+    )
+    def test_bad_request(self, body):
+        [(status, _)] = asyncio.run(_serve(4, body))
+
+        assert status == b'400'
+
+    @pytest.mark.parametrize(
+        'request_bytes, status',
+        [
+            (b'Content-Length: ten\r\n\r\n', b'400'),
+            (b'Content-Length: -5\r\n\r\n', b'400'),
+            (b'Content-Length: %d\r\n\r\n' % (2 << 20), b'413'),
+            (b'Content-Length: 20\r\n\r\n{"text": "A"}', b'400')
+        ],
+        ids=['Not a number', 'Negative', 'Too large', 'Short body']
+    )
+    def test_bad_content_length(self, request_bytes, status):
+        async def send():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                server = await EncodingServer(executor, 4).start(port=0)
+                port = server.sockets[0].getsockname()[1]
+
+                async with server:
+                    reader, writer = await asyncio.open_connection(
+                        '127.0.0.1', port
+                    )
+                    writer.write(
+                        b'POST /encode HTTP/1.1\r\nHost: test\r\n' +
+                        request_bytes
+                    )
+                    writer.write_eof()
+                    response = await reader.read()
+                    writer.close()
+
+                    return response
+
+        response = asyncio.run(send())
+
+        assert response.split(b' ')[1] == status
@@ -0,0 +1,69 @@
+import pytest
+
+from encode.preliminary import select_encoder
+from encode.sheet import SheetWriter, render_sheet
+
+MESSAGES = ['HELLO WORLD', '0123', 'QR', 'SHEET']
+
+
+def _read_pixel(data: bytes, writer: SheetWriter, x: int, y: int) -> int:
+    """
+    Helper function: reads a pixel from a sheet file.
+    """
+    offset = len(writer.header) + y*writer.row_bytes
+    if writer.fmt == 'pbm':
+        return (data[offset + x // 8] >> (7 - x % 8)) & 1
+    return data[offset + x]
+
+
+class TestSheetWriter:
+
+    @pytest.mark.parametrize('fmt', ['pbm', 'raw'])
+    def test_tiles(self, tmp_path, fmt):
+        path = str(tmp_path / 'sheet')
+        writer = render_sheet(MESSAGES, 'M', path, 3, scale=2, fmt=fmt)
+
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        assert len(data) == writer.length
+        assert writer.rows == 2
+        pitch = writer.tile_pitch*(8 if fmt == 'pbm' else 1)
+        for index, message in enumerate(MESSAGES):
+            symbol = select_encoder(message, 'M').get_symbol()
+            tile_x = (index % 3)*pitch
+            tile_y = (index // 3)*writer.tile_size
+            for row in range(21):
+                for col in range(21):
+                    x = tile_x + 2*(col + 4) + 1
+                    y = tile_y + 2*(row + 4) + 1
+                    assert _read_pixel(data, writer, x, y) == \
+                        symbol.matrix[row*21 + col]
+
+    def test_pbm_header(self, tmp_path):
+        path = str(tmp_path / 'sheet.pbm')
+        writer = SheetWriter(path, 1, 4, 2)
+
+        with open(path, 'rb') as file:
+            assert file.read(len(writer.header)) == b'P4\n128 58\n'
+
+    def test_parallel_matches_serial(self, tmp_path):
+        messages = [f'ITEM {k}' for k in range(20)]
+        render_sheet(messages, 'L', str(tmp_path / 'serial.pbm'), 5)
+        render_sheet(
+            messages, 'L', str(tmp_path / 'parallel.pbm'), 5, workers=2
+        )
+
+        with open(tmp_path / 'serial.pbm', 'rb') as serial, \
+                open(tmp_path / 'parallel.pbm', 'rb') as parallel:
+            assert serial.read() == parallel.read()
+
+    def test_wrong_version(self, tmp_path):
+        writer = SheetWriter(str(tmp_path / 'sheet.pbm'), 2, 1, 1)
+
+        with pytest.raises(ValueError):
+            writer.write(0, select_encoder('A', 'L').get_symbol())
+
+    def test_bad_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            SheetWriter(str(tmp_path / 'sheet.png'), 1, 1, 1, fmt='png')
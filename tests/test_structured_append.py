@@ -0,0 +1,101 @@
+import pytest
+
+from encode.common import _get_capacity
+from encode.data_encoder import BytesEncoder, NumericEncoder
+from encode.structured_append import (
+    StructuredAppendEncoder,
+    get_parity,
+    plan_split
+)
+
+
+class TestGetParity:
+
+    def test_parity(self):
+        assert get_parity('AB') == 0x41 ^ 0x42
+
+    def test_empty(self):
+        assert get_parity('') == 0
+
+    def test_kanji(self):
+        assert get_parity('茗荷') == 0xE4 ^ 0xAA ^ 0x89 ^ 0xD7
+
+
+class TestPlanSplit:
+
+    def test_single_symbol(self):
+        assert plan_split('0'*10, 'L', 'numeric') == [(0, 10, 1)]
+
+    @pytest.mark.parametrize(
+        'objective',
+        ['modules', 'version'],
+        ids=['Minimise modules', 'Minimise version']
+    )
+    def test_parts_cover_message(self, objective):
+        plan = plan_split('a'*10000, 'M', 'bytes', objective)
+
+        assert plan[0][0] == 0
+        assert plan[-1][1] == 10000
+        assert all(a[1] == b[0] for a, b in zip(plan, plan[1:]))
+
+    def test_version_objective(self):
+        modules_plan = plan_split('a'*3000, 'L', 'bytes', 'modules')
+        version_plan = plan_split('a'*3000, 'L', 'bytes', 'version')
+
+        assert max(p[2] for p in version_plan) <= \
+            max(p[2] for p in modules_plan)
+
+    def test_too_long(self):
+        with pytest.raises(ValueError):
+            plan_split('a'*2954*16, 'L', 'bytes')
+
+    def test_bad_objective(self):
+        with pytest.raises(ValueError):
+            plan_split('a', 'L', 'bytes', 'symbols')
+
+
+class TestStructuredAppendEncoder:
+
+    def test_oversized_message(self):
+        test_encoder = StructuredAppendEncoder('a'*8000, 'L')
+
+        assert 1 < len(test_encoder.symbols) <= 16
+        assert all(
+            isinstance(s.encoder, BytesEncoder) for s in test_encoder.symbols
+        )
+        assert ''.join(
+            s.encoder.message for s in test_encoder.symbols
+        ) == 'a'*8000
+
+    def test_header(self):
+        test_encoder = StructuredAppendEncoder('0'*8000, 'H', max_symbols=4)
+        symbol = test_encoder.symbols[2]
+
+        assert isinstance(symbol.encoder, NumericEncoder)
+        assert symbol.get_header() == '0011' + '0010' + '0011' + '00000000'
+
+    def test_kanji_parity(self):
+        test_encoder = StructuredAppendEncoder('茗荷'*1000 + '茗', 'L')
+
+        assert len(test_encoder.symbols) > 1
+        for symbol in test_encoder.symbols:
+            assert symbol.get_header()[-8:] == format(0xE4 ^ 0xAA, '08b')
+
+    def test_encoded_length(self):
+        test_encoder = StructuredAppendEncoder('Ghosst'*500, 'Q')
+
+        for symbol, encoded in zip(
+            test_encoder.symbols, test_encoder.encode()
+        ):
+            assert len(encoded) == _get_capacity(
+                symbol.encoder.version, 'Q'
+            )
+
+    def test_parallel_matches_serial(self):
+        test_encoder = StructuredAppendEncoder('Ghosst'*500, 'Q')
+
+        assert test_encoder.encode(max_workers=2) == test_encoder.encode()
+
+    def test_bad_max_symbols(self):
+        with pytest.raises(ValueError):
+            StructuredAppendEncoder('a', 'L', max_symbols=17)
@@ -0,0 +1,169 @@
+import pickle
+import sys
+
+import pytest
+
+from encode.preliminary import select_encoder
+from encode.symbol import (
+    export_matrices, pack_codewords, QRSymbol, unpack_codewords
+)
+
+
+@pytest.fixture(scope='function')
+def symbol():
+    return select_encoder('HELLO WORLD', 'M').get_symbol()
+
+
+class TestQRSymbol:
+
+    def test_attributes(self, symbol):
+        assert isinstance(symbol, QRSymbol)
+        assert symbol.version == 1
+        assert symbol.size == 21
+        assert 0 <= symbol.mask < 8
+
+    def test_view_is_zero_copy(self, symbol):
+        view = symbol.get_view()
+
+        assert view.shape == (21, 21)
+        assert view.tolist()[0] == list(symbol.matrix[:21])
+
+        symbol.matrix[0] = 0
+        assert view[0, 0] == 0
+
+    @pytest.mark.skipif(
+        sys.version_info < (3, 12), reason='__buffer__ needs Python 3.12+'
+    )
+    def test_buffer_protocol(self, symbol):
+        view = memoryview(symbol)
+
+        assert view.shape == (21, 21)
+        assert view.tobytes() == bytes(symbol.matrix)
+
+    def test_array_interface(self, symbol):
+        interface = symbol.__array_interface__
+
+        assert interface['shape'] == (21, 21)
+        assert interface['typestr'] == '|u1'
+        assert interface['data'] is symbol.matrix
+
+    def test_numpy_zero_copy(self, symbol):
+        numpy = pytest.importorskip('numpy')
+        array = numpy.asarray(symbol)
+
+        assert array.shape == (21, 21)
+        symbol.matrix[1] = 1 - symbol.matrix[1]
+        assert array[0, 1] == symbol.matrix[1]
+
+    def test_pack(self, symbol):
+        packed = symbol.pack()
+        first_row = ''.join(str(bit) for bit in symbol.matrix[:21]) + '000'
+
+        assert len(packed) == 21*3
+        assert packed[:3] == int(first_row, 2).to_bytes(3, 'big')
+        assert packed[0] == 0b11111110
+
+
+class TestWireForm:
+
+    @pytest.mark.parametrize(
+        'message, level, micro',
+        [
+            ('HELLO WORLD', 'M', False),
+            ('a'*500, 'Q', False),
+            ('123', 'L', True)
+        ],
+        ids=['Version 1', 'Large version', 'Micro QR']
+    )
+    @pytest.mark.parametrize(
+        'matrix, codewords',
+        [(True, True), (True, False), (False, True)],
+        ids=['Both', 'Matrix', 'Codewords']
+    )
+    def test_round_trip(self, message, level, micro, matrix, codewords):
+        symbol = select_encoder(message, level, micro).get_symbol()
+        copy = QRSymbol.from_bytes(symbol.to_bytes(matrix, codewords))
+
+        assert copy.matrix == symbol.matrix
+        assert (copy.version, copy.correction_level, copy.mask) == (
+            symbol.version, symbol.correction_level, symbol.mask
+        )
+        assert copy.mode == symbol.mode
+        assert copy.codewords == (symbol.codewords if codewords else None)
+
+    def test_header(self, symbol):
+        data = symbol.to_bytes(matrix=False)
+
+        assert data[:2] == b'QR'
+        assert len(data) == 9 + 26
+
+    def test_unknown_mode_and_codewords(self, symbol):
+        bare = QRSymbol(symbol.matrix, 1, 'M', symbol.mask)
+        copy = QRSymbol.from_bytes(bare.to_bytes())
+
+        assert copy.matrix == symbol.matrix
+        assert (copy.mode, copy.codewords) == (None, None)
+        with pytest.raises(ValueError):
+            bare.to_bytes(matrix=False)
+
+    def test_pack_codewords(self, symbol):
+        data = pack_codewords(1, 'M', 'alphanumeric', symbol.codewords)
+        copy = QRSymbol.from_bytes(data)
+
+        assert len(data) == 9 + 26
+        assert unpack_codewords(data) == (
+            1, 'M', 'alphanumeric', symbol.codewords
+        )
+        assert (copy.matrix, copy.mask) == (symbol.matrix, symbol.mask)
+
+    def test_pickle(self, symbol):
+        data = pickle.dumps(symbol)
+        copy = pickle.loads(data)
+
+        assert copy.matrix == symbol.matrix
+        assert copy.codewords == symbol.codewords
+        assert len(data) < len(symbol.matrix)
+
+    @pytest.mark.parametrize(
+        'data',
+        [b'QR', b'XX' + bytes(8), b'QR\x01\x01M\x00\x00\x00\x00' + bytes(3)],
+        ids=['Truncated header', 'Bad magic', 'Truncated matrix']
+    )
+    def test_bad_data(self, data):
+        with pytest.raises(ValueError):
+            QRSymbol.from_bytes(data)
+
+
+class TestExportMatrices:
+
+    def test_bytearray(self, symbol):
+        other = select_encoder('0123', 'H').get_symbol()
+        view = export_matrices([symbol, other])
+
+        assert view.shape == (2, 21, 21)
+        assert view.tobytes() == bytes(symbol.matrix) + bytes(other.matrix)
+
+    def test_preallocated(self, symbol):
+        out = bytearray(3*441)
+        export_matrices([symbol], out)
+
+        assert out[:441] == symbol.matrix
+        assert out[441:] == bytes(2*441)
+
+    def test_memory_mapped_file(self, symbol, tmp_path):
+        path = str(tmp_path / 'matrices.bin')
+        view = export_matrices([symbol, symbol], path=path)
+        view.release()
+
+        with open(path, 'rb') as file:
+            assert file.read() == bytes(symbol.matrix)*2
+
+    def test_mixed_versions(self, symbol):
+        other = select_encoder('a'*100, 'L').get_symbol()
+
+        with pytest.raises(ValueError):
+            export_matrices([symbol, other])
+
+    def test_buffer_too_small(self, symbol):
+        with pytest.raises(ValueError):
+            export_matrices([symbol, symbol], bytearray(441))
@@ -0,0 +1,108 @@
+import pytest
+
+from encode.data_encoder import AlphanumericEncoder, BytesEncoder
+from encode.preliminary import select_encoder
+from encode.template import Template
+
+
+class TestTemplate:
+
+    @pytest.mark.parametrize(
+        'pattern, values',
+        [
+            ('https://example.com/item/{8}', ('a1b2c3d4',)),
+            ('HTTPS://EX.COM/{7}{2}/{1}', ('ABC0129', ':A', 'Z')),
+            ('0012{5}9{1}', ('98765', '4')),
+            ('点{3}荷', ('茗荷点',))
+        ],
+        ids=[
+            'Byte mode',
+            'Alphanumeric mode - adjacent slots',
+            'Numeric mode - slots sharing a group',
+            'Kanji mode'
+        ]
+    )
+    @pytest.mark.parametrize('correction_level', ['L', 'M', 'Q', 'H'])
+    def test_matches_full_encoding(self, pattern, values, correction_level):
+        test_template = Template(pattern, correction_level)
+        message = test_template.fill(*values)
+        expected = select_encoder(message, correction_level).correct_error()
+
+        assert test_template.encode(*values) == expected
+
+    @pytest.mark.parametrize(
+        'pattern, values',
+        [
+            ('https://example.com/item/{8}', ('a1b2c3d4',)),
+            ('HTTPS://EX.COM/{7}{2}/{1}', ('ABC0129', ':A', 'Z')),
+            ('0012{5}9{1}', ('98765', '4')),
+            ('点{3}荷', ('茗荷点',))
+        ],
+        ids=[
+            'Byte mode',
+            'Alphanumeric mode - adjacent slots',
+            'Numeric mode - slots sharing a group',
+            'Kanji mode'
+        ]
+    )
+    @pytest.mark.parametrize('correction_level', ['L', 'M', 'Q', 'H'])
+    def test_symbol_matches_full_encoding(
+        self, pattern, values, correction_level
+    ):
+        test_template = Template(pattern, correction_level)
+        message = test_template.fill(*values)
+        expected = select_encoder(message, correction_level).get_symbol(
+            test_template.mask
+        )
+        symbol = test_template.get_symbol(*values)
+
+        assert symbol.matrix == expected.matrix
+        assert symbol.mask == expected.mask
+        assert symbol.codewords == expected.codewords
+        assert symbol.mode == expected.mode
+
+    @pytest.mark.parametrize('mask', range(8))
+    def test_fixed_mask(self, mask):
+        test_template = Template('HTTPS://EXAMPLE.COM/{6}', 'H', 'byte', mask)
+        symbol = test_template.get_symbol('abc123')
+
+        assert test_template.mask == symbol.mask == mask
+        assert symbol.matrix == BytesEncoder(
+            'HTTPS://EXAMPLE.COM/abc123', 'H'
+        ).get_symbol(mask).matrix
+
+    def test_symbol_leaves_template(self):
+        test_template = Template('0012{5}9{1}', 'M')
+        matrix = bytes(test_template.matrix)
+
+        assert test_template.get_symbol('98765', '4').matrix != matrix
+        assert test_template.matrix == matrix
+
+    def test_multiple_blocks(self):
+        test_template = Template('HTTPS://EXAMPLE.COM/{6}', 'H', 'byte')
+
+        for value in ('000000', '123456', 'abcdef'):
+            expected = BytesEncoder(
+                test_template.fill(value), 'H'
+            ).correct_error()
+            assert test_template.encode(value) == expected
+
+    def test_mode_from_fixed_text(self):
+        test_template = Template('HTTPS://EX.COM/{4}', 'L')
+
+        assert test_template.mode == 'alphanumeric'
+        assert test_template.encode('AB12') == AlphanumericEncoder(
+            'HTTPS://EX.COM/AB12', 'L'
+        ).correct_error()
+
+    def test_no_slots(self):
+        with pytest.raises(ValueError):
+            Template('HTTPS://EX.COM/', 'L')
+
+    def test_wrong_width(self):
+        with pytest.raises(ValueError):
+            Template('HTTPS://EX.COM/{4}', 'L').encode('ABC')
+
+    def test_wrong_mode(self):
+        with pytest.raises(ValueError):
+            Template('HTTPS://EX.COM/{4}', 'L').encode('abcd')
@@ -0,0 +1,210 @@
+import pytest
+
+from encode.batch import encode_many
+from encode.error_correction import ErrorCorrector
+from encode.matrix import (
+    get_format_indices, get_placement_order, get_version_indices
+)
+from encode.preliminary import select_encoder
+from encode.structured_append import StructuredAppendEncoder
+from encode.symbol import QRSymbol
+from encode.verify import (
+    check_syndromes, parse_bitstream, read_format, VerificationError,
+    Verifier, verify_codewords, verify_symbol
+)
+
+
+def _copy(symbol, **changes):
+    """Copy of a symbol, with attributes replaced."""
+    params = {
+        'matrix': bytearray(symbol.matrix),
+        'version': symbol.version,
+        'correction_level': symbol.correction_level,
+        'mask': symbol.mask
+    }
+    params.update(changes)
+
+    return QRSymbol(**params)
+
+
+class TestVerifySymbol:
+
+    @pytest.mark.parametrize(
+        'message, level',
+        [
+            ('0123456789012', 'H'),
+            ('8675309', 'L'),
+            ('HELLO WORLD', 'M'),
+            ('HELLO WORLD!', 'Q'),
+            ('hello, world \xff', 'Q'),
+            ('漢字日本語', 'L'),
+            ('https://example.com/' + 'x'*300, 'M'),
+            ('9'*3000, 'H')
+        ],
+        ids=[
+            'Numeric',
+            'Numeric, short final group',
+            'Alphanumeric',
+            'Alphanumeric, odd length',
+            'Bytes',
+            'Kanji',
+            'Version information',
+            'Version 40'
+        ]
+    )
+    def test_round_trip(self, message, level):
+        symbol = select_encoder(message, level).get_symbol()
+
+        assert verify_symbol(symbol, message) == message
+
+    @pytest.mark.parametrize(
+        'message, level',
+        [
+            ('12345', 'L'),
+            ('HELLO', 'M'),
+            ('hello', 'L'),
+            ('漢字', 'M'),
+            ('1'*35, 'L'),
+            ('a'*9, 'Q')
+        ],
+        ids=['M1', 'M2', 'M3', 'M3, kanji', 'M4, full', 'M4, level Q']
+    )
+    def test_micro_round_trip(self, message, level):
+        symbol = select_encoder(message, level, micro=True).get_symbol()
+
+        assert symbol.version < 1
+        assert verify_symbol(symbol, message) == message
+
+    @pytest.mark.parametrize('mask', range(8))
+    def test_masks(self, mask):
+        symbol = select_encoder('MASKED', 'Q').get_symbol(mask)
+
+        assert read_format(symbol) == ('Q', mask)
+        assert verify_symbol(symbol) == 'MASKED'
+
+    def test_flipped_data_module(self):
+        symbol = select_encoder('HELLO WORLD', 'M').get_symbol()
+        symbol.matrix[get_placement_order(1)[20]] ^= 1
+
+        with pytest.raises(VerificationError):
+            verify_symbol(symbol)
+
+    def test_flipped_format_module(self):
+        symbol = select_encoder('HELLO WORLD', 'M').get_symbol()
+        symbol.matrix[get_format_indices(1)[3]] ^= 1
+
+        with pytest.raises(VerificationError):
+            verify_symbol(symbol)
+
+    def test_flipped_version_module(self):
+        symbol = select_encoder('a'*200, 'L').get_symbol()
+        symbol.matrix[get_version_indices(symbol.version)[-1]] ^= 1
+
+        with pytest.raises(VerificationError):
+            verify_symbol(symbol)
+
+    @pytest.mark.parametrize(
+        'changes',
+        [{'mask': 'next'}, {'correction_level': 'H'}],
+        ids=['Mask', 'Level']
+    )
+    def test_mismatched_parameters(self, changes):
+        symbol = select_encoder('HELLO WORLD', 'M').get_symbol()
+        if changes.get('mask') == 'next':
+            changes['mask'] = (symbol.mask + 1) % 8
+
+        with pytest.raises(VerificationError):
+            verify_symbol(_copy(symbol, **changes))
+
+    def test_wrong_message(self):
+        symbol = select_encoder('HELLO WORLD', 'M').get_symbol()
+
+        with pytest.raises(VerificationError):
+            verify_symbol(symbol, 'HELLO THERE')
+
+
+class TestVerifyCodewords:
+
+    def test_round_trip(self):
+        encoder = select_encoder('https://example.com', 'H')
+
+        assert verify_codewords(
+            encoder.correct_error(), encoder.version, 'H'
+        ) == 'https://example.com'
+
+    def test_wrong_length(self):
+        codewords = select_encoder('HELLO', 'L').correct_error()
+
+        with pytest.raises(VerificationError):
+            verify_codewords(codewords[:-1], 1, 'L')
+
+
+class TestCheckSyndromes:
+
+    def test_valid_and_corrupt(self):
+        corrector = ErrorCorrector((10, 1, 16, None, None))
+        block = list(range(16))
+        block += corrector.generate_correction_bytes(block)[0]
+
+        assert check_syndromes(block, 10)
+
+        block[5] ^= 0x40
+        assert not check_syndromes(block, 10)
+
+
+class TestParseBitstream:
+
+    def test_structured_append(self):
+        sa_encoder = StructuredAppendEncoder('0123456789'*30, 'M')
+        parts = []
+        for symbol, bits in zip(sa_encoder.symbols, sa_encoder.encode()):
+            codewords = [
+                int(bits[i:i + 8], 2) for i in range(0, len(bits), 8)
+            ]
+            parts.append(parse_bitstream(codewords, symbol.encoder.version))
+
+        assert ''.join(parts) == '0123456789'*30
+
+    def test_unrecognized_mode(self):
+        with pytest.raises(VerificationError):
+            parse_bitstream([0b01110000, 0], 1)
+
+    def test_truncated(self):
+        with pytest.raises(VerificationError):
+            parse_bitstream([0b01000000, 0b10000000], 1)
+
+
+class TestVerifier:
+
+    def test_rate(self):
+        never, always = Verifier(0.0), Verifier(1.0, max_overhead=1.0)
+
+        assert not any(never.sample() for _ in range(100))
+        assert all(always.sample() for _ in range(100))
+
+    def test_budget(self):
+        verifier = Verifier(1.0)
+        verifier.seconds = 60.0
+
+        assert not verifier.sample()
+        assert verifier.skipped == 1
+
+    def test_records_results(self):
+        verifier = Verifier(1.0)
+        symbol = select_encoder('HELLO', 'L').get_symbol()
+
+        verifier.verify_symbol(symbol, 'HELLO')
+        with pytest.raises(VerificationError):
+            verifier.verify_symbol(symbol, 'WORLD')
+
+        summary = verifier.as_dict()
+        assert summary['checked'] == 2
+        assert summary['failed'] == 1
+        assert summary['seconds'] > 0
+
+    def test_encode_many(self):
+        verifier = Verifier(1.0, max_overhead=1.0)
+        encode_many(['A', 'B', 'A', '123', 'abc'], 'Q', verifier=verifier)
+
+        assert verifier.checked == 4
+        assert verifier.failed == 0
@@ -0,0 +1,96 @@
+import gc
+
+import pytest
+
+from encode.batch import encode_many
+from encode.error_correction import _create_stores, _get_generator
+from encode.matrix import get_function_patterns, get_mask_pattern
+from encode.preliminary import select_encoder
+from encode.sequence import iter_sequence
+from encode.verify import verify_symbol
+from encode.warmup import get_table_misses, LOOKUP_TABLES, warmup
+
+
+class TestWarmup:
+
+    def test_all_tables_cached(self):
+        for table in LOOKUP_TABLES:
+            assert hasattr(table, 'cache_info')
+
+    @pytest.mark.parametrize(
+        'messages, level',
+        [
+            (['0123456789', 'HELLO WORLD', 'hello world'], 'M'),
+            (['8675309'*20, 'A'*100, 'https://example.com/' + 'x'*80], 'Q'),
+            (['9'*600, 'Z'*400, 'z'*300], 'L'),
+            (['1'*300, 'Kanji free bytes'], 'H')
+        ],
+        ids=[
+            'Version 1',
+            'Versions 3 to 6',
+            'Versions 10 to 13',
+            'Versions 1 to 13, high'
+        ]
+    )
+    def test_no_lazy_builds(self, messages, level):
+        misses = warmup(range(1, 14), [level])
+
+        for message in messages:
+            select_encoder(message, level).get_symbol()
+        encode_many(messages, level)
+
+        assert get_table_misses() == misses
+
+    @pytest.mark.parametrize(
+        'messages, level',
+        [(['12345', '0123456789'], 'L'), (['HELLO', 'hello', '漢字'], 'M')],
+        ids=['Level L', 'Level M']
+    )
+    def test_no_lazy_builds_micro(self, messages, level):
+        misses = warmup(range(-3, 1), [level])
+
+        for message in messages:
+            symbol = select_encoder(message, level, micro=True).get_symbol()
+            assert symbol.version < 1
+            assert verify_symbol(symbol, message)
+
+        assert get_table_misses() == misses
+
+    def test_no_lazy_builds_sequences(self):
+        misses = warmup(range(1, 4), ['Q'], sequences=True)
+
+        list(iter_sequence(999990, 20, 20, 'Q'))
+
+        assert get_table_misses() == misses
+
+    def test_no_lazy_builds_numpy(self):
+        pytest.importorskip('numpy')
+        misses = warmup(range(1, 5), ['H'])
+
+        encode_many(['1'*40, 'A'*30], 'H', backend='numpy')
+
+        assert get_table_misses() == misses
+
+    @pytest.mark.parametrize(
+        'freeze, frozen',
+        [(False, False), (True, True)],
+        ids=['Default', 'Freeze']
+    )
+    def test_freeze(self, freeze, frozen):
+        assert gc.get_freeze_count() == 0
+
+        try:
+            warmup([1], ['L'], freeze=freeze)
+            assert (gc.get_freeze_count() > 0) == frozen
+        finally:
+            gc.unfreeze()
+
+    def test_tables_built(self):
+        warmup([7], ['m'])
+        info = get_function_patterns.cache_info()
+        get_function_patterns(7)
+
+        assert get_function_patterns.cache_info().hits == info.hits + 1
+        assert get_mask_pattern.cache_info().currsize >= 8
+        assert _create_stores.cache_info().currsize == 1
+        assert _get_generator.cache_info().currsize >= 1